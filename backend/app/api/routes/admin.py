@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func
@@ -8,13 +8,14 @@ from typing import Optional
 import io
 import csv
 from ...core.database import get_db
-from ...core.security import get_admin_user, verify_password, get_password_hash
+from ...core.security import get_admin_user, get_super_admin_user, verify_password, get_password_hash
 from ...models.user import User
 from ...models.detection import DetectionEvent
 from ...models.alert import Alert
 from ...core.logger import get_logger
 from ...core.timezone import get_philippine_time_naive
 from ...services.archiving_service import get_archiving_service
+from ...services.model_registry import get_model_registry
 
 router = APIRouter(tags=["Admin"])
 logger = get_logger(__name__)
@@ -493,3 +494,64 @@ def export_archived_detections(
         }
     )
 
+
+# Model Versions (hot swap)
+@router.get("/models")
+def list_model_versions(
+    current_user: User = Depends(get_admin_user)
+):
+    """List model versions, the active one and the state of the last swap"""
+    registry = get_model_registry()
+
+    return {
+        "versions": registry.list_versions(),
+        **registry.get_status()
+    }
+
+
+def _start_model_activation(version: str, background_tasks: BackgroundTasks, rollback: bool = False) -> dict:
+    """Validate a version and load / swap it in after the response is sent"""
+    registry = get_model_registry()
+    try:
+        model_path = registry.prepare_activation(version)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    # Sync background tasks run in the threadpool, so the streams keep running during the load
+    background_tasks.add_task(registry.activate, version, model_path, rollback)
+    return {
+        "message": f"Loading model version '{version}' - streams switch over once it is warmed up",
+        "last_swap": registry.status
+    }
+
+
+@router.post("/models/{version}/activate", status_code=status.HTTP_202_ACCEPTED)
+def activate_model_version(
+    version: str,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_super_admin_user)
+):
+    """Load and warm up a model version in the background, then swap it in between frames (Super Admin only)"""
+    response = _start_model_activation(version, background_tasks)
+    logger.info(f"Admin {current_user.email} activating model version '{version}'")
+    return response
+
+
+@router.post("/models/rollback", status_code=status.HTTP_202_ACCEPTED)
+def rollback_model_version(
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_super_admin_user)
+):
+    """Swap back to the previously active model version (Super Admin only)"""
+    previous = get_model_registry().previous_version()
+    if previous is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No previous model version to roll back to"
+        )
+
+    response = _start_model_activation(previous, background_tasks, rollback=True)
+    logger.info(f"Admin {current_user.email} rolling back to model version '{previous}'")
+    return response
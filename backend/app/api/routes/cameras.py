@@ -1,3 +1,4 @@
+import json
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
@@ -6,6 +7,8 @@ from ...core.security import get_admin_user, get_super_admin_user, get_safety_ma
 from ...models.user import User, UserRole
 from ...models.camera import Camera
 from ...schemas.camera import CameraResponse, CameraCreate, CameraUpdate
+from ...services.yolo_service import get_loaded_yolo_service
+from ..websocket import manager
 
 router = APIRouter(prefix="/cameras", tags=["Cameras"])
 
@@ -51,6 +54,9 @@ def create_camera(
         location=camera_data.location,
         stream_url=camera_data.stream_url,
         description=camera_data.description,
+        motion_sensitivity=camera_data.motion_sensitivity,
+        roi_polygon=json.dumps(camera_data.roi_polygon) if camera_data.roi_polygon else None,
+        tile_grid=camera_data.tile_grid or None,
         created_by=current_user.id  # Track who created this camera
     )
 
@@ -102,9 +108,31 @@ def update_camera(
     if camera_data.description is not None:
         camera.description = camera_data.description
 
+    if 'motion_sensitivity' in camera_data.model_fields_set:
+        # An explicit null returns the camera to MOTION_GATE_SENSITIVITY
+        camera.motion_sensitivity = camera_data.motion_sensitivity
+
+    if camera_data.roi_polygon is not None:
+        # An empty list removes the ROI (full frame)
+        camera.roi_polygon = json.dumps(camera_data.roi_polygon) if camera_data.roi_polygon else None
+
+    if camera_data.tile_grid is not None:
+        # An empty string turns tiling off
+        camera.tile_grid = camera_data.tile_grid or None
+
     db.commit()
     db.refresh(camera)
 
+    # A running stream picks up the new detection settings right away
+    yolo_service = get_loaded_yolo_service()
+    if yolo_service is not None and manager.is_stream_running(camera_id):
+        yolo_service.configure_camera(
+            camera_id,
+            motion_sensitivity=camera.motion_sensitivity,
+            roi_polygon=camera.roi_polygon,
+            tile_grid=camera.tile_grid
+        )
+
     return camera
 
 
@@ -1,7 +1,12 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import Optional
-from ...services.yolo_service import get_yolo_service
+from ...services.yolo_service import get_yolo_service, get_startup_metrics
+from ...services.inference_executor import get_inference_executor
+from ...services.stage_timing import get_stage_timer
+from ...services.stream_pipeline import get_pipeline_stats
+from ...services.capture_registry import get_capture_registry
+from ..websocket import manager
 from ...core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -15,10 +20,16 @@ class PerformanceSettings(BaseModel):
     jpeg_quality: Optional[int] = Field(None, ge=1, le=100, description="JPEG compression quality (1-100)")
     confidence_threshold: Optional[float] = Field(None, ge=0.0, le=1.0, description="Confidence threshold for detections (0.0-1.0)")
     iou_threshold: Optional[float] = Field(None, ge=0.0, le=1.0, description="IOU threshold for NMS (0.0-1.0)")
+    cascade_enabled: Optional[bool] = Field(None, description="Find persons at low resolution, then PPE in person crops")
+    adaptive_input_size: Optional[bool] = Field(None, description="Step each camera's input size to hold the latency budget")
+    stream_mode: Optional[str] = Field(None, description="'annotated' (server draws overlays) or 'metadata' (raw frames + box list)")
 
 
 class PerformanceResponse(BaseModel):
     """Performance settings response"""
+    model_version: str
+    backend: str
+    precision: str
     device: str
     input_size: int
     jpeg_quality: int
@@ -26,6 +37,10 @@ class PerformanceResponse(BaseModel):
     confidence_threshold: float
     iou_threshold: float
     max_det: int
+    tracker_mode: str
+    cascade_enabled: bool
+    adaptive_input_size: bool
+    stream_mode: str
 
 
 @router.get("", response_model=PerformanceResponse)
@@ -66,6 +81,18 @@ async def update_performance_settings(settings: PerformanceSettings):
         if settings.iou_threshold is not None:
             yolo_service.set_iou_threshold(settings.iou_threshold)
 
+        # Update adaptive input size
+        if settings.adaptive_input_size is not None:
+            yolo_service.set_adaptive_input_size(settings.adaptive_input_size)
+
+        # Update person-then-PPE cascade
+        if settings.cascade_enabled is not None:
+            yolo_service.set_cascade_enabled(settings.cascade_enabled)
+
+        # Update stream mode (server-drawn overlays or metadata for client-side drawing)
+        if settings.stream_mode is not None:
+            yolo_service.set_stream_mode(settings.stream_mode)
+
         # Return updated settings
         updated_settings = yolo_service.get_performance_settings()
         logger.info(f"Updated performance settings: conf={updated_settings.get('confidence_threshold')}, iou={updated_settings.get('iou_threshold')}")
@@ -92,3 +119,63 @@ async def toggle_gpu():
     except Exception as e:
         logger.error(f"Error toggling GPU: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/startup")
+async def get_startup_stats():
+    """Get model readiness, load and warm-up timings, and first-frame latency per camera stream"""
+    return get_startup_metrics()
+
+
+@router.get("/executor")
+async def get_executor_stats():
+    """Get inference executor statistics (threads, queued and completed inferences)"""
+    return get_inference_executor().get_stats()
+
+
+@router.get("/motion-gate")
+async def get_motion_gate_stats():
+    """Get motion gate statistics (hit rate = share of frames that reused the last results instead of running YOLO)"""
+    return get_yolo_service().get_motion_gate_stats()
+
+
+@router.get("/frame-skip")
+async def get_frame_skip_stats():
+    """Get detect-every-N statistics (current N, inference latency and share of frames that ran the detector per camera)"""
+    return get_yolo_service().get_frame_skip_stats()
+
+
+@router.get("/input-size")
+async def get_input_size_stats():
+    """Get adaptive input size per camera (current size, smoothed latency and queue lag vs budget, recent step decisions)"""
+    return get_yolo_service().get_input_size_stats()
+
+
+@router.get("/cascade")
+async def get_cascade_stats():
+    """Get person-then-PPE cascade statistics (frames that used the cascade vs the single-pass fallback, crops per frame)"""
+    return get_yolo_service().get_cascade_stats()
+
+
+@router.get("/stages")
+async def get_stage_stats(camera_id: Optional[str] = None):
+    """Get per-stage stream latency per camera (p50/p95/p99 over recent runs: decode, detect and its preprocess / inference / tracking / draw parts, encode, serialize, broadcast, db, capture-to-viewer latency)"""
+    return get_stage_timer().get_stats(camera_id)
+
+
+@router.get("/pipeline")
+async def get_stream_pipeline_stats():
+    """Get each camera stream's pipeline (capture rate, queue depth and dropped frames per stage queue, stage states)"""
+    return get_pipeline_stats()
+
+
+@router.get("/captures")
+async def get_capture_stats():
+    """Get shared decoders (one per normalized stream source: subscribed cameras, frames read) and how often a camera reused an open one"""
+    return get_capture_registry().get_stats()
+
+
+@router.get("/clients")
+async def get_client_stats():
+    """Get each WebSocket viewer's send queue by camera (protocol, frames sent and dropped by latest-frame-wins, pending alert/status messages)"""
+    return manager.get_client_stats()
@@ -2,11 +2,11 @@ from fastapi import WebSocket, WebSocketDisconnect, Depends, Query
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 import cv2
-import base64
 import json
 import asyncio
+import time
 import uuid
-from typing import Optional
+from typing import Optional, Union
 from pathlib import Path
 from ..core.database import get_db
 from ..core.logger import get_logger
@@ -14,7 +14,26 @@ from ..core.config import settings
 from ..models.camera import Camera
 from ..models.detection import DetectionEvent
 from ..models.alert import Alert, AlertSeverity
-from ..services.yolo_service import get_yolo_service
+from ..services.inference_executor import get_inference_executor
+from ..services.yolo_service import is_yolo_service_ready, record_first_frame_latency
+from ..services.stage_timing import get_stage_timer
+from ..services.capture_registry import get_capture_registry
+from ..services.client_sender import ClientSender
+from ..services.stream_protocol import (
+    PROTOCOL_JSON,
+    PROTOCOL_BINARY,
+    serialize_message,
+    negotiate_protocol,
+    encode_json_frame,
+    encode_binary_frame
+)
+from ..services.stream_pipeline import (
+    StreamPipeline,
+    StageQueue,
+    END,
+    register_pipeline,
+    unregister_pipeline
+)
 from datetime import datetime
 from ..core.timezone import get_philippine_time_naive
 from ..core.detection_utils import calculate_violation_type
@@ -30,6 +49,7 @@ class ConnectionManager:
         self.active_streams: dict[str, bool] = {}  # Track active camera streams
         self._stream_locks: dict[str, asyncio.Lock] = {}  # Prevent race conditions
         self._stream_tasks: dict[str, asyncio.Task] = {}  # Track background tasks for monitoring
+        self.senders: dict[WebSocket, ClientSender] = {}  # Send queue and writer task per client (see client_sender)
 
         # Global violation tracking - persists across stream sessions to prevent duplicates
         # Key format: f"{camera_id}_{worker_id}"
@@ -38,14 +58,26 @@ class ConnectionManager:
         self.last_worker_screenshot_time: dict[str, datetime] = {}  # Last screenshot time
 
     async def connect(self, websocket: WebSocket, camera_id: str):
-        """Connect a client to a camera stream"""
-        await websocket.accept()
+        """Connect a client to a camera stream, agreeing on the frame format via the WebSocket subprotocol"""
+        protocol = negotiate_protocol(websocket.scope.get('subprotocols', []))
+        await websocket.accept(subprotocol=protocol)
+        sender = ClientSender(
+            websocket, protocol or PROTOCOL_JSON,
+            on_close=lambda _: self.disconnect(websocket, camera_id),
+            max_pending=settings.WS_CLIENT_QUEUE_SIZE,
+            send_timeout=settings.WS_SEND_TIMEOUT_SECONDS
+        )
+        self.senders[websocket] = sender
+        sender.start()
         if camera_id not in self.active_connections:
             self.active_connections[camera_id] = []
         self.active_connections[camera_id].append(websocket)
 
     def disconnect(self, websocket: WebSocket, camera_id: str):
         """Disconnect a client from a camera stream"""
+        sender = self.senders.pop(websocket, None)
+        if sender is not None:
+            sender.stop()
         if camera_id in self.active_connections:
             if websocket in self.active_connections[camera_id]:
                 self.active_connections[camera_id].remove(websocket)
@@ -108,18 +140,52 @@ class ConnectionManager:
 
     async def broadcast(self, camera_id: str, message: dict):
         """Broadcast message to all clients watching a camera"""
-        if camera_id in self.active_connections:
-            disconnected = []
-            for connection in self.active_connections[camera_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.debug(f"Failed to send message to client on camera {camera_id}: {e}")
-                    disconnected.append(connection)
-
-            # Remove disconnected clients
-            for conn in disconnected:
-                self.disconnect(conn, camera_id)
+        await self.broadcast_text(camera_id, serialize_message(message))
+
+    async def broadcast_text(self, camera_id: str, text: str):
+        """
+        Queue an already serialized message for every client (JSON is encoded once, not per client)
+
+        Guaranteed delivery: the message waits in each client's queue until it is sent.
+        """
+        for connection in list(self.active_connections.get(camera_id, [])):
+            sender = self.senders.get(connection)
+            if sender is not None:
+                sender.send(text)
+
+    async def send_to(self, websocket: WebSocket, message: dict):
+        """Queue a message for one client"""
+        sender = self.senders.get(websocket)
+        if sender is not None:
+            sender.send(serialize_message(message))
+
+    def frame_protocols(self, camera_id: str) -> set[str]:
+        """Frame formats the clients of a camera negotiated"""
+        return {self.senders[c].protocol for c in self.active_connections.get(camera_id, []) if c in self.senders}
+
+    async def broadcast_frame(self, camera_id: str, encoded: dict[str, Union[str, bytes]]):
+        """
+        Offer a frame message to each client in its negotiated format (never waits for the network)
+
+        A frame still waiting in a client's queue is replaced (latest frame wins).
+
+        Args:
+            camera_id: Camera identifier
+            encoded: Frame message per protocol, built once for all clients (text or binary).
+                     Clients whose format is missing (connected after encoding) get the next frame.
+        """
+        for connection in list(self.active_connections.get(camera_id, [])):
+            sender = self.senders.get(connection)
+            payload = encoded.get(sender.protocol) if sender is not None else None
+            if payload is not None:
+                sender.send_frame(payload)
+
+    def get_client_stats(self) -> dict[str, list[dict]]:
+        """Get sent and dropped frame counts of every client, by camera"""
+        return {
+            camera_id: [self.senders[c].get_stats() for c in connections if c in self.senders]
+            for camera_id, connections in list(self.active_connections.items())
+        }
 
 
 manager = ConnectionManager()
@@ -196,7 +262,7 @@ def cleanup_stale_workers(
         logger.debug(f"Cleaned up tracking data for Worker #{worker_id} (camera {camera_id}, not seen for {stale_threshold}+ seconds)")
 
 
-async def save_violation_with_snapshot(
+def write_violation_with_snapshot(
     worker: dict,
     camera_id: str,
     camera: Camera,
@@ -205,9 +271,9 @@ async def save_violation_with_snapshot(
     db: Session,
     current_time: datetime,
     violation_duration: float
-) -> None:
+) -> dict:
     """
-    Save a violation event with snapshot to database and create an alert.
+    Upload a violation snapshot and save the violation event and its alert (blocking).
 
     Args:
         worker: Worker dictionary with violation info
@@ -218,6 +284,9 @@ async def save_violation_with_snapshot(
         db: Database session
         current_time: Current timestamp
         violation_duration: How long violation has persisted
+
+    Returns:
+        The alert notification message for the camera's clients
     """
     worker_id = worker.get('worker_id')
     worker_violation_type = worker.get('violation_type', 'Safety violation')
@@ -255,7 +324,7 @@ async def save_violation_with_snapshot(
     detection_event = DetectionEvent(
         camera_id=camera_id,
         worker_id=str(worker_id),
-        track_id=None,
+        track_id=worker.get('track_id'),
         person_detected=True,
         hardhat_detected=worker.get('hardhat', False),
         no_hardhat_detected=worker.get('no_hardhat', False),
@@ -289,7 +358,7 @@ async def save_violation_with_snapshot(
     alert = Alert(
         detection_event_id=detection_event.id,
         worker_id=str(worker_id),
-        track_id=None,
+        track_id=worker.get('track_id'),
         severity=severity,
         message=f"Worker #{worker_id}: {worker_violation_type} at {camera.location}"
     )
@@ -309,17 +378,40 @@ async def save_violation_with_snapshot(
             'timestamp': alert.created_at.isoformat()
         }
     }
+    return alert_message
+
+
+async def save_violation_with_snapshot(
+    worker: dict,
+    camera_id: str,
+    camera: Camera,
+    annotated_frame,
+    results: dict,
+    db: Session,
+    current_time: datetime,
+    violation_duration: float
+) -> None:
+    """
+    Save a violation event with snapshot to database and create an alert.
+
+    The upload and DB writes run on the executor's I/O threads; the alert is
+    then broadcast to the camera's clients. Arguments as in write_violation_with_snapshot.
+    """
+    alert_message = await get_inference_executor().run_io(
+        write_violation_with_snapshot,
+        worker, camera_id, camera, annotated_frame, results, db, current_time, violation_duration
+    )
     await manager.broadcast(camera_id, alert_message)
 
 
-async def save_compliance_snapshot(
+def write_compliance_snapshot(
     worker: dict,
     camera_id: str,
     results: dict,
     db: Session
 ) -> bool:
     """
-    Save a compliance snapshot for a worker.
+    Save a compliance snapshot for a worker (blocking).
 
     Args:
         worker: Worker dictionary
@@ -336,7 +428,7 @@ async def save_compliance_snapshot(
         detection_event = DetectionEvent(
             camera_id=camera_id,
             worker_id=str(worker_id),
-            track_id=None,
+            track_id=worker.get('track_id'),
             person_detected=True,
             hardhat_detected=worker.get('hardhat', False),
             no_hardhat_detected=worker.get('no_hardhat', False),
@@ -363,6 +455,21 @@ async def save_compliance_snapshot(
         return False
 
 
+async def save_compliance_snapshot(
+    worker: dict,
+    camera_id: str,
+    results: dict,
+    db: Session
+) -> bool:
+    """
+    Save a compliance snapshot for a worker on the executor's I/O threads.
+
+    Returns:
+        True if saved successfully, False otherwise
+    """
+    return await get_inference_executor().run_io(write_compliance_snapshot, worker, camera_id, results, db)
+
+
 async def process_camera_stream(
     camera_id: str,
     camera: Camera,
@@ -378,17 +485,30 @@ async def process_camera_stream(
     # Create new database session for this background task (thread-safe)
     from ..core.database import SessionLocal
     db = None
-    cap = None
+    yolo_service = None
+    pipeline = None
+
+    stream_start = time.perf_counter()
+    stage_timer = get_stage_timer()
 
     try:
         db = SessionLocal()
-        # Send status update: Loading model
-        await manager.broadcast(camera_id, {
-            'type': 'status',
-            'message': 'Loading YOLO detection model...'
-        })
+        # Send status update only if the model isn't ready yet (normally warmed up at startup)
+        if not is_yolo_service_ready():
+            await manager.broadcast(camera_id, {
+                'type': 'status',
+                'message': 'Loading YOLO detection model...'
+            })
 
-        yolo_service = get_yolo_service()
+        # Inference and frame reads run in the executor's thread pools, never on the event loop
+        executor = get_inference_executor()
+        yolo_service = await executor.get_service()
+        yolo_service.configure_camera(
+            camera_id,
+            motion_sensitivity=camera.motion_sensitivity,
+            roi_polygon=camera.roi_polygon,
+            tile_grid=camera.tile_grid
+        )
 
         # Send status update: Opening camera
         await manager.broadcast(camera_id, {
@@ -432,9 +552,31 @@ async def process_camera_stream(
 
             logger.info(f"Detected {'video file' if is_video_file else 'stream URL'}: {source}")
 
-        cap = cv2.VideoCapture(source)
+        # The stream's queues exist before subscribing: a shared decoder delivers frames right away
+        pipeline = StreamPipeline(camera_id)
+        captured = pipeline.add_queue('capture', 1, StageQueue.LATEST)
+        to_encode = pipeline.add_queue('encode', 1, StageQueue.LATEST)
+        to_broadcast = pipeline.add_queue('broadcast', 1, StageQueue.LATEST)
+        to_persist = pipeline.add_queue('persist', settings.STREAM_PERSIST_QUEUE_SIZE, StageQueue.BLOCK)
+
+        async def open_capture():
+            cap = await executor.open_capture(source)
+            if cap.isOpened():
+                # Only a request to OpenCV (most RTSP sources ignore it); PyAV captures already decode to the stream width
+                cap.set(3, 1280)
+                cap.set(4, 720)
+                total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) if is_video_file else 0
+                fps = cap.get(cv2.CAP_PROP_FPS) if is_video_file else 30
+                logger.info(f"Stream info - Total frames: {total_frames}, FPS: {fps}, Is video file: {is_video_file}")
+            return cap
+
+        # Cameras reading the same source share one decoder (see capture_registry)
+        pipeline.capture = await get_capture_registry().subscribe(
+            source, camera_id, captured, open_capture,
+            is_video_file=is_video_file, max_fps=settings.VIDEO_STREAM_FPS
+        )
 
-        if not cap.isOpened():
+        if pipeline.capture is None:
             error_msg = f"Unable to open camera {source}. Please check if the camera is connected and not being used by another application."
             logger.error(f"Failed to open camera stream: {stream_source}")
 
@@ -445,209 +587,291 @@ async def process_camera_stream(
             })
             return
 
-        cap.set(3, 1280)
-        cap.set(4, 720)
-
-        # Get total frame count for video files (for loop support)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) if is_video_file else 0
-        fps = cap.get(cv2.CAP_PROP_FPS) if is_video_file else 30
-        logger.info(f"Stream info - Total frames: {total_frames}, FPS: {fps}, Is video file: {is_video_file}")
-
         # Send success message: Stream started
         await manager.broadcast(camera_id, {
             'type': 'status',
             'message': 'Stream started successfully!'
         })
 
-        frame_count = 0
+        # The stream runs as concurrent stages connected by bounded queues (see stream_pipeline):
+        # capture keeps only the newest frame, encode/broadcast skip frames they can't keep up
+        # with, and persistence sees every inferred frame (it never drops)
 
-        while cap.isOpened() and manager.is_stream_active(camera_id):
-            try:
-                success, frame = cap.read()
-                if not success:
-                    # For video files, loop back to the beginning
-                    if is_video_file and total_frames > 0:
-                        logger.info(f"Video {source} reached end, looping back to start")
-                        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)  # Reset to first frame
-                        success, frame = cap.read()
-                        if not success:
-                            logger.error(f"Failed to loop video {source}")
-                            break
-                    else:
-                        # For live streams or if loop fails, exit
-                        break
-
-                # Perform detection with per-camera worker tracking
-                annotated_frame, results = yolo_service.detect_with_tracking(frame, camera_id=camera_id)
-            except Exception as e:
-                logger.error(f"Error processing frame for camera {camera_id}: {e}", exc_info=True)
-                # Send error to clients
-                await manager.broadcast(camera_id, {
-                    'type': 'error',
-                    'message': f'Frame processing error: {str(e)}'
-                })
-                # Continue to next frame instead of crashing
-                await asyncio.sleep(0.1)
-                continue
-
-            # Check for partial visibility
-            is_partial, partial_reason = detect_partial_visibility(results)
-
-            # Encode frame to base64 for transmission
-            _, buffer = cv2.imencode('.jpg', annotated_frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-            frame_base64 = base64.b64encode(buffer).decode('utf-8')
-
-            # Prepare message
-            message = {
-                'type': 'frame',
-                'camera_id': camera_id,
-                'frame': frame_base64,
-                'results': {
-                    'detected_classes': results['detected_classes'],
-                    'is_compliant': results['is_compliant'],
-                    'safety_status': results['safety_status'],
-                    'violation_type': results.get('violation_type'),
-                    'confidence_scores': results['confidence_scores'],
-                    'person_detected': results.get('person_detected', False),
-                    'person_count': sum(1 for d in results.get('detections', []) if d.get('class') == 'Person'),
-                    'is_partial': is_partial,
-                    'partial_reason': partial_reason
-                },
-                'timestamp': get_philippine_time_naive().isoformat()
-            }
-
-            # Broadcast to all connected clients
-            await manager.broadcast(camera_id, message)
-
-            # Get current time for all timing operations
-            current_time = get_philippine_time_naive()
-            workers = results.get('workers', [])
-
-            # Get current worker IDs to detect workers who left
-            current_worker_ids = {worker.get('worker_id') for worker in workers if worker.get('worker_id') is not None}
-
-            # Update last seen time for all current workers
-            for worker in workers:
-                worker_id = worker.get('worker_id')
-                if worker_id is not None:
-                    last_worker_seen_time[worker_id] = current_time
-
-            # Clean up tracking dictionaries for workers who left the frame (memory leak prevention)
-            # Check every 5 seconds (30 FPS * 5 sec = 150 frames) for better memory management
-            if frame_count % 150 == 0:  # Check every 5 seconds
-                stale_threshold = 15  # seconds - workers not seen for 15+ seconds are removed
-                cleanup_stale_workers(
-                    camera_id,
-                    manager,
-                    last_worker_seen_time,
-                    current_worker_ids,
-                    current_time,
-                    stale_threshold
-                )
+        async def infer_stage():
+            """Detect on the newest captured frame, at most VIDEO_STREAM_FPS times per second"""
+            frame_interval = 1.0 / settings.VIDEO_STREAM_FPS
+            while manager.is_stream_active(camera_id):
+                try:
+                    item = await asyncio.wait_for(captured.get(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue  # No frame yet - check the stream still has viewers
+                if item is END:
+                    break
+                frame, captured_at = item
+                started = time.perf_counter()
 
-            # NEW DETECTION SAVING LOGIC:
-            # 1. Save violations only after 5 seconds of persistence
-            # 2. Save periodic compliance snapshots every 5 minutes
-            if save_detections:
+                try:
+                    # Perform detection with per-camera worker tracking
+                    with stage_timer.span('detect', camera_id):
+                        annotated_frame, results = await executor.detect_with_tracking(frame, camera_id=camera_id)
+                except Exception as e:
+                    logger.error(f"Error processing frame for camera {camera_id}: {e}", exc_info=True)
+                    # Send error to clients
+                    await manager.broadcast(camera_id, {
+                        'type': 'error',
+                        'message': f'Frame processing error: {str(e)}'
+                    })
+                    # Continue to next frame instead of crashing
+                    await asyncio.sleep(0.1)
+                    continue
+
+                # Check for partial visibility
+                is_partial, partial_reason = detect_partial_visibility(results)
+
+                inferred = {
+                    'frame': annotated_frame,
+                    'results': results,
+                    'is_partial': is_partial,
+                    'partial_reason': partial_reason,
+                    # In metadata mode the frame is un-annotated and the clients draw the overlays
+                    'metadata_mode': yolo_service.stream_mode == 'metadata',
+                    'captured_at': captured_at,
+                    'time': get_philippine_time_naive()
+                }
+                to_encode.put_nowait(inferred)
+                await to_persist.put(inferred)
+
+                # Keep to the target frame rate from settings
+                delay = frame_interval - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            pipeline.stop()
+            to_encode.put_nowait(END)
+            await to_persist.put(END)
+
+        async def encode_stage():
+            """JPEG-encode the newest inferred frame and serialize its message"""
+            # Metadata mode: detections go out every frame, images at most STREAM_IMAGE_FPS
+            image_interval = 1.0 / settings.STREAM_IMAGE_FPS if settings.STREAM_IMAGE_FPS > 0 else 0.0
+            last_image_sent = 0.0
+
+            while (item := await to_encode.get()) is not END:
+                results = item['results']
+                metadata_mode = item['metadata_mode']
+                send_image = True
+                if metadata_mode and image_interval:
+                    now = time.monotonic()
+                    send_image = now - last_image_sent >= image_interval
+                    if send_image:
+                        last_image_sent = now
+
+                # Prepare message
+                message = {
+                    'type': 'frame',
+                    'camera_id': camera_id,
+                    'results': {
+                        'detected_classes': results['detected_classes'],
+                        'is_compliant': results['is_compliant'],
+                        'safety_status': results['safety_status'],
+                        'violation_type': results.get('violation_type'),
+                        'confidence_scores': results['confidence_scores'],
+                        'person_detected': results.get('person_detected', False),
+                        'person_count': results.get('total_workers', 0),
+                        'is_partial': item['is_partial'],
+                        'partial_reason': item['partial_reason']
+                    },
+                    'timestamp': item['time'].isoformat()
+                }
+
+                # JPEG-encode the frame (metadata-only messages skip it)
+                if send_image:
+                    with stage_timer.span('encode', camera_id):
+                        _, buffer = await executor.run_io(
+                            cv2.imencode, '.jpg', item['frame'], [cv2.IMWRITE_JPEG_QUALITY, 85]
+                        )
+                if settings.STREAM_STAGE_TIMINGS:
+                    message['timings'] = stage_timer.frame_timings(camera_id)
+
+                # One message per format the viewers negotiated, shared by all of them:
+                # base64 in JSON for 'ppe.json' clients, header + JSON + raw JPEG for 'ppe.bin.v1'
+                with stage_timer.span('serialize', camera_id):
+                    jpeg = buffer.data if send_image else None
+                    if metadata_mode:
+                        message['overlay'] = yolo_service.get_overlay_metadata(results, camera_id)
+                    protocols = manager.frame_protocols(camera_id)
+                    encoded = {}
+                    if PROTOCOL_JSON in protocols:
+                        encoded[PROTOCOL_JSON] = encode_json_frame(message, jpeg)
+                    if PROTOCOL_BINARY in protocols:
+                        encoded[PROTOCOL_BINARY] = encode_binary_frame(message, jpeg)
+                to_broadcast.put_nowait((encoded, item['captured_at']))
+
+            to_broadcast.put_nowait(END)
+
+        async def broadcast_stage():
+            """Hand the newest serialized frame message to every client's send queue"""
+            first_frame = True
+            while (item := await to_broadcast.get()) is not END:
+                encoded, captured_at = item
+                with stage_timer.span('broadcast', camera_id):
+                    await manager.broadcast_frame(camera_id, encoded)
+                stage_timer.record('latency', (time.perf_counter() - captured_at) * 1000, camera_id)
+
+                if first_frame:
+                    first_frame = False
+                    first_frame_ms = (time.perf_counter() - stream_start) * 1000
+                    record_first_frame_latency(camera_id, first_frame_ms)
+                    logger.info(f"Camera {camera_id} first frame after {first_frame_ms:.0f}ms")
+
+        async def persist_stage():
+            """Worker tracking bookkeeping, violation persistence and DB writes for every inferred frame"""
+            nonlocal last_global_compliance_snapshot_time
+            frame_count = 0
+
+            while (item := await to_persist.get()) is not END:
+                results = item['results']
+                annotated_frame = item['frame']
+                metadata_mode = item['metadata_mode']
+
+                # Time of the frame (not of its processing here) for all timing operations
+                current_time = item['time']
+                workers = results.get('workers', [])
+
+                # Get current worker IDs to detect workers who left
+                current_worker_ids = {worker.get('worker_id') for worker in workers if worker.get('worker_id') is not None}
+
+                # Update last seen time for all current workers
                 for worker in workers:
                     worker_id = worker.get('worker_id')
-                    is_compliant = worker.get('is_compliant')
-
-                    # Skip workers with unknown status (None)
-                    if is_compliant is None:
-                        continue
-
-                    # ========== HANDLE VIOLATIONS (with 5-second persistence) ==========
-                    if is_compliant is False:
-                        worker_violation_type = worker.get('violation_type', 'Safety violation')
-
-                        # Use composite key (camera_id + worker_id) for global tracking
-                        tracking_key = f"{camera_id}_{worker_id}"
-
-                        # Track when violation started
-                        if tracking_key not in manager.worker_violation_start_time:
-                            # First time seeing this violation
-                            manager.worker_violation_start_time[tracking_key] = current_time
-                            logger.debug(f"Worker #{worker_id} (camera {camera_id}) violation started at {current_time}")
-                            continue  # Don't save yet, need to persist for 5 seconds
-
-                        # Check if violation has persisted for 5 seconds
-                        violation_duration = (current_time - manager.worker_violation_start_time[tracking_key]).total_seconds()
-
-                        if violation_duration < violation_persistence_seconds:
-                            # Violation not yet persisted long enough
+                    if worker_id is not None:
+                        last_worker_seen_time[worker_id] = current_time
+
+                # Clean up tracking dictionaries for workers who left the frame (memory leak prevention)
+                # Check every 5 seconds (30 FPS * 5 sec = 150 frames) for better memory management
+                if frame_count % 150 == 0:  # Check every 5 seconds
+                    stale_threshold = 15  # seconds - workers not seen for 15+ seconds are removed
+                    cleanup_stale_workers(
+                        camera_id,
+                        manager,
+                        last_worker_seen_time,
+                        current_worker_ids,
+                        current_time,
+                        stale_threshold
+                    )
+
+                # NEW DETECTION SAVING LOGIC:
+                # 1. Save violations only after 5 seconds of persistence
+                # 2. Save periodic compliance snapshots every 5 minutes
+                if save_detections:
+                    for worker in workers:
+                        worker_id = worker.get('worker_id')
+                        is_compliant = worker.get('is_compliant')
+
+                        # Skip workers with unknown status (None) or without a confirmed track yet
+                        if is_compliant is None or worker_id is None:
                             continue
 
-                        # Check if cooldown period has passed since last violation save
-                        last_violation_save = manager.last_worker_violation_save_time.get(tracking_key)
-                        if last_violation_save is not None:
-                            time_since_last_save = (current_time - last_violation_save).total_seconds()
-                            logger.debug(f"Worker #{worker_id} cooldown check: {time_since_last_save:.1f}s since last save (key: {tracking_key})")
-                            if time_since_last_save < violation_cooldown_seconds:
-                                logger.debug(f"Worker #{worker_id} BLOCKED by cooldown ({time_since_last_save:.1f}s < {violation_cooldown_seconds}s)")
-                                continue  # Still in cooldown
-                        else:
-                            logger.debug(f"Worker #{worker_id} first violation save for tracking_key: {tracking_key}")
-
-                        # Save the violation (it has persisted for 5+ seconds)
-                        try:
-                            await save_violation_with_snapshot(
-                                worker, camera_id, camera, annotated_frame,
-                                results, db, current_time, violation_duration
-                            )
-                            # Update last violation save time (global)
-                            manager.last_worker_violation_save_time[tracking_key] = current_time
-                            logger.info(f"Saved violation for Worker #{worker_id} (duration: {violation_duration:.1f}s)")
-
-                        except SQLAlchemyError as e:
-                            logger.error(f"Database error saving violation for Worker #{worker_id} at camera {camera_id}: {e}", exc_info=True)
-                            db.rollback()
-                        except Exception as e:
-                            logger.error(f"Unexpected error saving violation for Worker #{worker_id} at camera {camera_id}: {e}", exc_info=True)
-                            db.rollback()
-
-                    else:
-                        # ========== HANDLE COMPLIANCE ==========
-                        # Worker is compliant - clear violation start time if exists
-                        tracking_key = f"{camera_id}_{worker_id}"
-                        if tracking_key in manager.worker_violation_start_time:
-                            del manager.worker_violation_start_time[tracking_key]
-                            logger.debug(f"Worker #{worker_id} violation cleared (now compliant)")
-
-            # ========== GLOBAL COMPLIANCE SNAPSHOT TIMER ==========
-            # Check if it's time for a global compliance snapshot (every 5 minutes)
-            # This runs AFTER processing all workers, so we can save ALL compliant workers at once
-            should_save_global_compliance = (
-                (current_time - last_global_compliance_snapshot_time).total_seconds() >= compliance_snapshot_interval_seconds
-            )
-
-            if should_save_global_compliance and save_detections:
-                # Save compliance snapshot for ALL currently compliant workers
-                compliant_workers_saved = 0
-                for worker in workers:
-                    worker_id = worker.get('worker_id')
-                    is_compliant = worker.get('is_compliant')
-
-                    # Only save if worker is compliant (True)
-                    if is_compliant is True:
-                        if await save_compliance_snapshot(worker, camera_id, results, db):
-                            compliant_workers_saved += 1
-
-                # Update global snapshot timer
-                last_global_compliance_snapshot_time = current_time
-                if compliant_workers_saved > 0:
-                    logger.info(f"Global compliance snapshot: saved {compliant_workers_saved} compliant worker(s) at camera {camera_id}")
-
-            # If partial detection, log it
-            if is_partial and results.get('person_detected', False):
-                logger.debug(f"Partial detection at camera {camera_id}: {partial_reason}")
+                        # ========== HANDLE VIOLATIONS (with 5-second persistence) ==========
+                        if is_compliant is False:
+                            worker_violation_type = worker.get('violation_type', 'Safety violation')
+
+                            # Use composite key (camera_id + worker_id) for global tracking
+                            tracking_key = f"{camera_id}_{worker_id}"
+
+                            # Track when violation started
+                            if tracking_key not in manager.worker_violation_start_time:
+                                # First time seeing this violation
+                                manager.worker_violation_start_time[tracking_key] = current_time
+                                logger.debug(f"Worker #{worker_id} (camera {camera_id}) violation started at {current_time}")
+                                continue  # Don't save yet, need to persist for 5 seconds
+
+                            # Check if violation has persisted for 5 seconds
+                            violation_duration = (current_time - manager.worker_violation_start_time[tracking_key]).total_seconds()
+
+                            if violation_duration < violation_persistence_seconds:
+                                # Violation not yet persisted long enough
+                                continue
+
+                            # Check if cooldown period has passed since last violation save
+                            last_violation_save = manager.last_worker_violation_save_time.get(tracking_key)
+                            if last_violation_save is not None:
+                                time_since_last_save = (current_time - last_violation_save).total_seconds()
+                                logger.debug(f"Worker #{worker_id} cooldown check: {time_since_last_save:.1f}s since last save (key: {tracking_key})")
+                                if time_since_last_save < violation_cooldown_seconds:
+                                    logger.debug(f"Worker #{worker_id} BLOCKED by cooldown ({time_since_last_save:.1f}s < {violation_cooldown_seconds}s)")
+                                    continue  # Still in cooldown
+                            else:
+                                logger.debug(f"Worker #{worker_id} first violation save for tracking_key: {tracking_key}")
+
+                            # Save the violation (it has persisted for 5+ seconds)
+                            try:
+                                # Snapshots are annotated even when the clients draw the overlays
+                                snapshot_frame = annotated_frame
+                                if metadata_mode:
+                                    snapshot_frame = yolo_service.annotate(annotated_frame.copy(), results, camera_id)
+                                with stage_timer.span('db', camera_id):
+                                    await save_violation_with_snapshot(
+                                        worker, camera_id, camera, snapshot_frame,
+                                        results, db, current_time, violation_duration
+                                    )
+                                # Update last violation save time (global)
+                                manager.last_worker_violation_save_time[tracking_key] = current_time
+                                logger.info(f"Saved violation for Worker #{worker_id} (duration: {violation_duration:.1f}s)")
+
+                            except SQLAlchemyError as e:
+                                logger.error(f"Database error saving violation for Worker #{worker_id} at camera {camera_id}: {e}", exc_info=True)
+                                db.rollback()
+                            except Exception as e:
+                                logger.error(f"Unexpected error saving violation for Worker #{worker_id} at camera {camera_id}: {e}", exc_info=True)
+                                db.rollback()
 
-            frame_count += 1
+                        else:
+                            # ========== HANDLE COMPLIANCE ==========
+                            # Worker is compliant - clear violation start time if exists
+                            tracking_key = f"{camera_id}_{worker_id}"
+                            if tracking_key in manager.worker_violation_start_time:
+                                del manager.worker_violation_start_time[tracking_key]
+                                logger.debug(f"Worker #{worker_id} violation cleared (now compliant)")
+
+                # ========== GLOBAL COMPLIANCE SNAPSHOT TIMER ==========
+                # Check if it's time for a global compliance snapshot (every 5 minutes)
+                # This runs AFTER processing all workers, so we can save ALL compliant workers at once
+                should_save_global_compliance = (
+                    (current_time - last_global_compliance_snapshot_time).total_seconds() >= compliance_snapshot_interval_seconds
+                )
 
-            # Adaptive delay to maintain target frame rate from settings
-            # Calculate sleep time based on configured FPS
-            target_fps = settings.VIDEO_STREAM_FPS
-            await asyncio.sleep(1.0 / target_fps)
+                if should_save_global_compliance and save_detections:
+                    # Save compliance snapshot for ALL currently compliant workers
+                    compliant_workers_saved = 0
+                    for worker in workers:
+                        worker_id = worker.get('worker_id')
+                        is_compliant = worker.get('is_compliant')
+
+                        # Only save if worker is compliant (True) and has a confirmed track
+                        if is_compliant is True and worker_id is not None:
+                            with stage_timer.span('db', camera_id):
+                                saved = await save_compliance_snapshot(worker, camera_id, results, db)
+                            if saved:
+                                compliant_workers_saved += 1
+
+                    # Update global snapshot timer
+                    last_global_compliance_snapshot_time = current_time
+                    if compliant_workers_saved > 0:
+                        logger.info(f"Global compliance snapshot: saved {compliant_workers_saved} compliant worker(s) at camera {camera_id}")
+
+                # If partial detection, log it
+                if item['is_partial'] and results.get('person_detected', False):
+                    logger.debug(f"Partial detection at camera {camera_id}: {item['partial_reason']}")
+
+                frame_count += 1
+
+        register_pipeline(pipeline)
+        pipeline.start_stage('infer', infer_stage)
+        pipeline.start_stage('encode', encode_stage)
+        pipeline.start_stage('broadcast', broadcast_stage)
+        pipeline.start_stage('persist', persist_stage)
+        await pipeline.run()
 
     except asyncio.CancelledError:
         logger.info(f"Stream cancelled for camera {camera_id}")
@@ -667,12 +891,10 @@ async def process_camera_stream(
 
     finally:
         # Ensure cleanup happens no matter what
-        if cap is not None:
-            try:
-                cap.release()
-                logger.debug(f"Released video capture for camera {camera_id}")
-            except Exception as e:
-                logger.error(f"Error releasing video capture for camera {camera_id}: {e}")
+        if pipeline is not None:
+            # Leaves the shared decoder, which releases the capture after its last subscriber
+            pipeline.stop()
+            unregister_pipeline(pipeline)
 
         if db is not None:
             try:
@@ -683,7 +905,8 @@ async def process_camera_stream(
 
         # Clean up YOLO service camera tracker (prevent memory leak)
         try:
-            yolo_service.cleanup_camera_tracker(camera_id)
+            if yolo_service is not None:
+                yolo_service.cleanup_camera_tracker(camera_id)
         except Exception as e:
             logger.error(f"Error cleaning up camera tracker for {camera_id}: {e}")
 
@@ -736,6 +959,9 @@ async def start_stream_handler(camera_id: str, websocket: WebSocket, db: Session
             data = await websocket.receive_text()
             # Handle client commands if needed
             if data == "ping":
-                await websocket.send_json({'type': 'pong'})
+                await manager.send_to(websocket, {'type': 'pong'})
     except WebSocketDisconnect:
         pass
+    except RuntimeError as e:
+        # The server closed the socket (client dropped for falling behind, see client_sender)
+        logger.debug(f"WebSocket for camera {camera_id} closed by the server: {e}")
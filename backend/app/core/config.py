@@ -33,10 +33,69 @@ class Settings(BaseSettings):
 
     # Video Settings
     VIDEO_STREAM_FPS: int = 30
+    STREAM_MAX_WIDTH: int = 0  # Downscale streamed frames to this width before drawing overlays (0 = capture resolution; snapshots use the same frame)
+    STREAM_MODE: str = "annotated"  # 'annotated' (overlays drawn on the server) or 'metadata' (raw frames + box list, clients draw)
+    STREAM_IMAGE_FPS: float = 0.0  # Metadata mode: max rate of frames sent with an image (0 = every frame); box lists go out every frame
+    STREAM_STAGE_TIMINGS: bool = False  # Attach per-stage timings of each frame to its WebSocket message ('timings')
+    STAGE_TIMING_WINDOW: int = 300  # Samples per camera and stage behind the latency percentiles (/api/performance/stages)
     CONFIDENCE_THRESHOLD: float = 0.50
 
     # YOLO Model
     MODEL_PATH: str = "best.pt"  # YOLOv8s model in backend directory
+    INFERENCE_BACKEND: str = "torch"  # 'torch' (ultralytics/PyTorch) or 'onnx' (ONNX Runtime, exported once next to MODEL_PATH)
+    MODEL_PRECISION: str = "fp32"  # 'fp32' or 'int8' (quantized ONNX model, see quantize_model.py)
+    QUANTIZATION_MAX_ACCURACY_DROP: float = 0.02  # Max per-class precision/recall drop vs FP32 before INT8 is rejected
+    MODEL_EAGER_LOAD: bool = True  # Load and warm up the model in the background at startup (False = on first use)
+    MODEL_WARMUP_RUNS: int = 2  # Dummy inferences per input size during warm-up (0 = load only)
+    MODEL_REGISTRY_DIR: str = "models"  # Versioned model files (<version>.pt) for hot swapping; MODEL_PATH is version 'default'
+
+    # Worker Tracking
+    TRACKER_MODE: str = "iou"  # 'iou' (IoU matrix + optimal assignment) or 'bytetrack' (ultralytics ByteTrack)
+    TRACKER_CONFIG: str = "bytetrack_custom.yaml"  # ByteTrack parameters (relative to backend directory)
+
+    # Inference Executor (keeps YOLO and frame capture off the event loop)
+    INFERENCE_WORKERS: int = 2  # Threads running YOLO inference
+    CAPTURE_WORKERS: int = 8  # Threads reading frames from cameras
+    STREAM_IO_WORKERS: int = 4  # Threads for JPEG encoding, DB writes and snapshot uploads of the streams
+    STREAM_PERSIST_QUEUE_SIZE: int = 32  # Inferred frames waiting for persistence per camera (never dropped; detection waits when full)
+    WS_CLIENT_QUEUE_SIZE: int = 64  # Alerts/status messages waiting per viewer before a stalled viewer is disconnected (frames: newest only)
+    WS_SEND_TIMEOUT_SECONDS: float = 10.0  # A single WebSocket send taking longer disconnects the viewer
+    INFERENCE_MAX_PENDING: int = 16  # Max inference requests queued at once
+    INFERENCE_BATCH_SIZE: int = 8  # Max frames from different cameras per model call (1 = no batching)
+    INFERENCE_BATCH_WAIT_MS: float = 5.0  # Max wait for other cameras' frames before running a batch
+
+    # Capture Backend (how camera streams and video files are decoded)
+    CAPTURE_BACKEND: str = "opencv"  # 'opencv' (cv2.VideoCapture) or 'pyav' (FFmpeg via PyAV: threaded decode, scaled by the decoder)
+    CAPTURE_WIDTH: int = 1280  # Width frames are decoded to with pyav when STREAM_MAX_WIDTH is 0 (never below the model input size; 0 = source size)
+    CAPTURE_DECODE_THREADS: int = 0  # PyAV decoder threads per source (0 = FFmpeg picks from the CPU count)
+    CAPTURE_KEYFRAMES_ONLY: bool = False  # PyAV: decode keyframes only (one frame per GOP, for very low FPS monitoring)
+
+    # Motion Gate (skip inference on static scenes, reusing the last results)
+    MOTION_GATE_ENABLED: bool = True
+    MOTION_GATE_SENSITIVITY: float = 0.8  # 0.0-1.0, default for cameras without their own motion_sensitivity
+    MOTION_GATE_MAX_SKIP_SECONDS: float = 5.0  # Force a full inference at least this often
+
+    # Detect-every-N (Kalman-predicted worker boxes on the frames in between)
+    FRAME_SKIP_MODE: str = "off"  # 'off', 'fixed' (every DETECT_EVERY_N_FRAMES) or 'adaptive' (N from inference time vs VIDEO_STREAM_FPS)
+    DETECT_EVERY_N_FRAMES: int = 3  # Fixed N, or starting N in adaptive mode
+    DETECT_EVERY_N_MAX: int = 10  # Upper bound for adaptive N
+
+    # Tiled Inference (cameras with a tile_grid run overlapping tiles as one batch)
+    TILE_OVERLAP: float = 0.2  # Fraction of a tile shared with each neighbour
+    TILE_MERGE_THRESHOLD: float = 0.6  # Cross-tile NMS: intersection over smaller box above which duplicates merge
+    TILE_INCLUDE_FULL_FRAME: bool = True  # Also run the whole frame (keeps workers larger than a tile intact)
+
+    # Adaptive Input Size (per camera, steps along 320/416/512/640 up to the configured input size)
+    ADAPTIVE_INPUT_SIZE: bool = False
+    INPUT_SIZE_BUDGET_MS: float = 0.0  # Target latency per inference incl. queueing (0 = one frame at VIDEO_STREAM_FPS)
+    INPUT_SIZE_PATIENCE: int = 5  # Inferences over / under the thresholds before the size steps
+
+    # Person-then-PPE Cascade (persons at low resolution, then PPE inside person crops)
+    CASCADE_ENABLED: bool = False
+    CASCADE_PERSON_SIZE: int = 320  # Input size of the person pass
+    CASCADE_CROP_SIZE: int = 256  # Input size of each person crop in the PPE pass
+    CASCADE_CROP_MARGIN: float = 0.1  # Crop growth around each person box (fraction of its size)
+    CASCADE_MAX_PERSONS: int = 6  # More persons than this: fall back to the single full pass
 
     # Security Settings
     ALLOW_PUBLIC_REGISTRATION: bool = False  # Disable public registration
@@ -96,6 +155,24 @@ class Settings(BaseSettings):
 
         return str(absolute_path)
 
+    def get_absolute_model_registry_dir(self) -> str:
+        """Get absolute path to the model registry directory, resolving relative paths"""
+        registry_dir = Path(self.MODEL_REGISTRY_DIR)
+        if registry_dir.is_absolute():
+            return str(registry_dir)
+
+        backend_dir = Path(__file__).parent.parent.parent
+        return str((backend_dir / registry_dir).resolve())
+
+    def get_absolute_tracker_config_path(self) -> str:
+        """Get absolute path to the ByteTrack config, resolving relative paths"""
+        config_path = Path(self.TRACKER_CONFIG)
+        if config_path.is_absolute():
+            return str(config_path)
+
+        backend_dir = Path(__file__).parent.parent.parent
+        return str((backend_dir / config_path).resolve())
+
 
 settings = Settings()
 settings.ensure_directories()
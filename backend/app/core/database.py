@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
@@ -25,6 +25,33 @@ def get_db():
         db.close()
 
 
+# Nullable columns added to existing tables after their first release: (table, column).
+# create_all() only creates missing tables, so these are added to older databases on startup.
+ADDED_COLUMNS = [
+    ('cameras', 'motion_sensitivity'),
+    ('cameras', 'roi_polygon'),
+    ('cameras', 'tile_grid'),
+]
+
+
+def add_missing_columns():
+    """Add the columns listed in ADDED_COLUMNS to databases created before they existed"""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with engine.begin() as connection:
+        for table_name, column_name in ADDED_COLUMNS:
+            if table_name not in existing_tables:
+                continue
+            existing_columns = {column['name'] for column in inspector.get_columns(table_name)}
+            if column_name in existing_columns:
+                continue
+            column = Base.metadata.tables[table_name].columns[column_name]
+            column_type = column.type.compile(dialect=engine.dialect)
+            connection.execute(text(f'ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}'))
+
+
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
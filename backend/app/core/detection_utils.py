@@ -1,7 +1,7 @@
 """
 Detection utilities for PPE compliance checking
 """
-from typing import Optional
+from typing import Optional, List, Dict, Any
 
 
 def calculate_violation_type(
@@ -57,3 +57,73 @@ def calculate_violation_type(
 
     # Default to generic violation if we can't determine specific type
     return "PPE Violation"
+
+
+def box_iou(bbox1: List[float], bbox2: List[float]) -> float:
+    """
+    Calculate Intersection over Union (IoU) between two [x1, y1, x2, y2] boxes
+
+    Args:
+        bbox1: First box
+        bbox2: Second box
+
+    Returns:
+        IoU score (0.0 to 1.0)
+    """
+    inter_w = max(0.0, min(bbox1[2], bbox2[2]) - max(bbox1[0], bbox2[0]))
+    inter_h = max(0.0, min(bbox1[3], bbox2[3]) - max(bbox1[1], bbox2[1]))
+    intersection = inter_w * inter_h
+    union = (bbox1[2] - bbox1[0]) * (bbox1[3] - bbox1[1]) + (bbox2[2] - bbox2[0]) * (bbox2[3] - bbox2[1]) - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+def match_detections(
+    reference: List[Dict],
+    candidate: List[Dict],
+    iou_threshold: float = 0.5
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Match candidate detections against reference detections of the same class
+
+    Used to compare inference backends/modes (or a model against ground truth).
+    Each reference box can be matched once; candidates are matched in order of
+    decreasing confidence to the unmatched reference box with the highest IoU.
+
+    Args:
+        reference: Reference detections ({'class', 'confidence', 'bbox'})
+        candidate: Candidate detections in the same format
+        iou_threshold: Minimum IoU for a match
+
+    Returns:
+        Per-class dict of {'tp', 'fp', 'fn', 'ious', 'confidence_deltas'}
+    """
+    stats = {}
+    classes = {d['class'] for d in reference} | {d['class'] for d in candidate}
+
+    for class_name in classes:
+        refs = [d for d in reference if d['class'] == class_name]
+        cands = sorted((d for d in candidate if d['class'] == class_name), key=lambda d: -d['confidence'])
+        matched = [False] * len(refs)
+        class_stats = {'tp': 0, 'fp': 0, 'fn': 0, 'ious': [], 'confidence_deltas': []}
+
+        for cand in cands:
+            best_idx, best_iou = None, iou_threshold
+            for idx, ref in enumerate(refs):
+                if matched[idx]:
+                    continue
+                iou = box_iou(cand['bbox'], ref['bbox'])
+                if iou >= best_iou:
+                    best_idx, best_iou = idx, iou
+
+            if best_idx is None:
+                class_stats['fp'] += 1
+            else:
+                matched[best_idx] = True
+                class_stats['tp'] += 1
+                class_stats['ious'].append(best_iou)
+                class_stats['confidence_deltas'].append(abs(cand['confidence'] - refs[best_idx]['confidence']))
+
+        class_stats['fn'] = matched.count(False)
+        stats[class_name] = class_stats
+
+    return stats
@@ -2,7 +2,7 @@
 Input validation utilities for API endpoints
 """
 from fastapi import HTTPException, status
-from typing import Optional
+from typing import List, Optional
 import re
 from pathlib import Path
 
@@ -137,6 +137,64 @@ def validate_confidence_threshold(threshold: float) -> float:
     return float(threshold)
 
 
+def validate_roi_polygon(points: List[List[float]]) -> List[List[float]]:
+    """
+    Validate a camera region-of-interest polygon
+
+    Args:
+        points: [x, y] vertices in normalized frame coordinates (0.0 to 1.0); empty clears the ROI
+
+    Returns:
+        Validated points as floats
+
+    Raises:
+        ValidationError: If the polygon is malformed or out of range
+    """
+    if len(points) == 0:
+        return []
+
+    if len(points) < 3:
+        raise ValidationError("ROI polygon needs at least 3 points")
+
+    if len(points) > 64:
+        raise ValidationError("ROI polygon too complex (max 64 points)")
+
+    validated = []
+    for point in points:
+        if len(point) != 2:
+            raise ValidationError("ROI polygon points must be [x, y] pairs")
+        x, y = float(point[0]), float(point[1])
+        if not (0.0 <= x <= 1.0 and 0.0 <= y <= 1.0):
+            raise ValidationError("ROI polygon coordinates must be between 0.0 and 1.0")
+        validated.append([x, y])
+
+    return validated
+
+
+def validate_tile_grid(tile_grid: str) -> str:
+    """
+    Validate a tiled inference grid
+
+    Args:
+        tile_grid: "COLSxROWS" with 1-9 columns and rows (e.g. "3x2"); empty disables tiling
+
+    Returns:
+        Normalized grid (e.g. "3x2"), or "" to disable tiling
+
+    Raises:
+        ValidationError: If the format is invalid
+    """
+    tile_grid = tile_grid.strip().lower()
+    if not tile_grid:
+        return ""
+
+    match = re.match(r'^([1-9])x([1-9])$', tile_grid)
+    if not match:
+        raise ValidationError("Tile grid must look like COLSxROWS with 1-9 each (e.g. 3x2)")
+
+    return f"{match.group(1)}x{match.group(2)}"
+
+
 def validate_camera_name(name: str) -> str:
     """
     Validate camera name
@@ -53,6 +53,11 @@ async def startup_event():
     archiving_service = get_archiving_service(archive_days=30)
     archiving_service.start_background_task(interval_hours=24)
 
+    # Load and warm up the YOLO model in the background so the first stream doesn't pay for it
+    if settings.MODEL_EAGER_LOAD:
+        from .services.inference_executor import get_inference_executor
+        get_inference_executor().start_warm_up()
+
     logger.info(f"{settings.APP_NAME} v{settings.APP_VERSION} started!")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"API Docs: http://{settings.HOST}:{settings.PORT}/docs")
@@ -65,6 +70,10 @@ async def shutdown_event():
     from .services.archiving_service import get_archiving_service
     archiving_service = get_archiving_service()
     archiving_service.stop_background_task()
+
+    # Stop inference worker threads
+    from .services.inference_executor import shutdown_inference_executor
+    shutdown_inference_executor()
     logger.info(f"{settings.APP_NAME} shutdown complete")
 
 
@@ -105,10 +114,13 @@ async def websocket_monitor(
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    from .services.yolo_service import is_yolo_service_ready
+
     return {
         "status": "healthy",
         "app": settings.APP_NAME,
-        "version": settings.APP_VERSION
+        "version": settings.APP_VERSION,
+        "model_ready": is_yolo_service_ready()
     }
 
 
@@ -116,7 +128,7 @@ async def health_check():
 @app.get("/api/system/health")
 async def system_health(db: Session = Depends(get_db)):
     """Get detailed system health status"""
-    from .services.yolo_service import get_yolo_service
+    from .services.yolo_service import get_loaded_yolo_service, is_yolo_service_ready, get_startup_metrics
 
     health_status = {
         "backend": {
@@ -144,15 +156,25 @@ async def system_health(db: Session = Depends(get_db)):
         health_status["database"]["message"] = f"Database error: {str(e)}"
         logger.error(f"Database health check failed: {e}")
 
-    # Check YOLO model
+    # Check YOLO model (readiness only - never triggers a model load)
     try:
-        yolo_service = get_yolo_service()
-        if yolo_service.model is not None:
+        yolo_service = get_loaded_yolo_service()
+        startup_metrics = get_startup_metrics()
+        if startup_metrics["error"]:
+            health_status["yolo_model"]["status"] = "error"
+            health_status["yolo_model"]["message"] = f"Model failed to load: {startup_metrics['error']}"
+        elif yolo_service is not None and is_yolo_service_ready():
             health_status["yolo_model"]["status"] = "loaded"
             health_status["yolo_model"]["message"] = f"Model loaded with {len(yolo_service.model.names)} classes"
+        elif yolo_service is not None:
+            health_status["yolo_model"]["status"] = "warming_up"
+            health_status["yolo_model"]["message"] = "Model loaded, running warm-up inferences"
+        elif settings.MODEL_EAGER_LOAD:
+            health_status["yolo_model"]["status"] = "loading"
+            health_status["yolo_model"]["message"] = "Model is loading"
         else:
             health_status["yolo_model"]["status"] = "not_loaded"
-            health_status["yolo_model"]["message"] = "Model not loaded"
+            health_status["yolo_model"]["message"] = "Model loads when the first stream starts"
     except Exception as e:
         health_status["yolo_model"]["status"] = "error"
         health_status["yolo_model"]["message"] = f"Model error: {str(e)}"
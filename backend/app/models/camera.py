@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Enum, Text, ForeignKey
+from sqlalchemy import Column, String, DateTime, Enum, Text, ForeignKey, Float
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -21,6 +21,9 @@ class Camera(Base):
     stream_url = Column(Text, nullable=True)  # Can be URL or device index (e.g., "0" for webcam)
     status = Column(Enum(CameraStatus), default=CameraStatus.ACTIVE)
     description = Column(Text, nullable=True)
+    motion_sensitivity = Column(Float, nullable=True)  # Motion gate sensitivity 0.0-1.0 (None = system default)
+    roi_polygon = Column(Text, nullable=True)  # JSON: [[x, y], ...] normalized 0.0-1.0 (None = full frame)
+    tile_grid = Column(String, nullable=True)  # Tiled inference grid "COLSxROWS", e.g. "3x2" (None = single pass)
     created_by = Column(String, ForeignKey("users.id"), nullable=True)  # Track who created this camera
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
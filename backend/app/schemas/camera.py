@@ -1,11 +1,14 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+import json
+from typing import List, Optional
 from datetime import datetime
 from ..models.camera import CameraStatus
 from ..core.validation import (
     validate_camera_name,
     validate_location,
     validate_camera_stream_url,
+    validate_roi_polygon,
+    validate_tile_grid,
     sanitize_string
 )
 
@@ -15,6 +18,9 @@ class CameraBase(BaseModel):
     location: str = Field(..., min_length=1, max_length=200)
     stream_url: Optional[str] = Field(None, max_length=2048)
     description: Optional[str] = Field(None, max_length=500)
+    motion_sensitivity: Optional[float] = Field(None, ge=0.0, le=1.0)
+    roi_polygon: Optional[List[List[float]]] = None  # Normalized [x, y] points (None = full frame)
+    tile_grid: Optional[str] = Field(None, max_length=5)  # Tiled inference, e.g. "3x2" (None = single pass)
 
     @field_validator('name')
     @classmethod
@@ -40,6 +46,20 @@ class CameraBase(BaseModel):
             return sanitize_string(v, max_length=500)
         return v
 
+    @field_validator('roi_polygon')
+    @classmethod
+    def validate_roi_polygon_field(cls, v):
+        if v is not None:
+            return validate_roi_polygon(v)
+        return v
+
+    @field_validator('tile_grid')
+    @classmethod
+    def validate_tile_grid_field(cls, v):
+        if v is not None:
+            return validate_tile_grid(v)
+        return v
+
 
 class CameraCreate(CameraBase):
     pass
@@ -51,6 +71,23 @@ class CameraUpdate(BaseModel):
     stream_url: Optional[str] = None
     status: Optional[CameraStatus] = None
     description: Optional[str] = None
+    motion_sensitivity: Optional[float] = Field(None, ge=0.0, le=1.0)  # Explicit null clears it (system default)
+    roi_polygon: Optional[List[List[float]]] = None  # Empty list clears the ROI
+    tile_grid: Optional[str] = Field(None, max_length=5)  # Empty string turns tiling off
+
+    @field_validator('roi_polygon')
+    @classmethod
+    def validate_roi_polygon_field(cls, v):
+        if v is not None:
+            return validate_roi_polygon(v)
+        return v
+
+    @field_validator('tile_grid')
+    @classmethod
+    def validate_tile_grid_field(cls, v):
+        if v is not None:
+            return validate_tile_grid(v)
+        return v
 
 
 class CameraResponse(BaseModel):
@@ -59,9 +96,20 @@ class CameraResponse(BaseModel):
     location: str
     stream_url: Optional[str] = None
     description: Optional[str] = None
+    motion_sensitivity: Optional[float] = None
+    roi_polygon: Optional[List[List[float]]] = None
+    tile_grid: Optional[str] = None
     status: CameraStatus
     created_at: datetime
     updated_at: datetime
 
+    @field_validator('roi_polygon', mode='before')
+    @classmethod
+    def parse_roi_polygon_field(cls, v):
+        # Stored as a JSON string on the model
+        if isinstance(v, str):
+            return json.loads(v) if v else None
+        return v
+
     class Config:
         from_attributes = True
@@ -0,0 +1,286 @@
+"""
+Shared video decoders.
+
+Several cameras can point at the same stream_url (e.g. different zones of one
+feed). Instead of a cv2.VideoCapture per camera, each decoding the full stream,
+the registry opens one CaptureThread per normalized source and fans its frames
+out to every camera stream that subscribes. Subscriptions are reference counted:
+the decoder stops and releases the capture when the last subscriber leaves.
+"""
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Union
+from urllib.parse import urlsplit, urlunsplit
+import cv2
+from ..core.logger import get_logger
+from .stage_timing import get_stage_timer
+from .stream_pipeline import StageQueue, END
+
+logger = get_logger(__name__)
+
+MAX_FRAME_GAP_SECONDS = 10.0  # Longest wait between two video file frames, whatever their timestamps say
+
+
+def normalize_source(source: Union[int, str]) -> str:
+    """
+    Key identifying a video source regardless of how its URL or path is spelled
+
+    Device indexes become 'device:<n>', file paths are made absolute and
+    resolved, and URLs get a lowercase scheme and host (credentials, path and
+    query are case-sensitive and kept as they are).
+    """
+    if isinstance(source, int):
+        return f"device:{source}"
+    source = source.strip()
+    if source.isdigit():
+        return f"device:{int(source)}"
+
+    parts = urlsplit(source)
+    if parts.scheme and parts.netloc:
+        host = (parts.hostname or '').lower()
+        if parts.port is not None:
+            host = f"{host}:{parts.port}"
+        userinfo = parts.netloc.rpartition('@')[0]
+        netloc = f"{userinfo}@{host}" if userinfo else host
+        return urlunsplit((parts.scheme.lower(), netloc, parts.path or '/', parts.query, ''))
+    return os.path.normcase(os.path.realpath(source))
+
+
+class CaptureThread:
+    """
+    Reads a video capture on its own thread and publishes every frame to the
+    subscribed cameras' 'latest' queues as (frame, capture time), so each
+    consumer always gets the newest frame. Video files are paced by their frame
+    timestamps (at most max_fps, so keyframe-only decoding plays one frame per
+    GOP in real time) and loop at the end; live sources are read as fast as they
+    deliver.
+    """
+
+    def __init__(
+        self,
+        cap: cv2.VideoCapture,
+        loop: asyncio.AbstractEventLoop,
+        source: str,
+        is_video_file: bool = False,
+        max_fps: float = 30.0
+    ):
+        """
+        Initialize capture thread
+
+        Args:
+            cap: Opened video capture (released by the thread when it stops)
+            loop: Event loop the subscribers' queues belong to
+            source: Normalized source (thread name, logs)
+            is_video_file: Pace reads to the file's frame rate and loop at the end
+            max_fps: Upper bound for the pacing of video files
+        """
+        self.cap = cap
+        self.loop = loop
+        self.source = source
+        self.is_video_file = is_video_file
+        source_fps = cap.get(cv2.CAP_PROP_FPS)
+        self.source_fps = source_fps if source_fps and source_fps > 0 else None
+        self.interval = 1.0 / min(self.source_fps or max_fps, max_fps) if is_video_file else 0.0
+        self.frames_read = 0
+        self.timestamp_ms = 0.0  # Source timestamp of the latest frame
+        self._subscribers: Dict[str, StageQueue] = {}
+        self._subscribers_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"capture-{source}", daemon=True)
+
+    @property
+    def running(self) -> bool:
+        """Reading, and not asked to stop"""
+        return self._thread.is_alive() and not self._stop.is_set()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """Ask the thread to stop after the current read"""
+        self._stop.set()
+
+    def subscribe(self, camera_id: str, output: StageQueue):
+        """Deliver frames to a camera's 'latest' queue"""
+        with self._subscribers_lock:
+            self._subscribers[camera_id] = output
+
+    def unsubscribe(self, camera_id: str) -> int:
+        """
+        Stop delivering frames to a camera and end its queue (call from the event loop)
+
+        Returns:
+            Number of remaining subscribers
+        """
+        with self._subscribers_lock:
+            output = self._subscribers.pop(camera_id, None)
+            remaining = len(self._subscribers)
+        if output is not None:
+            # The decoder may keep running for others, so the camera's stages get END from here
+            output.put_nowait(END)
+        return remaining
+
+    def subscribers(self) -> List[str]:
+        with self._subscribers_lock:
+            return list(self._subscribers)
+
+    def _publish(self, frame, captured_at: float, decode_ms: float = None):
+        """Hand a frame (or END if frame is END) to every subscriber"""
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers.items())
+        stage_timer = get_stage_timer()
+        for index, (camera_id, output) in enumerate(subscribers):
+            if frame is END:
+                item = END
+            else:
+                # Streams draw their overlays on the frame in-place, so each extra subscriber gets a copy
+                item = (frame if index == 0 else frame.copy(), captured_at)
+                stage_timer.record('decode', decode_ms, camera_id)
+            try:
+                self.loop.call_soon_threadsafe(output.put_nowait, item)
+            except RuntimeError:
+                # Event loop already closed (shutdown)
+                self._stop.set()
+                return
+
+    def _run(self):
+        next_read = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                start = time.perf_counter()
+                success, frame = self.cap.read()
+                if not success and self.is_video_file:
+                    logger.info(f"Video {self.source} reached end, looping back to start")
+                    self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    success, frame = self.cap.read()
+                if not success:
+                    logger.warning(f"Capture of {self.source} returned no frame - stopping")
+                    break
+                captured_at = time.perf_counter()
+                self.frames_read += 1
+                previous_ms, self.timestamp_ms = self.timestamp_ms, self.cap.get(cv2.CAP_PROP_POS_MSEC)
+                self._publish(frame, captured_at, (captured_at - start) * 1000)
+
+                if self.interval:
+                    # Frames further apart than the interval (skipped by the decoder) keep their spacing
+                    step = (self.timestamp_ms - previous_ms) / 1000
+                    next_read += min(step, MAX_FRAME_GAP_SECONDS) if step > self.interval else self.interval
+                    delay = next_read - time.perf_counter()
+                    if delay > 0:
+                        self._stop.wait(delay)
+                    else:
+                        # Fell behind: carry on from now instead of bursting to catch up
+                        next_read = time.perf_counter()
+        except Exception as e:
+            logger.error(f"Capture thread for {self.source} failed: {e}", exc_info=True)
+        finally:
+            self._stop.set()
+            try:
+                self.cap.release()
+            except Exception as e:
+                logger.error(f"Error releasing video capture for {self.source}: {e}")
+            self._publish(END, time.perf_counter())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get capture statistics"""
+        return {
+            'source': self.source,
+            'backend': type(self.cap).__name__,
+            'running': self._thread.is_alive(),
+            'subscribers': self.subscribers(),
+            'frames_read': self.frames_read,
+            'source_fps': self.source_fps,
+            'timestamp_ms': round(self.timestamp_ms, 1),
+            'paced_fps': round(1.0 / self.interval, 2) if self.interval else None
+        }
+
+
+class CaptureRegistry:
+    """One decoder per normalized source, shared by every camera stream reading it"""
+
+    def __init__(self):
+        self._captures: Dict[str, CaptureThread] = {}
+        self._open_locks: Dict[str, asyncio.Lock] = {}  # Per source, so a slow connect only holds up its own source
+        self.opened = 0
+        self.shared_subscriptions = 0
+
+    async def subscribe(
+        self,
+        source: Union[int, str],
+        camera_id: str,
+        output: StageQueue,
+        open_capture: Callable[[], Awaitable[cv2.VideoCapture]],
+        is_video_file: bool = False,
+        max_fps: float = 30.0
+    ) -> Optional[CaptureThread]:
+        """
+        Deliver a source's frames to a camera's queue, opening the decoder if nobody reads it yet
+
+        Args:
+            source: Device index, file path or stream URL (already resolved)
+            camera_id: Subscribing camera
+            output: The camera's 'latest' capture queue
+            open_capture: Coroutine function opening the source (only called for a new decoder)
+            is_video_file: Pace to the file's frame rate and loop it
+            max_fps: Upper bound for the pacing of video files
+
+        Returns:
+            The shared capture thread, or None if the source could not be opened
+        """
+        key = normalize_source(source)
+        # Serialized per source so two cameras starting together open it once;
+        # other sources open concurrently (an unreachable RTSP connect can take many seconds)
+        lock = self._open_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            capture = self._captures.get(key)
+            if capture is not None and capture.running:
+                capture.subscribe(camera_id, output)
+                self.shared_subscriptions += 1
+                logger.info(f"Camera {camera_id} shares the decoder of {key} with {len(capture.subscribers()) - 1} other camera(s)")
+                return capture
+
+            cap = await open_capture()
+            if not cap.isOpened():
+                cap.release()
+                return None
+
+            capture = CaptureThread(cap, asyncio.get_running_loop(), key, is_video_file=is_video_file, max_fps=max_fps)
+            capture.subscribe(camera_id, output)
+            self._captures[key] = capture
+            self.opened += 1
+            capture.start()
+            return capture
+
+    def unsubscribe(self, capture: CaptureThread, camera_id: str):
+        """Drop a camera's subscription; the decoder stops when it was the last one"""
+        if capture.unsubscribe(camera_id) > 0:
+            return
+        capture.stop()
+        if self._captures.get(capture.source) is capture:
+            del self._captures[capture.source]
+            lock = self._open_locks.get(capture.source)
+            if lock is not None and not lock.locked():
+                del self._open_locks[capture.source]
+        logger.info(f"Closed decoder of {capture.source} (no subscribers left)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get open decoders and how often one was shared"""
+        return {
+            'decoders': {key: capture.get_stats() for key, capture in list(self._captures.items())},
+            'opened': self.opened,
+            'shared_subscriptions': self.shared_subscriptions
+        }
+
+
+# Global instance (singleton)
+_capture_registry = None
+
+
+def get_capture_registry() -> CaptureRegistry:
+    """Get or create capture registry instance"""
+    global _capture_registry
+    if _capture_registry is None:
+        _capture_registry = CaptureRegistry()
+    return _capture_registry
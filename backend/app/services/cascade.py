@@ -0,0 +1,32 @@
+"""
+Person-then-PPE cascade helpers.
+
+In cascade mode the detector first finds persons at a low resolution, then
+looks for PPE only inside each person's crop (see YOLODetectionService._run_cascade).
+"""
+from typing import List, Tuple
+import numpy as np
+
+
+def person_crop_windows(person_boxes: np.ndarray, shape: Tuple[int, ...], margin: float) -> List[Tuple[int, int, int, int]]:
+    """
+    Crop windows around persons, grown by a margin so hardhats and vests at the
+    edge of a loose person box stay inside the crop
+
+    Args:
+        person_boxes: (P, 4) [x1, y1, x2, y2] person boxes in frame pixels
+        shape: Frame shape (height, width, ...)
+        margin: Growth on each side as a fraction of the box width / height
+
+    Returns:
+        List of (x1, y1, x2, y2) integer windows clipped to the frame (empty boxes skipped)
+    """
+    height, width = shape[:2]
+    boxes = np.asarray(person_boxes, dtype=np.float64).reshape(-1, 4)
+    grow = np.hstack([boxes[:, 2:] - boxes[:, :2]] * 2) * margin * np.array([-1, -1, 1, 1])
+
+    windows = np.round(boxes + grow).astype(np.int64)
+    np.clip(windows[:, 0::2], 0, width, out=windows[:, 0::2])
+    np.clip(windows[:, 1::2], 0, height, out=windows[:, 1::2])
+    valid = (windows[:, 2] > windows[:, 0]) & (windows[:, 3] > windows[:, 1])
+    return [tuple(window) for window in windows[valid].tolist()]
@@ -0,0 +1,153 @@
+"""
+Per-client WebSocket send queues.
+
+Broadcasting to a camera's viewers only enqueues; every client has its own
+writer task that does the network I/O, so a viewer on a slow link no longer
+delays the others or the stream pipeline behind them. Each client has:
+
+- a frame slot holding only the newest 'frame' message: a frame that is
+  replaced before the writer got to it is dropped (and counted)
+- a FIFO of control messages (status, alert, error, pong) that are always
+  delivered, before any pending frame. A client that lets max_pending of them
+  pile up, or whose send stalls longer than send_timeout, is disconnected: its
+  socket is closed (1013 'try again later') so the endpoint stops reading and
+  the browser gets onclose and reconnects.
+"""
+import asyncio
+import collections
+from typing import Any, Callable, Dict, Optional, Union
+from fastapi import WebSocket
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+Payload = Union[str, bytes]
+
+CLOSE_TRY_AGAIN_LATER = 1013
+
+
+class ClientSender:
+    """Send queue and writer task of one WebSocket client"""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        protocol: str,
+        on_close: Callable[['ClientSender'], None],
+        max_pending: int = 64,
+        send_timeout: float = 10.0
+    ):
+        """
+        Initialize sender (call start() from the event loop)
+
+        Args:
+            websocket: Accepted WebSocket
+            protocol: Frame format the client negotiated
+            on_close: Called once when the client fails or falls too far behind
+            max_pending: Control messages allowed to wait before the client is dropped
+            send_timeout: Seconds a single send may take before the client is dropped
+        """
+        self.websocket = websocket
+        self.protocol = protocol
+        self.max_pending = max(1, max_pending)
+        self.send_timeout = send_timeout
+        self._on_close = on_close
+        self._control: collections.deque = collections.deque()
+        self._frame: Optional[Payload] = None
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._close_task: Optional[asyncio.Task] = None
+        self.closed = False
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.messages_sent = 0
+
+    def start(self):
+        self._task = asyncio.create_task(self._run(), name="ws-sender")
+
+    def stop(self):
+        """Stop the writer (pending messages are discarded)"""
+        self.closed = True
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    def send(self, payload: Payload):
+        """Queue a control message for guaranteed delivery"""
+        if self.closed:
+            return
+        if len(self._control) >= self.max_pending:
+            logger.warning(f"WebSocket client fell {len(self._control)} messages behind - disconnecting it")
+            self._close()
+            return
+        self._control.append(payload)
+        self._wakeup.set()
+
+    def send_frame(self, payload: Payload):
+        """Offer a frame message; replaces a frame the writer has not sent yet"""
+        if self.closed:
+            return
+        if self._frame is not None:
+            self.frames_dropped += 1
+        self._frame = payload
+        self._wakeup.set()
+
+    def _next(self):
+        """Pop the next payload (control messages first) and whether it is a frame"""
+        if self._control:
+            return self._control.popleft(), False
+        payload, self._frame = self._frame, None
+        return payload, True
+
+    async def _run(self):
+        try:
+            while not self.closed:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                while not self.closed and (self._control or self._frame is not None):
+                    payload, is_frame = self._next()
+                    if isinstance(payload, str):
+                        send = self.websocket.send_text(payload)
+                    else:
+                        send = self.websocket.send_bytes(payload)
+                    await asyncio.wait_for(send, self.send_timeout)
+                    if is_frame:
+                        self.frames_sent += 1
+                    else:
+                        self.messages_sent += 1
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning(f"WebSocket send stalled for {self.send_timeout:.0f}s - disconnecting client")
+            self._close()
+        except Exception as e:
+            logger.debug(f"Failed to send message to WebSocket client: {e}")
+            self._close()
+
+    def _close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self._control.clear()
+        self._frame = None
+        self._on_close(self)
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+        # Closed from a task of its own: the close handshake may stall on the same slow link
+        self._close_task = asyncio.get_running_loop().create_task(self._close_socket(), name="ws-sender-close")
+
+    async def _close_socket(self):
+        try:
+            await asyncio.wait_for(self.websocket.close(code=CLOSE_TRY_AGAIN_LATER), self.send_timeout)
+        except Exception as e:
+            logger.debug(f"Error closing dropped WebSocket client: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get sent and dropped counts"""
+        return {
+            'protocol': self.protocol,
+            'frames_sent': self.frames_sent,
+            'frames_dropped': self.frames_dropped,
+            'messages_sent': self.messages_sent,
+            'pending_messages': len(self._control),
+            'frame_pending': self._frame is not None
+        }
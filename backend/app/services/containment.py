@@ -0,0 +1,136 @@
+"""
+Array-based PPE-to-worker analysis for one frame.
+
+PPE items are matched to persons through one item x person containment matrix
+(intersection over item area). Ownership, PPE flags and compliance are then
+resolved with array operations instead of per-item / per-person Python loops.
+"""
+from typing import Dict
+import numpy as np
+from .detections import pairwise_intersection
+
+# Column order of the per-worker PPE flag matrix
+PPE_FLAG_CLASSES = ('Hardhat', 'No-Hardhat', 'Safety-Vest', 'No-Safety-Vest')
+HARDHAT, NO_HARDHAT, VEST, NO_VEST = range(len(PPE_FLAG_CLASSES))
+
+# Compliance codes (None / False / True in the worker dicts)
+COMPLIANCE_UNKNOWN, COMPLIANCE_VIOLATION, COMPLIANCE_OK = -1, 0, 1
+
+# Indexed by missing_hardhat + 2 * missing_vest
+VIOLATION_TYPES = np.array(
+    [None, 'Missing Hardhat', 'Missing Safety Vest', 'Missing Hardhat and Safety Vest'],
+    dtype=object
+)
+STATUS_BY_COMPLIANCE = {
+    COMPLIANCE_UNKNOWN: 'Person Detected',
+    COMPLIANCE_VIOLATION: 'Not Safely Attired',
+    COMPLIANCE_OK: 'Safely Attired'
+}
+
+
+def containment_matrix(items: np.ndarray, persons: np.ndarray) -> np.ndarray:
+    """
+    Fraction of each item's area that lies inside each person box
+
+    Args:
+        items: (I, 4) array of PPE boxes [x1, y1, x2, y2]
+        persons: (P, 4) array of person boxes [x1, y1, x2, y2]
+
+    Returns:
+        (I, P) matrix of intersection / item area (0 for zero-area items)
+    """
+    items = items.astype(np.float64)
+    intersection = pairwise_intersection(items, persons)
+
+    item_area = ((items[:, 2] - items[:, 0]) * (items[:, 3] - items[:, 1]))[:, None]
+    return np.divide(intersection, item_area, out=np.zeros_like(intersection), where=item_area > 0)
+
+
+def assign_owners(person_boxes: np.ndarray, item_boxes: np.ndarray, overlap_threshold: float) -> np.ndarray:
+    """
+    Index of the person containing most of each item
+
+    Args:
+        person_boxes: (P, 4) person boxes
+        item_boxes: (I, 4) item boxes
+        overlap_threshold: Minimum (exclusive) containment for an item to belong to a person
+
+    Returns:
+        (I,) person index per item, -1 if no person contains enough of it
+    """
+    if len(person_boxes) == 0 or len(item_boxes) == 0:
+        return np.full(len(item_boxes), -1, dtype=np.int64)
+
+    containment = containment_matrix(item_boxes, person_boxes)
+    owner = containment.argmax(axis=1)  # First person wins ties
+    owned = containment[np.arange(len(item_boxes)), owner] > overlap_threshold
+    return np.where(owned, owner, -1)
+
+
+def assign_ppe_flags(
+    person_boxes: np.ndarray,
+    item_boxes: np.ndarray,
+    item_classes: np.ndarray,
+    overlap_threshold: float
+) -> np.ndarray:
+    """
+    Give each PPE item to the person containing most of it and set that person's PPE flags
+
+    Args:
+        person_boxes: (P, 4) person boxes
+        item_boxes: (I, 4) PPE item boxes
+        item_classes: (I,) normalized PPE class names
+        overlap_threshold: Minimum (exclusive) containment for an item to belong to a person
+
+    Returns:
+        (P, 4) bool matrix of flags in PPE_FLAG_CLASSES order
+    """
+    flags = np.zeros((len(person_boxes), len(PPE_FLAG_CLASSES)), dtype=bool)
+    if len(person_boxes) == 0 or len(item_boxes) == 0:
+        return flags
+
+    owner = assign_owners(person_boxes, item_boxes, overlap_threshold)
+    owned = owner >= 0
+
+    # Map class names to flag columns (-1 for classes without a flag)
+    columns = np.full(len(item_classes), -1, dtype=np.int64)
+    for column, class_name in enumerate(PPE_FLAG_CLASSES):
+        columns[item_classes == class_name] = column
+
+    valid = owned & (columns >= 0)
+    flags[owner[valid], columns[valid]] = True
+    return flags
+
+
+def evaluate_compliance(flags: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Evaluate PPE compliance for every worker at once
+
+    A "No-" detection on a worker is a violation. Without violations a worker is
+    compliant if any PPE region (head or body) was seen, otherwise unknown.
+
+    Args:
+        flags: (P, 4) PPE flag matrix from assign_ppe_flags
+
+    Returns:
+        Dict of (P,) arrays: missing_hardhat, missing_vest, violation_count,
+        compliance (COMPLIANCE_* codes) and violation_type (object, None if compliant)
+    """
+    missing_hardhat = flags[:, NO_HARDHAT]
+    missing_vest = flags[:, NO_VEST]
+    violation_count = missing_hardhat.astype(np.int64) + missing_vest
+
+    any_visible = flags.any(axis=1)
+    compliance = np.where(
+        violation_count > 0,
+        COMPLIANCE_VIOLATION,
+        np.where(any_visible, COMPLIANCE_OK, COMPLIANCE_UNKNOWN)
+    )
+
+    return {
+        'missing_hardhat': missing_hardhat,
+        'missing_vest': missing_vest,
+        'violation_count': violation_count,
+        'compliance': compliance,
+        'violation_type': VIOLATION_TYPES[missing_hardhat + 2 * missing_vest.astype(np.int64)]
+    }
@@ -0,0 +1,159 @@
+from typing import Dict, List, Iterator, Any, Optional, Tuple
+import numpy as np
+
+
+def pairwise_intersection(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """
+    Intersection area of every pair of boxes from two sets
+
+    Args:
+        boxes_a: (N, 4) array of [x1, y1, x2, y2]
+        boxes_b: (M, 4) array of [x1, y1, x2, y2]
+
+    Returns:
+        (N, M) float64 matrix of intersection areas (0 for disjoint boxes)
+    """
+    a = boxes_a.astype(np.float64)[:, None, :]
+    b = boxes_b.astype(np.float64)[None, :, :]
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    return inter_w * inter_h
+
+
+class Detections:
+    """
+    Array-backed detections for one frame.
+
+    Boxes, confidences and class IDs are kept as NumPy arrays so post-processing,
+    tracking and drawing can work on whole arrays. Existing callers that expect a
+    list of {'class', 'confidence', 'bbox'} dicts can iterate or index this object
+    directly (the dict view is built lazily, once).
+    """
+
+    __slots__ = ('xyxy', 'confidence', 'class_ids', 'class_names', '_dicts')
+
+    def __init__(self, xyxy: np.ndarray, confidence: np.ndarray, class_ids: np.ndarray, class_names: np.ndarray):
+        """
+        Args:
+            xyxy: (N, 4) int32 boxes in original frame coordinates
+            confidence: (N,) confidences rounded up to 2 decimals
+            class_ids: (N,) int class indices
+            class_names: (N,) normalized class names (object array)
+        """
+        self.xyxy = xyxy
+        self.confidence = confidence
+        self.class_ids = class_ids
+        self.class_names = class_names
+        self._dicts = None
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: np.ndarray,
+        scale_factor: float,
+        names: Dict[int, str],
+        pad: Tuple[int, int] = (0, 0),
+        image_shape: Optional[Tuple[int, int]] = None,
+        offset: Tuple[int, int] = (0, 0)
+    ) -> 'Detections':
+        """
+        Build detections from raw model rows in one vectorized pass
+
+        Args:
+            rows: (N, 6) float array of [x1, y1, x2, y2, confidence, class] in model input coordinates
+            scale_factor: Preprocessing scale factor to undo (1.0 = none)
+            names: Model class names by index
+            pad: Letterbox padding (left, top) to remove before undoing the scale
+            image_shape: Original (height, width); boxes are clipped to it when given
+            offset: (x, y) added after clipping, e.g. the position of an ROI crop in the full frame
+
+        Returns:
+            Detections in original frame coordinates
+        """
+        rows = np.asarray(rows, dtype=np.float32).reshape(-1, 6)
+
+        # Drop classes the model names don't cover
+        class_ids = rows[:, 5].astype(np.int64)
+        keep = class_ids < len(names)
+        rows, class_ids = rows[keep], class_ids[keep]
+
+        # Truncate to pixels, then undo preprocessing scale (same rounding as int(x) / int(x / scale))
+        xyxy = rows[:, :4]
+        if pad != (0, 0):
+            xyxy = xyxy - np.array([pad[0], pad[1], pad[0], pad[1]], dtype=np.float32)
+        xyxy = xyxy.astype(np.int32)
+        if scale_factor != 1.0:
+            xyxy = (xyxy / scale_factor).astype(np.int32)
+        if image_shape is not None:
+            height, width = image_shape[:2]
+            np.clip(xyxy[:, 0::2], 0, width, out=xyxy[:, 0::2])
+            np.clip(xyxy[:, 1::2], 0, height, out=xyxy[:, 1::2])
+        if offset != (0, 0):
+            xyxy += np.array([offset[0], offset[1], offset[0], offset[1]], dtype=np.int32)
+
+        # Round confidence up to 2 decimals
+        confidence = np.ceil(rows[:, 4] * np.float32(100)).astype(np.float64) / 100
+
+        name_table = np.array([names[i] for i in range(len(names))], dtype=object)
+        return cls(xyxy, confidence, class_ids, name_table[class_ids])
+
+    @classmethod
+    def empty(cls) -> 'Detections':
+        """Detections with no boxes"""
+        return cls(np.zeros((0, 4), dtype=np.int32), np.zeros(0), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=object))
+
+    @classmethod
+    def concatenate(cls, parts: List['Detections']) -> 'Detections':
+        """Join several Detections (e.g. the tiles of one frame) into one"""
+        if not parts:
+            return cls.empty()
+        return cls(
+            np.concatenate([part.xyxy for part in parts]),
+            np.concatenate([part.confidence for part in parts]),
+            np.concatenate([part.class_ids for part in parts]),
+            np.concatenate([part.class_names for part in parts])
+        )
+
+    def __len__(self) -> int:
+        return len(self.class_ids)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.as_dicts())
+
+    def __getitem__(self, index):
+        return self.as_dicts()[index]
+
+    def as_dicts(self) -> List[Dict[str, Any]]:
+        """Compatibility view: list of {'class', 'confidence', 'bbox'} dicts"""
+        if self._dicts is None:
+            self._dicts = [
+                {'class': name, 'confidence': conf, 'bbox': bbox}
+                for name, conf, bbox in zip(self.class_names.tolist(), self.confidence.tolist(), self.xyxy.tolist())
+            ]
+        return self._dicts
+
+    def select(self, keep: np.ndarray) -> 'Detections':
+        """Subset of the detections (boolean mask or index array)"""
+        return Detections(self.xyxy[keep], self.confidence[keep], self.class_ids[keep], self.class_names[keep])
+
+    def mask(self, class_name: str) -> np.ndarray:
+        """Boolean mask of detections with the given class name"""
+        return self.class_names == class_name
+
+    def unique_classes(self) -> List[str]:
+        """Distinct class names present in the frame"""
+        return list(set(self.class_names.tolist()))
+
+    def confidence_scores(self) -> Dict[str, float]:
+        """Highest confidence per detected class"""
+        if len(self) == 0:
+            return {}
+
+        # Sort by class then descending confidence; the first entry per class is its best
+        order = np.lexsort((-self.confidence, self.class_ids))
+        _, first = np.unique(self.class_ids[order], return_index=True)
+        best = order[first]
+        return dict(zip(self.class_names[best].tolist(), self.confidence[best].tolist()))
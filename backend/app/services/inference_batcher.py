@@ -0,0 +1,133 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Tuple, Any
+import numpy as np
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class InferenceBatcher:
+    """
+    Dynamic cross-camera batching front-end for YOLO inference.
+
+    Camera streams submit one frame each; the batcher collects frames for up to
+    max_wait_ms or until max_batch_size frames are waiting, runs them through the
+    model in a single call and hands each result back to the camera that sent it.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[np.ndarray], List[str]], List[Tuple[np.ndarray, Dict[str, Any]]]],
+        pool: Executor,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+        max_inflight_batches: int = 2
+    ):
+        """
+        Initialize inference batcher
+
+        Args:
+            run_batch: Blocking function taking (frames, camera_ids) and returning one result per frame
+            pool: Thread pool the batches run on
+            max_batch_size: Maximum frames per model call
+            max_wait_ms: Maximum time to wait for more frames after the first one arrives
+            max_inflight_batches: Maximum batches running on the pool at once
+        """
+        self.run_batch = run_batch
+        self.pool = pool
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_ms / 1000.0
+        self.max_inflight_batches = max_inflight_batches
+
+        self._queue: asyncio.Queue = None
+        self._collector_task: asyncio.Task = None
+        self._inflight = asyncio.Semaphore(max_inflight_batches)
+
+        # Statistics
+        self.batches_run = 0
+        self.frames_run = 0
+
+    def _ensure_started(self):
+        """Start the collector task on the running event loop if needed"""
+        if self._collector_task is None or self._collector_task.done():
+            self._queue = asyncio.Queue()
+            self._collector_task = asyncio.create_task(self._collect_batches())
+            logger.info(f"Inference batcher started (max batch {self.max_batch_size}, max wait {self.max_wait_seconds * 1000:.1f}ms)")
+
+    async def submit(self, frame: np.ndarray, camera_id: str) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Queue a frame for batched inference and wait for its result
+
+        Args:
+            frame: Input image frame
+            camera_id: Camera the frame belongs to (routes the result to its tracker)
+
+        Returns:
+            Tuple of (annotated_frame, detection_results)
+        """
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((frame, camera_id, future))
+        return await future
+
+    async def _collect_batches(self):
+        """Collect queued frames into batches and dispatch them to the pool"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_seconds
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Drop frames whose caller already gave up (e.g. stream cancelled)
+            batch = [item for item in batch if not item[2].done()]
+            if not batch:
+                continue
+
+            # While batches are in flight, new frames keep accumulating in the queue
+            await self._inflight.acquire()
+            task = asyncio.create_task(self._run(batch))
+            task.add_done_callback(lambda _: self._inflight.release())
+
+    async def _run(self, batch: List[Tuple[np.ndarray, str, asyncio.Future]]):
+        """Run one batch on the pool and resolve each caller's future"""
+        frames = [item[0] for item in batch]
+        camera_ids = [item[1] for item in batch]
+        loop = asyncio.get_running_loop()
+
+        try:
+            results = await loop.run_in_executor(self.pool, self.run_batch, frames, camera_ids)
+        except Exception as e:
+            logger.error(f"Batched inference failed for cameras {camera_ids}: {e}", exc_info=True)
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches_run += 1
+        self.frames_run += len(batch)
+
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics"""
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait_seconds * 1000,
+            'batches_run': self.batches_run,
+            'frames_run': self.frames_run,
+            'average_batch_size': round(self.frames_run / self.batches_run, 2) if self.batches_run else 0.0,
+            'queued': self._queue.qsize() if self._queue is not None else 0
+        }
+
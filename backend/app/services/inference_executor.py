@@ -0,0 +1,249 @@
+import asyncio
+import functools
+import time
+import cv2
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple, Any
+import numpy as np
+from ..core.config import settings
+from ..core.logger import get_logger
+from .yolo_service import get_yolo_service, load_and_warm_up, YOLODetectionService
+from .inference_batcher import InferenceBatcher
+from .input_size_controller import DEFAULT_LADDER
+
+logger = get_logger(__name__)
+
+
+def capture_width() -> int:
+    """Width the pyav backend decodes to: the broadcast width, but never below the largest model input size"""
+    width = settings.STREAM_MAX_WIDTH or settings.CAPTURE_WIDTH
+    return max(width, DEFAULT_LADDER[-1]) if width else 0
+
+
+class InferenceExecutor:
+    """
+    Runs blocking frame capture and YOLO inference off the asyncio event loop.
+
+    Every camera stream awaits this executor instead of calling OpenCV/YOLO
+    directly, so a slow inference on one camera no longer stalls HTTP requests,
+    WebSocket pings or the other camera streams.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        capture_workers: int = 8,
+        io_workers: int = 4,
+        max_pending: int = 16,
+        batch_size: int = 1,
+        batch_wait_ms: float = 5.0
+    ):
+        """
+        Initialize inference executor
+
+        Args:
+            max_workers: Number of threads running YOLO inference
+            capture_workers: Number of threads reading frames from video captures
+            io_workers: Number of threads for blocking stream I/O (JPEG encodes, DB writes, uploads)
+            max_pending: Maximum inference requests queued or running at once
+            batch_size: Maximum frames per batched model call (1 disables batching)
+            batch_wait_ms: Maximum time to wait for other cameras' frames before running a batch
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._inference_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="yolo-inference")
+        self._capture_pool = ThreadPoolExecutor(max_workers=capture_workers, thread_name_prefix="frame-capture")
+        self._io_pool = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="stream-io")
+        # Bounds the number of frames waiting for the pool; extra callers wait on the event loop
+        self._slots = asyncio.Semaphore(max_pending)
+        self._service = None
+        self._warmup_task = None
+        self._pending = 0
+        self._completed = 0
+
+        # Cross-camera dynamic batching: frames from several cameras share one model call
+        self._batcher = None
+        if batch_size > 1:
+            self._batcher = InferenceBatcher(
+                run_batch=lambda frames, camera_ids: get_yolo_service().detect_with_tracking_batch(
+                    frames, camera_ids, keep_original=False
+                ),
+                pool=self._inference_pool,
+                max_batch_size=batch_size,
+                max_wait_ms=batch_wait_ms,
+                max_inflight_batches=max_workers
+            )
+
+        logger.info(f"Inference executor ready ({max_workers} inference threads, {capture_workers} capture threads)")
+
+    def start_warm_up(self):
+        """Load and warm up the model in the background (called at startup)"""
+        if self._warmup_task is None:
+            self._warmup_task = asyncio.create_task(self._warm_up())
+
+    async def _warm_up(self):
+        """Run load_and_warm_up on an inference thread"""
+        loop = asyncio.get_running_loop()
+        try:
+            self._service = await loop.run_in_executor(self._inference_pool, load_and_warm_up)
+        except Exception as e:
+            logger.error(f"Model load/warm-up failed: {e}", exc_info=True)
+
+    async def get_service(self) -> YOLODetectionService:
+        """Get the YOLO service, loading the model in a worker thread if needed"""
+        # Let a running warm-up finish first so the first frames don't queue behind it
+        if self._warmup_task is not None and not self._warmup_task.done():
+            await asyncio.shield(self._warmup_task)
+        if self._service is None:
+            loop = asyncio.get_running_loop()
+            self._service = await loop.run_in_executor(self._inference_pool, get_yolo_service)
+        return self._service
+
+    async def open_capture(self, source) -> cv2.VideoCapture:
+        """
+        Open a video capture in a capture thread (RTSP connects can block for seconds)
+
+        With CAPTURE_BACKEND=pyav, files and stream URLs are decoded by FFmpeg
+        (PyAVCapture) straight to the stream width; device indexes always use OpenCV.
+
+        Args:
+            source: Device index, file path or stream URL
+
+        Returns:
+            OpenCV VideoCapture or a compatible PyAVCapture
+        """
+        loop = asyncio.get_running_loop()
+        if settings.CAPTURE_BACKEND == 'pyav' and isinstance(source, str):
+            from .pyav_capture import PyAVCapture
+
+            opener = functools.partial(
+                PyAVCapture, source,
+                width=capture_width(),
+                threads=settings.CAPTURE_DECODE_THREADS,
+                keyframes_only=settings.CAPTURE_KEYFRAMES_ONLY
+            )
+            return await loop.run_in_executor(self._capture_pool, opener)
+        return await loop.run_in_executor(self._capture_pool, cv2.VideoCapture, source)
+
+    async def read_frame(self, cap) -> Tuple[bool, np.ndarray]:
+        """
+        Read the next frame from a video capture without blocking the event loop
+
+        Args:
+            cap: OpenCV VideoCapture (or any object with a compatible read())
+
+        Returns:
+            Tuple of (success, frame)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._capture_pool, cap.read)
+
+    async def run_io(self, func, *args, **kwargs):
+        """
+        Run a blocking call (JPEG encode, DB write, upload) on the I/O threads
+
+        Args:
+            func: Function to call
+            *args, **kwargs: Its arguments
+
+        Returns:
+            The function's result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_pool, functools.partial(func, *args, **kwargs))
+
+    async def detect_with_tracking(
+        self,
+        frame: np.ndarray,
+        camera_id: str = None,
+        preprocess: bool = True
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Awaitable version of YOLODetectionService.detect_with_tracking
+
+        Args:
+            frame: Input image frame
+            camera_id: Camera identifier for per-camera worker tracking
+            preprocess: Whether to apply frame preprocessing for performance
+
+        Returns:
+            Tuple of (annotated_frame, detection_results)
+        """
+        yolo_service = await self.get_service()
+        loop = asyncio.get_running_loop()
+
+        # Detect-every-N: in-between frames get Kalman-predicted results
+        if yolo_service.frame_skip_mode != 'off' and camera_id is not None:
+            predicted = await loop.run_in_executor(self._capture_pool, yolo_service.predict_if_scheduled, frame, camera_id)
+            if predicted is not None:
+                return predicted
+
+        # Static scene: reuse the last results without queueing for the model
+        if settings.MOTION_GATE_ENABLED and camera_id is not None:
+            reused = await loop.run_in_executor(self._capture_pool, yolo_service.reuse_if_static, frame, camera_id)
+            if reused is not None:
+                return reused
+
+        start = time.perf_counter()
+        async with self._slots:
+            self._pending += 1
+            try:
+                if self._batcher is not None and preprocess:
+                    result = await self._batcher.submit(frame, camera_id)
+                else:
+                    result = await loop.run_in_executor(
+                        self._inference_pool,
+                        functools.partial(yolo_service.detect_with_tracking, frame, preprocess, camera_id, keep_original=False)
+                    )
+            finally:
+                self._pending -= 1
+                self._completed += 1
+
+        # Latency includes queueing, so a busy node detects less often per camera
+        if camera_id is not None:
+            yolo_service.record_inference_time(camera_id, (time.perf_counter() - start) * 1000)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor statistics"""
+        return {
+            'inference_workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'pending': self._pending,
+            'completed': self._completed,
+            'batching': self._batcher.get_stats() if self._batcher is not None else None
+        }
+
+    def shutdown(self):
+        """Stop worker threads (waits for in-flight inferences to finish)"""
+        self._inference_pool.shutdown(wait=True, cancel_futures=True)
+        self._capture_pool.shutdown(wait=True, cancel_futures=True)
+        self._io_pool.shutdown(wait=True, cancel_futures=True)
+        logger.info("Inference executor shut down")
+
+
+# Global instance (singleton)
+_inference_executor = None
+
+
+def get_inference_executor() -> InferenceExecutor:
+    """Get or create inference executor instance"""
+    global _inference_executor
+    if _inference_executor is None:
+        _inference_executor = InferenceExecutor(
+            max_workers=settings.INFERENCE_WORKERS,
+            capture_workers=settings.CAPTURE_WORKERS,
+            io_workers=settings.STREAM_IO_WORKERS,
+            max_pending=settings.INFERENCE_MAX_PENDING,
+            batch_size=settings.INFERENCE_BATCH_SIZE,
+            batch_wait_ms=settings.INFERENCE_BATCH_WAIT_MS
+        )
+    return _inference_executor
+
+
+def shutdown_inference_executor():
+    """Shut down the inference executor if it was created"""
+    global _inference_executor
+    if _inference_executor is not None:
+        _inference_executor.shutdown()
+        _inference_executor = None
@@ -0,0 +1,125 @@
+"""
+Closed-loop input size control per camera.
+
+Each camera's model input size steps along a ladder (e.g. 320/416/512/640)
+to keep its end-to-end inference latency (queueing + model time) inside a
+frame budget. A size only steps down after the smoothed latency stayed over
+budget for several inferences, and only steps back up when the latency
+predicted at the larger size (scaled by pixel count) stays well under budget,
+so the size does not oscillate around the boundary.
+"""
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+DEFAULT_LADDER = (320, 416, 512, 640)
+
+
+class InputSizeController:
+    """Steps one camera's input size to hold a latency budget"""
+
+    def __init__(
+        self,
+        ladder: List[int],
+        budget_ms: float,
+        patience: int = 5,
+        step_up_headroom: float = 0.8,
+        smoothing: float = 0.3
+    ):
+        """
+        Initialize controller (starts at the largest size)
+
+        Args:
+            ladder: Allowed input sizes, ascending
+            budget_ms: Target end-to-end latency per inference
+            patience: Consecutive inferences over / under the thresholds before a step
+            step_up_headroom: Step up only if the latency predicted at the next size is below this share of the budget
+            smoothing: EWMA weight of a new latency sample
+        """
+        self.ladder = sorted(ladder)
+        self.budget_ms = budget_ms
+        self.patience = max(1, patience)
+        self.step_up_headroom = step_up_headroom
+        self.smoothing = smoothing
+
+        self._index = len(self.ladder) - 1
+        self.latency_ms = None  # EWMA of end-to-end latency at the current size
+        self.queue_ms = None  # EWMA of the queueing share of it
+        self._over = 0
+        self._under = 0
+        self.samples = 0
+        self.decisions = deque(maxlen=20)
+
+    @property
+    def size(self) -> int:
+        """Current input size"""
+        return self.ladder[self._index]
+
+    def _smooth(self, current: Optional[float], sample: float) -> float:
+        return sample if current is None else current + self.smoothing * (sample - current)
+
+    def record(self, elapsed_ms: float, queue_ms: float = 0.0) -> Optional[int]:
+        """
+        Record one inference and step the size if needed
+
+        Args:
+            elapsed_ms: Time from submitting the frame to getting results
+            queue_ms: Part of elapsed_ms spent waiting for the model
+
+        Returns:
+            The new input size if it changed, else None
+        """
+        self.samples += 1
+        self.latency_ms = self._smooth(self.latency_ms, elapsed_ms)
+        self.queue_ms = self._smooth(self.queue_ms, max(0.0, queue_ms))
+
+        if self.latency_ms > self.budget_ms:
+            self._over += 1
+            self._under = 0
+        elif self._index + 1 < len(self.ladder) and self._predicted_ms(self._index + 1) < self.budget_ms * self.step_up_headroom:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+
+        if self._over >= self.patience and self._index > 0:
+            return self._step(-1, 'over budget')
+        if self._under >= self.patience:
+            return self._step(1, 'headroom')
+        return None
+
+    def _predicted_ms(self, index: int) -> float:
+        """Latency expected at another ladder size (model time scales with pixel count, queueing does not)"""
+        queue_ms = min(self.queue_ms or 0.0, self.latency_ms)
+        model_ms = self.latency_ms - queue_ms
+        return queue_ms + model_ms * (self.ladder[index] / self.size) ** 2
+
+    def _step(self, direction: int, reason: str) -> int:
+        """Move along the ladder and restart measuring at the new size"""
+        previous = self.size
+        predicted = self._predicted_ms(self._index + direction)
+        self._index += direction
+        self.decisions.append({
+            'time': time.time(),
+            'from': previous,
+            'to': self.size,
+            'reason': reason,
+            'latency_ms': round(self.latency_ms, 2),
+            'predicted_ms': round(predicted, 2)
+        })
+        # Samples from the old size don't describe the new one
+        self.latency_ms = predicted
+        self._over = self._under = 0
+        return self.size
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get controller state and recent decisions"""
+        return {
+            'input_size': self.size,
+            'ladder': self.ladder,
+            'budget_ms': round(self.budget_ms, 2),
+            'latency_ms': round(self.latency_ms, 2) if self.latency_ms is not None else None,
+            'queue_ms': round(self.queue_ms, 2) if self.queue_ms is not None else None,
+            'samples': self.samples,
+            'decisions': list(self.decisions)
+        }
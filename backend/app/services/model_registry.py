@@ -0,0 +1,261 @@
+"""
+Versioned model files and hot model swapping.
+
+Model versions are .pt files in MODEL_REGISTRY_DIR, named by version (e.g.
+models/2024-06-v3.pt); MODEL_PATH is always available as the 'default'
+version. Activating a version loads and warms the new model on a background
+thread while the streams keep running on the current one, then
+YOLODetectionService.swap_model replaces it between frames. Worker trackers and
+the stream's violation timers don't belong to the model and carry over.
+
+The activation history is kept in registry.json inside the registry directory,
+so the active version survives a restart and rollback() can restore the
+previous one.
+"""
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from ..core.config import settings
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_VERSION = 'default'
+VERSION_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$')
+MAX_HISTORY = 20
+
+
+class ModelSwapGate:
+    """
+    Lets inferences run concurrently, but a model swap waits for the in-flight
+    ones to finish (on the old model) and holds new ones back until it's done
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._active = 0
+        self._swapping = False
+
+    @contextmanager
+    def inference(self):
+        """Hold the current model for one inference (not re-entrant)"""
+        with self._condition:
+            while self._swapping:
+                self._condition.wait()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                if self._active == 0:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def swap(self):
+        """Exclusive access for replacing the model"""
+        with self._condition:
+            while self._swapping:
+                self._condition.wait()
+            self._swapping = True
+            while self._active:
+                self._condition.wait()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._swapping = False
+                self._condition.notify_all()
+
+
+class ModelRegistry:
+    """Model versions on disk, the active version and its activation history"""
+
+    def __init__(self, directory: str = None):
+        """
+        Initialize registry
+
+        Args:
+            directory: Directory holding <version>.pt files (defaults to MODEL_REGISTRY_DIR)
+        """
+        self.directory = Path(directory or settings.get_absolute_model_registry_dir())
+        self.state_path = self.directory / 'registry.json'
+        self._lock = threading.Lock()
+        self._busy = False
+        self.status = {
+            'state': 'idle',  # 'idle', 'loading', 'done' or 'failed'
+            'version': None,
+            'error': None,
+            'started_at': None,
+            'finished_at': None,
+            'load_ms': None,
+            'warmup_ms': None
+        }
+
+    def _read_state(self) -> Dict[str, Any]:
+        """Read registry.json ({'history': [versions, most recent last]})"""
+        if not self.state_path.exists():
+            return {'history': []}
+        try:
+            return json.loads(self.state_path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable model registry state {self.state_path}: {e}")
+            return {'history': []}
+
+    def _write_state(self, state: Dict[str, Any]):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.state_path.write_text(json.dumps(state, indent=2))
+
+    def _history(self) -> List[str]:
+        """Activated versions, most recent last (always starts from 'default')"""
+        history = self._read_state().get('history', [])
+        return history if history else [DEFAULT_VERSION]
+
+    def model_path(self, version: str) -> str:
+        """
+        Path to the model file of a version
+
+        Raises:
+            FileNotFoundError: Unknown version
+        """
+        if version == DEFAULT_VERSION:
+            return settings.get_absolute_model_path()
+        path = self.directory / f"{version}.pt"
+        if not VERSION_PATTERN.match(version) or not path.is_file():
+            raise FileNotFoundError(f"Model version '{version}' not found in {self.directory}")
+        return str(path)
+
+    def active_version(self) -> str:
+        """Version to load at startup (falls back to 'default' if its file is gone)"""
+        version = self._history()[-1]
+        try:
+            self.model_path(version)
+        except FileNotFoundError:
+            logger.warning(f"Active model version '{version}' is missing - using '{DEFAULT_VERSION}'")
+            return DEFAULT_VERSION
+        return version
+
+    def previous_version(self) -> Optional[str]:
+        """Version a rollback would restore"""
+        history = self._history()
+        return history[-2] if len(history) > 1 else None
+
+    def list_versions(self) -> List[Dict[str, Any]]:
+        """All available versions with file size and modification time"""
+        active = self.active_version()
+        paths = [(DEFAULT_VERSION, Path(settings.get_absolute_model_path()))]
+        if self.directory.is_dir():
+            paths += [(path.stem, path) for path in sorted(self.directory.glob('*.pt')) if VERSION_PATTERN.match(path.stem)]
+
+        versions = []
+        for version, path in paths:
+            stat = path.stat() if path.is_file() else None
+            versions.append({
+                'version': version,
+                'path': str(path),
+                'size_bytes': stat.st_size if stat else None,
+                'modified': stat.st_mtime if stat else None,
+                'active': version == active
+            })
+        return versions
+
+    def prepare_activation(self, version: str) -> str:
+        """
+        Check a version can be activated now and mark the registry busy
+
+        Args:
+            version: Version to activate
+
+        Returns:
+            Path to the version's model file
+
+        Raises:
+            FileNotFoundError: Unknown version
+            RuntimeError: Another activation is still running
+        """
+        path = self.model_path(version)
+        with self._lock:
+            if self._busy:
+                raise RuntimeError(f"Model version '{self.status['version']}' is still loading")
+            self._busy = True
+            self.status = {
+                'state': 'loading',
+                'version': version,
+                'error': None,
+                'started_at': time.time(),
+                'finished_at': None,
+                'load_ms': None,
+                'warmup_ms': None
+            }
+        return path
+
+    def activate(self, version: str, model_path: str, rollback: bool = False):
+        """
+        Load, warm up and swap in a prepared version (blocking, runs on a background thread)
+
+        Args:
+            version: Version passed to prepare_activation
+            model_path: Path returned by prepare_activation
+            rollback: Drop the current version from the history instead of adding the new one
+        """
+        from .yolo_service import get_loaded_yolo_service, get_startup_metrics, load_and_warm_up
+
+        previous_state = self._read_state()
+        try:
+            service = get_loaded_yolo_service()
+            if service is None:
+                # Nothing loaded yet (lazy loading): record the version first so the first load
+                # picks it up, instead of loading the current model only to swap it out
+                self._record_activation(version, rollback)
+                service = load_and_warm_up()
+                if service.model_version == version:
+                    result = get_startup_metrics()
+                else:
+                    # A load that was already running picked the previous version
+                    result = service.swap_model(model_path, version)
+            else:
+                result = service.swap_model(model_path, version)
+                self._record_activation(version, rollback)
+            self.status.update(state='done', load_ms=result['load_ms'], warmup_ms=result['warmup_ms'])
+            logger.info(f"✓ Model version '{version}' active")
+        except Exception as e:
+            self._write_state(previous_state)
+            self.status.update(state='failed', error=str(e))
+            logger.error(f"Model version '{version}' failed to activate, keeping current model: {e}", exc_info=True)
+        finally:
+            self.status['finished_at'] = time.time()
+            with self._lock:
+                self._busy = False
+
+    def _record_activation(self, version: str, rollback: bool):
+        """Update the history: a rollback drops the current version, an activation adds a new one"""
+        history = self._history()
+        if rollback and len(history) > 1:
+            history.pop()
+        elif history[-1] != version:
+            history.append(version)
+        self._write_state({'history': history[-MAX_HISTORY:]})
+
+    def get_status(self) -> Dict[str, Any]:
+        """Active / previous version and the state of the last activation"""
+        return {
+            'active_version': self.active_version(),
+            'previous_version': self.previous_version(),
+            'last_swap': dict(self.status)
+        }
+
+
+# Global instance (singleton)
+_model_registry = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get or create model registry instance"""
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry()
+    return _model_registry
@@ -0,0 +1,105 @@
+"""
+Motion gate: skip YOLO inference on frames where the scene hasn't changed.
+
+Each frame is downscaled to a small blurred grayscale image and compared with
+the last frame that went through inference. Only when enough pixels changed
+(or the forced-refresh interval elapsed) does the frame need a full inference.
+"""
+import time
+from typing import Dict, Any, Optional
+import cv2
+import numpy as np
+
+GATE_WIDTH = 320  # Width of the comparison image
+PIXEL_DIFF_THRESHOLD = 25  # Gray-level change for a pixel to count as changed
+MAX_CHANGED_FRACTION = 0.01  # Changed-pixel fraction needed at sensitivity 0.0
+
+
+class MotionGate:
+    """Per-camera frame differencing gate"""
+
+    def __init__(self, sensitivity: float = 0.8, max_skip_seconds: float = 5.0):
+        """
+        Initialize motion gate
+
+        Args:
+            sensitivity: 0.0-1.0; higher values trigger inference on smaller changes
+            max_skip_seconds: Force an inference at least this often, even on a static scene
+        """
+        self.sensitivity = sensitivity
+        self.max_skip_seconds = max_skip_seconds
+
+        self._reference = None  # Downscaled gray frame from the last inference
+        self._last_inference_time = 0.0
+        self._last_changed_fraction = 0.0
+
+        # Statistics
+        self.frames = 0
+        self.skipped = 0
+        self.forced = 0
+
+    @property
+    def changed_fraction_threshold(self) -> float:
+        """Fraction of changed pixels that counts as motion for the current sensitivity"""
+        return MAX_CHANGED_FRACTION * (1.0 - self.sensitivity)
+
+    def _downscale(self, frame: np.ndarray) -> np.ndarray:
+        """Small blurred grayscale version of the frame (blur suppresses sensor noise)"""
+        height, width = frame.shape[:2]
+        small = cv2.resize(frame, (GATE_WIDTH, max(1, int(height * GATE_WIDTH / width))), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def should_infer(self, frame: np.ndarray, now: Optional[float] = None) -> bool:
+        """
+        Decide whether a frame needs a full inference
+
+        The reference image is only replaced when the answer is True, so slow
+        changes accumulate until they cross the threshold instead of being lost
+        frame to frame.
+
+        Args:
+            frame: Current BGR frame
+            now: Current monotonic time (defaults to time.monotonic())
+
+        Returns:
+            True if the frame should go through YOLO, False if the last results can be reused
+        """
+        if now is None:
+            now = time.monotonic()
+        self.frames += 1
+
+        small = self._downscale(frame)
+        if self._reference is None or self._reference.shape != small.shape:
+            infer = True
+        else:
+            diff = cv2.absdiff(small, self._reference)
+            self._last_changed_fraction = float(np.count_nonzero(diff > PIXEL_DIFF_THRESHOLD) / diff.size)
+            infer = self._last_changed_fraction > self.changed_fraction_threshold
+
+            if not infer and now - self._last_inference_time >= self.max_skip_seconds:
+                infer = True
+                self.forced += 1
+
+        if infer:
+            self._reference = small
+            self._last_inference_time = now
+        else:
+            self.skipped += 1
+        return infer
+
+    def reset(self):
+        """Forget the reference frame, so the next frame is inferred (e.g. after the camera's ROI changed)"""
+        self._reference = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get gate statistics (hit rate = share of frames that skipped inference)"""
+        return {
+            'sensitivity': self.sensitivity,
+            'frames': self.frames,
+            'skipped': self.skipped,
+            'inferred': self.frames - self.skipped,
+            'forced': self.forced,
+            'hit_rate': round(self.skipped / self.frames, 4) if self.frames else 0.0,
+            'last_changed_fraction': round(self._last_changed_fraction, 5)
+        }
@@ -0,0 +1,202 @@
+"""
+Motion model for detect-every-N mode.
+
+The detector only runs on every Nth frame of a camera. In between, a constant-
+velocity Kalman filter per tracked worker predicts where each worker's box is,
+so overlays and worker reports stay smooth at the stream frame rate. N adapts
+per camera from the measured inference time versus the target FPS.
+"""
+import math
+from typing import Dict, Any, Tuple
+import numpy as np
+
+# State: [cx, cy, w, h, vx, vy, vw, vh]; measurement: [cx, cy, w, h]
+_F = np.eye(8)
+_F[:4, 4:] = np.eye(4)
+
+# Noise scaled by box height (larger boxes move more pixels per frame)
+POSITION_STD = 1 / 20
+VELOCITY_STD = 1 / 160
+
+
+def xyxy_to_cxcywh(boxes: np.ndarray) -> np.ndarray:
+    """Convert (N, 4) [x1, y1, x2, y2] boxes to [cx, cy, w, h]"""
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    wh = boxes[:, 2:] - boxes[:, :2]
+    return np.hstack([boxes[:, :2] + wh / 2, wh])
+
+
+def cxcywh_to_xyxy(boxes: np.ndarray) -> np.ndarray:
+    """Convert (N, 4) [cx, cy, w, h] boxes to [x1, y1, x2, y2]"""
+    half = boxes[:, 2:4] / 2
+    return np.hstack([boxes[:, :2] - half, boxes[:, :2] + half])
+
+
+class KalmanBoxTracker:
+    """
+    Constant-velocity Kalman filters for all tracked workers of one camera.
+
+    Filters are stored as stacked arrays (one row per worker ID) so predicting
+    or correcting every worker is a handful of batched matrix operations.
+    """
+
+    def __init__(self):
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.x = np.zeros((0, 8))  # State per worker
+        self.P = np.zeros((0, 8, 8))  # Covariance per worker
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _noise(self, heights: np.ndarray, position_std: float, velocity_std: float) -> np.ndarray:
+        """Diagonal (N, 8, 8) covariance scaled by box height"""
+        heights = np.maximum(heights, 1.0)
+        std = np.column_stack([
+            position_std * heights, position_std * heights, position_std * heights, position_std * heights,
+            velocity_std * heights, velocity_std * heights, velocity_std * heights, velocity_std * heights
+        ])
+        return std[:, :, None] ** 2 * np.eye(8)[None]
+
+    def predict(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Advance every worker by one frame
+
+        Returns:
+            Tuple of (worker_ids, predicted [x1, y1, x2, y2] boxes)
+        """
+        if len(self.ids):
+            self.x = self.x @ _F.T
+            self.P = _F @ self.P @ _F.T + self._noise(self.x[:, 3], POSITION_STD, VELOCITY_STD)
+            self.x[:, 2:4] = np.maximum(self.x[:, 2:4], 1.0)  # Keep boxes non-degenerate
+        return self.ids, cxcywh_to_xyxy(self.x[:, :4])
+
+    def boxes_for(self, worker_ids: np.ndarray, fallback: np.ndarray) -> np.ndarray:
+        """
+        Current estimated boxes for worker IDs (rows without a filter use fallback)
+
+        Args:
+            worker_ids: (N,) worker IDs
+            fallback: (N, 4) boxes used for IDs without a filter
+
+        Returns:
+            (N, 4) [x1, y1, x2, y2] boxes
+        """
+        boxes = np.array(fallback, dtype=np.float64).reshape(-1, 4)
+        if len(self.ids) and len(worker_ids):
+            rows = {worker_id: row for row, worker_id in enumerate(self.ids.tolist())}
+            index = np.array([rows.get(worker_id, -1) for worker_id in worker_ids.tolist()])
+            known = index >= 0
+            boxes[known] = cxcywh_to_xyxy(self.x[index[known], :4])
+        return boxes
+
+    def update(self, worker_ids: np.ndarray, boxes: np.ndarray):
+        """
+        Correct filters with detected boxes; start filters for new worker IDs
+
+        Args:
+            worker_ids: (M,) worker IDs of this frame's detections
+            boxes: (M, 4) detected [x1, y1, x2, y2] boxes
+        """
+        if len(worker_ids) == 0:
+            return
+        measurements = xyxy_to_cxcywh(boxes)
+        rows = {worker_id: row for row, worker_id in enumerate(self.ids.tolist())}
+        index = np.array([rows.get(worker_id, -1) for worker_id in worker_ids.tolist()])
+        known = index >= 0
+
+        if known.any():
+            idx = index[known]
+            z = measurements[known]
+            P = self.P[idx]
+            R = self._noise(z[:, 3], POSITION_STD, 0.0)[:, :4, :4]
+
+            # K = P H^T (H P H^T + R)^-1 with H = [I 0]
+            S = P[:, :4, :4] + R
+            K = P[:, :, :4] @ np.linalg.inv(S)
+            innovation = z - self.x[idx, :4]
+            self.x[idx] = self.x[idx] + (K @ innovation[:, :, None])[:, :, 0]
+            self.P[idx] = P - K @ P[:, :4, :]
+
+        new = ~known
+        if new.any():
+            z = measurements[new]
+            x = np.hstack([z, np.zeros_like(z)])
+            # Unknown velocity: start with a wide velocity variance
+            P = self._noise(z[:, 3], 2 * POSITION_STD, 10 * VELOCITY_STD)
+            self.ids = np.concatenate([self.ids, worker_ids[new]])
+            self.x = np.concatenate([self.x, x])
+            self.P = np.concatenate([self.P, P])
+
+    def retain(self, worker_ids: np.ndarray):
+        """Drop filters for workers the tracker no longer knows"""
+        keep = np.isin(self.ids, worker_ids)
+        if not keep.all():
+            self.ids, self.x, self.P = self.ids[keep], self.x[keep], self.P[keep]
+
+
+class DetectionScheduler:
+    """
+    Decides which frames of a camera run the detector.
+
+    In adaptive mode N follows the measured inference latency: if one inference
+    takes as long as k frames at the target FPS, the detector runs every k-th frame.
+    """
+
+    def __init__(self, interval: int = 3, adaptive: bool = True, max_interval: int = 10, target_fps: float = 30):
+        """
+        Initialize scheduler
+
+        Args:
+            interval: Detect every Nth frame (initial N in adaptive mode)
+            adaptive: Adapt N from measured inference time
+            max_interval: Upper bound for N
+            target_fps: Stream frame rate the overlays should keep
+        """
+        self.interval = max(1, interval)
+        self.adaptive = adaptive
+        self.max_interval = max(1, max_interval)
+        self.frame_budget_ms = 1000.0 / target_fps
+
+        self._frames_since_detection = 0
+        self.inference_ms = None  # EWMA of inference latency
+        self.detected = 0
+        self.predicted = 0
+
+    def should_detect(self) -> bool:
+        """Advance one frame; True if this frame should run the detector"""
+        if self._frames_since_detection == 0 or self._frames_since_detection >= self.interval:
+            self._frames_since_detection = 1
+            self.detected += 1
+            return True
+        self._frames_since_detection += 1
+        self.predicted += 1
+        return False
+
+    def record_inference(self, elapsed_ms: float, smoothing: float = 0.2):
+        """
+        Record how long an inference took (including queueing) and adapt N
+
+        Args:
+            elapsed_ms: Inference latency in milliseconds
+            smoothing: EWMA weight of the new sample
+        """
+        if self.inference_ms is None:
+            self.inference_ms = elapsed_ms
+        else:
+            self.inference_ms += smoothing * (elapsed_ms - self.inference_ms)
+
+        if self.adaptive:
+            needed = math.ceil(self.inference_ms / self.frame_budget_ms)
+            self.interval = min(self.max_interval, max(1, needed))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler statistics"""
+        total = self.detected + self.predicted
+        return {
+            'interval': self.interval,
+            'adaptive': self.adaptive,
+            'inference_ms': round(self.inference_ms, 2) if self.inference_ms is not None else None,
+            'detected_frames': self.detected,
+            'predicted_frames': self.predicted,
+            'inference_fraction': round(self.detected / total, 4) if total else 0.0
+        }
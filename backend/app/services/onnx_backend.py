@@ -0,0 +1,268 @@
+"""
+ONNX Runtime inference backend for the PPE YOLO model.
+
+The .pt model is exported to ONNX once and cached next to it; inference then runs
+through ONNX Runtime with our own letterbox preprocessing and NMS, avoiding the
+PyTorch eager-mode overhead on CPU-only servers.
+"""
+import ast
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import onnxruntime as ort
+from ..core.logger import get_logger
+from .preprocessing import letterbox, images_to_blob
+
+logger = get_logger(__name__)
+
+MAX_BOX_WH = 7680  # Class offset for batched class-aware NMS
+
+
+def export_onnx(model_path: str, imgsz: int = 640) -> str:
+    """
+    Export a YOLO .pt model to ONNX, reusing a cached export when it is up to date
+
+    Args:
+        model_path: Path to the .pt model
+        imgsz: Export image size (the exported model uses dynamic axes)
+
+    Returns:
+        Path to the .onnx file (next to the .pt model)
+    """
+    pt_path = Path(model_path)
+    onnx_path = pt_path.with_suffix('.onnx')
+
+    if onnx_path.exists() and onnx_path.stat().st_mtime >= pt_path.stat().st_mtime:
+        logger.info(f"Using cached ONNX export: {onnx_path}")
+        return str(onnx_path)
+
+    from ultralytics import YOLO
+
+    logger.info(f"Exporting {pt_path.name} to ONNX (one-time)...")
+    exported = YOLO(str(pt_path)).export(format='onnx', imgsz=imgsz, dynamic=True, simplify=True)
+    exported_path = Path(exported)
+    if exported_path != onnx_path:
+        exported_path.replace(onnx_path)
+    logger.info(f"✓ Exported ONNX model: {onnx_path}")
+    return str(onnx_path)
+
+
+def non_max_suppression(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """
+    Greedy Non-Maximum Suppression
+
+    Args:
+        boxes: (N, 4) array of [x1, y1, x2, y2]
+        scores: (N,) array of confidence scores
+        iou_threshold: Boxes overlapping a kept box above this IoU are suppressed
+
+    Returns:
+        Indices of kept boxes, highest score first
+    """
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1) * (y2 - y1)
+    order = scores.argsort()[::-1]
+
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+
+        inter_w = np.maximum(0.0, np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]))
+        inter_h = np.maximum(0.0, np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]))
+        intersection = inter_w * inter_h
+        iou = intersection / np.maximum(areas[i] + areas[rest] - intersection, 1e-9)
+
+        order = rest[iou <= iou_threshold]
+
+    return np.array(keep, dtype=np.int64)
+
+
+def prepare_batch(images: List[np.ndarray], imgsz: int) -> Tuple[np.ndarray, List[Tuple[float, Tuple[int, int]]]]:
+    """
+    Letterbox images and stack them into a model input blob
+
+    Args:
+        images: BGR images (any sizes)
+        imgsz: Square model input size
+
+    Returns:
+        Tuple of (NCHW float32 RGB blob in [0, 1], [(ratio, pad), ...] per image)
+    """
+    letterboxed = [letterbox(image, imgsz) for image in images]
+    blob = images_to_blob([padded for padded, _, _ in letterboxed])
+    return blob, [(ratio, pad) for _, ratio, pad in letterboxed]
+
+
+class OnnxYOLOBackend:
+    """YOLO model running on ONNX Runtime (drop-in for the ultralytics model in YOLODetectionService)"""
+
+    def __init__(self, model_path: str, device: str = 'cpu', imgsz: int = 640):
+        """
+        Initialize ONNX backend
+
+        Args:
+            model_path: Path to the .pt model (exported to ONNX on first use) or an .onnx file
+            device: 'cpu' or 'cuda'
+            imgsz: Square model input size
+        """
+        if Path(model_path).suffix == '.onnx':
+            self.onnx_path = model_path
+        else:
+            self.onnx_path = export_onnx(model_path, imgsz)
+        self.imgsz = imgsz
+        self._blob = None  # Reused input buffer for predict_letterboxed
+        self.device = None
+        self.session = None
+        self.to(device)
+
+        self.names: Dict[int, str] = self._load_names(model_path)
+
+    def _load_names(self, model_path: str) -> Dict[int, str]:
+        """
+        Class names from the ONNX metadata, or from the .pt model it was exported from
+
+        Without names every detection would be unlabeled and no PPE rule could match,
+        so a model without them fails to load instead.
+        """
+        # Ultralytics stores class names in the ONNX metadata as a dict literal
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        if 'names' in metadata:
+            return ast.literal_eval(metadata['names'])
+
+        if Path(model_path).suffix == '.pt':
+            from ultralytics import YOLO
+
+            logger.warning(f"{self.onnx_path} has no class names in its metadata - using the names of {model_path}")
+            return dict(YOLO(model_path).names)
+
+        raise ValueError(f"ONNX model {self.onnx_path} has no class names in its metadata (export it with ultralytics)")
+
+    def to(self, device: str) -> 'OnnxYOLOBackend':
+        """Create the inference session for a device ('cpu' or 'cuda')"""
+        providers = ['CPUExecutionProvider']
+        if device == 'cuda' and 'CUDAExecutionProvider' in ort.get_available_providers():
+            providers.insert(0, 'CUDAExecutionProvider')
+
+        self.session = ort.InferenceSession(self.onnx_path, providers=providers)
+        self.input_name = self.session.get_inputs()[0].name
+        self.device = device
+        logger.info(f"✓ ONNX Runtime session ready ({', '.join(self.session.get_providers())})")
+        return self
+
+    def predict(
+        self,
+        images: List[np.ndarray],
+        conf: float = 0.25,
+        iou: float = 0.45,
+        max_det: int = 300,
+        imgsz: Optional[int] = None
+    ) -> List[np.ndarray]:
+        """
+        Run batched inference
+
+        Args:
+            images: BGR images (any sizes; each is letterboxed to imgsz)
+            conf: Confidence threshold
+            iou: IoU threshold for NMS
+            max_det: Maximum detections per image
+            imgsz: Square model input size (defaults to the backend's; the export has dynamic axes)
+
+        Returns:
+            One (N, 6) array per image of [x1, y1, x2, y2, confidence, class] in that image's coordinates
+        """
+        blob, transforms = prepare_batch(images, imgsz or self.imgsz)
+        return self._run(blob, transforms, [image.shape[:2] for image in images], conf, iou, max_det)
+
+    def predict_letterboxed(
+        self,
+        canvases: List[np.ndarray],
+        transforms: List[Tuple[float, Tuple[int, int]]],
+        image_shapes: List[Tuple[int, int]],
+        conf: float = 0.25,
+        iou: float = 0.45,
+        max_det: int = 300
+    ) -> List[np.ndarray]:
+        """
+        Run batched inference on images the caller already letterboxed
+
+        The input blob is written into a buffer reused across calls of the same shape.
+
+        Args:
+            canvases: Letterboxed BGR images (all the same shape)
+            transforms: (ratio, (pad_left, pad_top)) per canvas
+            image_shapes: (height, width) of each original image
+            conf: Confidence threshold
+            iou: IoU threshold for NMS
+            max_det: Maximum detections per image
+
+        Returns:
+            One (N, 6) array per image of [x1, y1, x2, y2, confidence, class] in original image coordinates
+        """
+        height, width = canvases[0].shape[:2]
+        blob_shape = (len(canvases), 3, height, width)
+        if self._blob is None or self._blob.shape != blob_shape:
+            self._blob = np.empty(blob_shape, dtype=np.float32)
+
+        blob = images_to_blob(canvases, out=self._blob)
+        return self._run(blob, transforms, image_shapes, conf, iou, max_det)
+
+    def _run(
+        self,
+        blob: np.ndarray,
+        transforms: List[Tuple[float, Tuple[int, int]]],
+        image_shapes: List[Tuple[int, int]],
+        conf: float,
+        iou: float,
+        max_det: int
+    ) -> List[np.ndarray]:
+        """Run the session on a prepared blob and postprocess each image"""
+        # Output: (batch, 4 + num_classes, anchors) with boxes as cx, cy, w, h
+        output = self.session.run(None, {self.input_name: blob})[0]
+
+        return [
+            self._postprocess(prediction.T, ratio, pad, image_shape, conf, iou, max_det)
+            for prediction, image_shape, (ratio, pad) in zip(output, image_shapes, transforms)
+        ]
+
+    def _postprocess(
+        self,
+        prediction: np.ndarray,
+        ratio: float,
+        pad: Tuple[int, int],
+        image_shape: Tuple[int, int],
+        conf: float,
+        iou: float,
+        max_det: int
+    ) -> np.ndarray:
+        """Filter, NMS and map one image's raw predictions back to image coordinates"""
+        class_scores = prediction[:, 4:]
+        class_ids = class_scores.argmax(axis=1)
+        confidences = class_scores[np.arange(len(class_ids)), class_ids]
+
+        mask = confidences > conf
+        if not mask.any():
+            return np.zeros((0, 6), dtype=np.float32)
+
+        boxes = prediction[mask, :4]
+        confidences = confidences[mask]
+        class_ids = class_ids[mask]
+
+        # cx, cy, w, h -> x1, y1, x2, y2
+        xyxy = np.empty_like(boxes)
+        xyxy[:, :2] = boxes[:, :2] - boxes[:, 2:] / 2
+        xyxy[:, 2:] = boxes[:, :2] + boxes[:, 2:] / 2
+
+        # Class-aware NMS: offset boxes per class so different classes never overlap
+        keep = non_max_suppression(xyxy + class_ids[:, None] * MAX_BOX_WH, confidences, iou)[:max_det]
+        xyxy, confidences, class_ids = xyxy[keep], confidences[keep], class_ids[keep]
+
+        # Undo letterbox
+        xyxy[:, [0, 2]] = (xyxy[:, [0, 2]] - pad[0]) / ratio
+        xyxy[:, [1, 3]] = (xyxy[:, [1, 3]] - pad[1]) / ratio
+        height, width = image_shape
+        xyxy[:, [0, 2]] = xyxy[:, [0, 2]].clip(0, width)
+        xyxy[:, [1, 3]] = xyxy[:, [1, 3]].clip(0, height)
+
+        return np.column_stack([xyxy, confidences, class_ids]).astype(np.float32)
@@ -0,0 +1,209 @@
+"""
+Annotation overlay renderer.
+
+Drawing each label with cvzone.putTextRect measures the text and draws a filled
+rectangle plus text on the full frame for every box, every frame. The labels
+repeat constantly (a handful of classes, confidences bucketed to 0.05, worker
+IDs), so the renderer draws each distinct label once into a small sprite,
+caches it, and copies it into the frame. Boxes are drawn with one polylines
+call per color. Labels use cvzone's font, padding and anchor, but the text is
+not identical: the confidence shown is the bucketed one (0.87 reads "0.85").
+
+Overlays can be drawn on a downscaled copy of the frame (the broadcast size)
+instead of the full-resolution capture; box coordinates are scaled to it. In
+'metadata' stream mode nothing is drawn on the server and overlay_metadata()
+describes the overlays for the monitor page to draw on a canvas.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import cv2
+import numpy as np
+
+FONT = cv2.FONT_HERSHEY_PLAIN  # cvzone.putTextRect default
+CONFIDENCE_BUCKET = 0.05
+
+# (scale, thickness, text color, padding) per label style; background is the box color
+DETECTION_LABEL_STYLE = (1.0, 1, (255, 255, 255), 5)
+WORKER_LABEL_STYLE = (1.2, 2, (0, 0, 0), 8)
+WORKER_LABEL_COLOR = (255, 255, 0)
+
+
+def bucket_confidence(confidence: float) -> float:
+    """Round a confidence down to CONFIDENCE_BUCKET steps (keeps the label cache small; shown in the label text)"""
+    return round(int(confidence / CONFIDENCE_BUCKET + 1e-6) * CONFIDENCE_BUCKET, 2)
+
+
+def overlay_metadata(
+    detections,
+    workers: List[Dict],
+    frame_size: Tuple[int, int],
+    roi_polygon: Optional[List[List[float]]] = None
+) -> Dict[str, Any]:
+    """
+    Compact description of a frame's overlays for client-side drawing
+
+    Args:
+        detections: Detections of the frame
+        workers: Worker results with 'worker_id' and 'bbox'
+        frame_size: (width, height) of the frame the coordinates refer to
+        roi_polygon: Camera ROI in normalized coordinates, if set
+
+    Returns:
+        {'size': [w, h], 'classes': [names], 'boxes': [[x1, y1, x2, y2, class index, confidence]],
+         'workers': [[worker_id, x1, y1, x2, y2]], 'roi': polygon or None}. Box class
+        indices point into 'classes'.
+    """
+    classes, class_index = np.unique(np.asarray(detections.class_names, dtype=str), return_inverse=True)
+    boxes = [
+        [*box, int(index), float(confidence)]
+        for box, index, confidence in zip(detections.xyxy.tolist(), class_index.tolist(), detections.confidence.tolist())
+    ]
+    return {
+        'size': [int(frame_size[0]), int(frame_size[1])],
+        'classes': classes.tolist(),
+        'boxes': boxes,
+        'workers': [
+            [int(worker['worker_id']), *worker['bbox']]
+            for worker in workers
+            if worker.get('worker_id') is not None and 'bbox' in worker
+        ],
+        'roi': roi_polygon
+    }
+
+
+class OverlayRenderer:
+    """Draws detection boxes, detection labels and worker ID labels onto frames"""
+
+    def __init__(self, max_sprites: int = 1024, box_thickness: int = 3):
+        """
+        Initialize renderer
+
+        Args:
+            max_sprites: Label sprites kept in the cache (least recently used are dropped)
+            box_thickness: Bounding box line thickness in pixels at full resolution
+        """
+        self.max_sprites = max_sprites
+        self.box_thickness = box_thickness
+        self._sprites = OrderedDict()  # {(text, background, style): (sprite, text_height, padding)}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _sprite(
+        self,
+        text: str,
+        background: Tuple[int, int, int],
+        style: Tuple[float, int, Tuple[int, int, int], int]
+    ) -> Tuple[np.ndarray, int, int]:
+        """
+        Get the rendered label image for a text (rendered on first use)
+
+        Returns:
+            Tuple of (BGR sprite, text height, padding)
+        """
+        key = (text, background, style)
+        cached = self._sprites.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            self._sprites.move_to_end(key)
+            return cached
+
+        self.cache_misses += 1
+        scale, thickness, text_color, padding = style
+        (width, height), _ = cv2.getTextSize(text, FONT, scale, thickness)
+        # cv2.rectangle includes both corners, so the label is one pixel wider and taller than text + padding
+        sprite = np.empty((height + 2 * padding + 1, width + 2 * padding + 1, 3), dtype=np.uint8)
+        sprite[:] = background
+        cv2.putText(sprite, text, (padding, padding + height), FONT, scale, text_color, thickness)
+
+        cached = (sprite, height, padding)
+        self._sprites[key] = cached
+        if len(self._sprites) > self.max_sprites:
+            self._sprites.popitem(last=False)
+        return cached
+
+    @staticmethod
+    def _blit(frame: np.ndarray, sprite: np.ndarray, x: int, y: int):
+        """Copy a sprite into the frame with its top-left corner at (x, y), clipped to the frame"""
+        frame_height, frame_width = frame.shape[:2]
+        sprite_height, sprite_width = sprite.shape[:2]
+        x1, y1 = max(0, x), max(0, y)
+        x2, y2 = min(frame_width, x + sprite_width), min(frame_height, y + sprite_height)
+        if x1 >= x2 or y1 >= y2:
+            return
+        frame[y1:y2, x1:x2] = sprite[y1 - y:y2 - y, x1 - x:x2 - x]
+
+    def _label(
+        self,
+        frame: np.ndarray,
+        text: str,
+        anchor: Tuple[int, int],
+        background: Tuple[int, int, int],
+        style: Tuple[float, int, Tuple[int, int, int], int]
+    ):
+        """Draw a label with its text baseline starting at anchor (cvzone.putTextRect placement)"""
+        sprite, text_height, padding = self._sprite(text, background, style)
+        self._blit(frame, sprite, anchor[0] - padding, anchor[1] - text_height - padding)
+
+    def render(
+        self,
+        frame: np.ndarray,
+        boxes: np.ndarray,
+        class_names: List[str],
+        confidences: np.ndarray,
+        colors: Dict[str, Tuple[int, int, int]],
+        worker_boxes: Optional[List[List[int]]] = None,
+        worker_ids: Optional[List[int]] = None,
+        scale: float = 1.0
+    ):
+        """
+        Draw detections and worker labels on a frame (in-place)
+
+        Args:
+            frame: Frame to draw on
+            boxes: (N, 4) [x1, y1, x2, y2] detection boxes in full-resolution pixels
+            class_names: Class name per box
+            confidences: Confidence per box
+            colors: Box / label color per class name ('default' for the rest)
+            worker_boxes: [x1, y1, x2, y2] person box per worker (full-resolution pixels)
+            worker_ids: Worker ID per worker box
+            scale: Frame size relative to full resolution (boxes are scaled by it)
+        """
+        boxes = np.asarray(boxes).reshape(-1, 4)
+        if scale != 1.0:
+            boxes = np.round(boxes * scale)
+        boxes = boxes.astype(np.int32)
+        box_thickness = max(1, int(round(self.box_thickness * scale)))
+
+        box_colors = [colors.get(name, colors['default']) for name in class_names]
+
+        # Labels: cached sprites (placement of the previous cvzone labels)
+        label_top = int(round(35 * scale))
+        for (x1, y1, _, _), name, confidence, color in zip(boxes, class_names, confidences, box_colors):
+            text = f'{name} {bucket_confidence(confidence)}'
+            self._label(frame, text, (max(0, int(x1)), max(label_top, int(y1))), color, DETECTION_LABEL_STYLE)
+
+        # Boxes over the detection labels: one polylines call per color
+        corners = np.stack([
+            boxes[:, [0, 1]], boxes[:, [2, 1]], boxes[:, [2, 3]], boxes[:, [0, 3]]
+        ], axis=1)
+        for color in set(box_colors):
+            polygons = [corners[i] for i, box_color in enumerate(box_colors) if box_color == color]
+            cv2.polylines(frame, polygons, True, color, box_thickness)
+
+        if worker_boxes:
+            lift = int(round(25 * scale))
+            worker_top = int(round(15 * scale))
+            for (x1, y1, _, _), worker_id in zip(worker_boxes, worker_ids):
+                x1, y1 = int(round(x1 * scale)), int(round(y1 * scale))
+                self._label(
+                    frame, f'Worker #{worker_id}', (max(0, x1), max(worker_top, y1 - lift)),
+                    WORKER_LABEL_COLOR, WORKER_LABEL_STYLE
+                )
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get sprite cache statistics"""
+        return {
+            'sprites': len(self._sprites),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses
+        }
@@ -0,0 +1,125 @@
+"""
+Frame preprocessing shared by the inference backends.
+
+Frames are letterboxed straight into a reusable canvas (one per camera), so the
+steady-state path does a single resize into preallocated memory per frame
+instead of copy + resize + pad allocations.
+"""
+import math
+from typing import List, Optional, Tuple
+import cv2
+import numpy as np
+
+LETTERBOX_COLOR = (114, 114, 114)  # Same padding color ultralytics uses
+MODEL_STRIDE = 32  # YOLOv8 max stride; rectangular canvases are padded to a multiple of it
+
+
+def letterbox(image: np.ndarray, new_size: int) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+    """
+    Resize an image to fit a square canvas while keeping aspect ratio, padding the rest
+
+    Allocates a new image; use LetterboxBuffer on hot paths.
+
+    Args:
+        image: Input BGR image
+        new_size: Side length of the square output
+
+    Returns:
+        Tuple of (letterboxed_image, ratio, (pad_left, pad_top))
+    """
+    return LetterboxBuffer().letterbox(image, new_size)
+
+
+class LetterboxBuffer:
+    """
+    Reusable letterbox canvas for one camera.
+
+    The canvas and its padding are only (re)built when the frame size or target
+    size changes; every other frame is resized directly into the image region.
+    The returned canvas is overwritten by the next call, so it must be consumed
+    (e.g. by the model) before the buffer is used again.
+    """
+
+    def __init__(self, stride: Optional[int] = None):
+        """
+        Initialize buffer
+
+        Args:
+            stride: If set, pad only up to a multiple of stride on the short side
+                    (minimal rectangle, as ultralytics does for single images);
+                    otherwise pad to a full square
+        """
+        self.stride = stride
+        self.canvas = None
+        self._geometry = None
+        self._region = None
+        self._ratio = 1.0
+        self._pad = (0, 0)
+
+    def _build(self, height: int, width: int, new_size: int):
+        """Allocate the canvas and paint the padding for a frame/target size"""
+        ratio = min(new_size / height, new_size / width)
+        new_width, new_height = int(round(width * ratio)), int(round(height * ratio))
+
+        if self.stride:
+            canvas_width = math.ceil(new_width / self.stride) * self.stride
+            canvas_height = math.ceil(new_height / self.stride) * self.stride
+        else:
+            canvas_width = canvas_height = new_size
+
+        pad_x = (canvas_width - new_width) / 2
+        pad_y = (canvas_height - new_height) / 2
+        top, left = int(round(pad_y - 0.1)), int(round(pad_x - 0.1))
+
+        self.canvas = np.empty((canvas_height, canvas_width, 3), dtype=np.uint8)
+        self.canvas[:] = LETTERBOX_COLOR
+        self._region = self.canvas[top:top + new_height, left:left + new_width]
+        self._ratio = ratio
+        self._pad = (left, top)
+        self._geometry = (height, width, new_size)
+
+    def letterbox(self, frame: np.ndarray, new_size: int) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+        """
+        Letterbox a frame into the reusable canvas
+
+        Args:
+            frame: Input BGR frame
+            new_size: Target size of the long side
+
+        Returns:
+            Tuple of (canvas, ratio, (pad_left, pad_top))
+        """
+        height, width = frame.shape[:2]
+        if self._geometry != (height, width, new_size):
+            self._build(height, width, new_size)
+
+        region_height, region_width = self._region.shape[:2]
+        if (region_width, region_height) == (width, height):
+            self._region[:] = frame
+        else:
+            cv2.resize(frame, (region_width, region_height), dst=self._region, interpolation=cv2.INTER_LINEAR)
+
+        return self.canvas, self._ratio, self._pad
+
+
+def images_to_blob(images: List[np.ndarray], out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Convert same-sized BGR HWC uint8 images to an NCHW float32 RGB blob in [0, 1]
+
+    Args:
+        images: Letterboxed images (all the same shape)
+        out: Optional preallocated (N, 3, H, W) float32 array to write into
+
+    Returns:
+        The blob (out, if given)
+    """
+    height, width = images[0].shape[:2]
+    if out is None:
+        out = np.empty((len(images), 3, height, width), dtype=np.float32)
+
+    scale = np.float32(1 / 255)
+    for index, image in enumerate(images):
+        for channel in range(3):
+            # BGR -> RGB by reading the channels in reverse
+            np.multiply(image[..., 2 - channel], scale, out=out[index, channel])
+    return out
@@ -0,0 +1,165 @@
+"""
+FFmpeg (PyAV) capture backend.
+
+cv2.VideoCapture decodes every frame at the source resolution on one thread and
+most RTSP sources ignore the requested capture size, so full 1080p frames are
+decoded and then resized again in Python. PyAVCapture decodes with FFmpeg's
+frame/slice threading and lets libswscale convert to BGR and scale to the
+output width in a single pass. In keyframe-only mode the decoder skips every
+non-key frame (one frame per GOP), for cameras monitored at a very low rate.
+
+PyAVCapture mirrors the parts of cv2.VideoCapture the stream uses (read, get,
+set, isOpened, release), so CaptureThread drives either one.
+"""
+from typing import Optional, Tuple, Union
+import cv2
+import numpy as np
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+OPEN_TIMEOUT_SECONDS = 10.0  # Connect/probe of a source
+READ_TIMEOUT_SECONDS = 5.0  # Wait for data of a running source (a dead camera fails the read instead of hanging)
+
+RTSP_OPTIONS = {
+    'rtsp_transport': 'tcp',  # No smeared frames from lost UDP packets
+    'timeout': str(int(READ_TIMEOUT_SECONDS * 1_000_000)),  # Socket I/O timeout in microseconds (FFmpeg 5+; 'stimeout' is gone)
+}
+
+
+def output_size(width: int, height: int, target_width: int) -> Tuple[int, int]:
+    """
+    Size to scale a frame to: target_width wide (never upscaled), even dimensions
+
+    Args:
+        width: Source width
+        height: Source height
+        target_width: Output width (0 = source size)
+
+    Returns:
+        Tuple of (width, height)
+    """
+    if not target_width or target_width >= width:
+        return width, height
+    scaled_height = int(round(height * target_width / width))
+    return target_width - target_width % 2, max(2, scaled_height - scaled_height % 2)
+
+
+class PyAVCapture:
+    """cv2.VideoCapture-compatible reader decoding with FFmpeg threads and a built-in scaler"""
+
+    def __init__(
+        self,
+        source: str,
+        width: int = 0,
+        threads: int = 0,
+        keyframes_only: bool = False
+    ):
+        """
+        Open a video file or stream
+
+        Args:
+            source: File path or stream URL
+            width: Output frame width (aspect ratio kept, 0 = source resolution)
+            threads: Decoder threads (0 = FFmpeg picks from the CPU count)
+            keyframes_only: Decode only keyframes
+        """
+        import av  # Optional dependency, only needed with CAPTURE_BACKEND=pyav
+
+        self._av = av
+        self.source = source
+        self.keyframes_only = keyframes_only
+        self.timestamp_ms = 0.0
+        self.frames_decoded = 0
+        self._container = None
+        self._frames = None
+
+        options = RTSP_OPTIONS if source.lower().startswith('rtsp://') else {}
+        try:
+            # PyAV's own timeout interrupts blocking I/O of any protocol (HTTP, RTMP, ...)
+            self._container = av.open(source, options=options, timeout=(OPEN_TIMEOUT_SECONDS, READ_TIMEOUT_SECONDS))
+            self._stream = self._container.streams.video[0]
+        except (av.error.FFmpegError, IndexError) as e:
+            logger.error(f"PyAV could not open {source}: {e}")
+            self.release()
+            return
+
+        codec = self._stream.codec_context
+        self._stream.thread_type = 'AUTO'  # Frame and slice threading
+        codec.thread_count = threads
+        if keyframes_only:
+            codec.skip_frame = 'NONKEY'
+
+        rate = self._stream.average_rate or self._stream.guessed_rate
+        self.fps = float(rate) if rate else 0.0
+        self.frame_count = self._stream.frames or 0
+        self.source_size = (codec.width, codec.height)
+        self.width, self.height = output_size(codec.width, codec.height, width)
+        self._frames = self._container.decode(self._stream)
+        logger.info(
+            f"PyAV opened {source}: {codec.name} {codec.width}x{codec.height} @ {self.fps:.2f} fps -> "
+            f"{self.width}x{self.height}{' (keyframes only)' if keyframes_only else ''}"
+        )
+
+    def isOpened(self) -> bool:
+        return self._frames is not None
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Decode the next frame, scaled and converted to BGR
+
+        Returns:
+            Tuple of (success, frame)
+        """
+        if self._frames is None:
+            return False, None
+        try:
+            frame = next(self._frames)
+        except StopIteration:
+            return False, None
+        except self._av.error.FFmpegError as e:
+            logger.warning(f"PyAV decode of {self.source} failed: {e}")
+            return False, None
+
+        if frame.time is not None:
+            self.timestamp_ms = frame.time * 1000
+        self.frames_decoded += 1
+        image = frame.reformat(width=self.width, height=self.height, format='bgr24', interpolation='BILINEAR')
+        return True, image.to_ndarray()
+
+    def get(self, prop: int) -> float:
+        """Read a capture property (the subset the stream uses; others return 0)"""
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps if self._frames is not None else 0.0
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.frame_count) if self._frames is not None else 0.0
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return self.timestamp_ms
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width) if self._frames is not None else 0.0
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height) if self._frames is not None else 0.0
+        return 0.0
+
+    def set(self, prop: int, value: Union[int, float]) -> bool:
+        """
+        Rewind to the start (CAP_PROP_POS_FRAMES = 0, used to loop video files)
+
+        The output size is fixed when the capture is opened, so size requests are ignored.
+        """
+        if prop != cv2.CAP_PROP_POS_FRAMES or value != 0 or self._frames is None:
+            return False
+        try:
+            self._container.seek(0)
+        except self._av.error.FFmpegError as e:
+            logger.warning(f"PyAV could not rewind {self.source}: {e}")
+            return False
+        self._frames = self._container.decode(self._stream)
+        self.timestamp_ms = 0.0
+        return True
+
+    def release(self):
+        self._frames = None
+        if self._container is not None:
+            self._container.close()
+            self._container = None
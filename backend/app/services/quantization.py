@@ -0,0 +1,365 @@
+"""
+INT8 post-training static quantization for the ONNX PPE model.
+
+The quantized model is written next to the FP32 ONNX export together with an
+accuracy report. YOLODetectionService only activates the INT8 model when the
+report shows every class stays within QUANTIZATION_MAX_ACCURACY_DROP of FP32.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Any
+import cv2
+import numpy as np
+import onnx
+from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+from ..core.config import settings
+from ..core.detection_utils import match_detections
+from ..core.logger import get_logger
+from ..core.timezone import get_philippine_time_naive
+from .onnx_backend import OnnxYOLOBackend, export_onnx, prepare_batch
+
+logger = get_logger(__name__)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv')
+SOURCE_HASH_KEY = 'quantized_from_sha256'  # INT8 model metadata: hash of the .pt it was quantized from
+
+
+def quantized_model_path(model_path: str) -> Path:
+    """Path of the INT8 model for a .pt/.onnx model (e.g. best.pt -> best.int8.onnx)"""
+    return Path(model_path).with_suffix('.int8.onnx')
+
+
+def accuracy_report_path(model_path: str) -> Path:
+    """Path of the accuracy report written next to the INT8 model"""
+    return Path(model_path).with_suffix('.int8.json')
+
+
+def collect_calibration_frames(sources: List[str], max_frames: int = 200, video_stride: int = 15) -> List[np.ndarray]:
+    """
+    Collect calibration frames from videos (e.g. demo_videos/) and image folders (e.g. violation snapshots)
+
+    Args:
+        sources: Video files, image files or directories containing either
+        max_frames: Maximum number of frames to collect
+        video_stride: Keep every Nth video frame (spreads samples across the video)
+
+    Returns:
+        List of BGR frames
+    """
+    paths = []
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            paths.extend(sorted(p for p in path.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS + VIDEO_EXTENSIONS))
+        elif path.exists():
+            paths.append(path)
+        else:
+            logger.warning(f"Calibration source not found: {source}")
+
+    frames = []
+    for path in paths:
+        if len(frames) >= max_frames:
+            break
+
+        if path.suffix.lower() in IMAGE_EXTENSIONS:
+            image = cv2.imread(str(path))
+            if image is not None:
+                frames.append(image)
+            continue
+
+        cap = cv2.VideoCapture(str(path))
+        index = 0
+        try:
+            while len(frames) < max_frames:
+                success, frame = cap.read()
+                if not success:
+                    break
+                if index % video_stride == 0:
+                    frames.append(frame)
+                index += 1
+        finally:
+            cap.release()
+
+    logger.info(f"Collected {len(frames)} calibration frames from {len(paths)} file(s)")
+    return frames
+
+
+def split_holdout(frames: List[np.ndarray], every: int = 5) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+    """
+    Split frames into calibration frames and held-out evaluation frames (every Nth frame)
+
+    The accuracy gate must not be measured on the frames the activation ranges were fitted to.
+
+    Returns:
+        Tuple of (calibration_frames, evaluation_frames)
+    """
+    every = max(2, every)
+    calibration = [frame for index, frame in enumerate(frames) if index % every != every - 1]
+    evaluation = [frame for index, frame in enumerate(frames) if index % every == every - 1]
+    return calibration, evaluation
+
+
+def model_sha256(model_path: str) -> str:
+    """SHA-256 of a model file"""
+    digest = hashlib.sha256()
+    with open(model_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def quantized_source_hash(int8_path: Path) -> Optional[str]:
+    """Hash of the .pt model an INT8 model was quantized from (None for models quantized before it was recorded)"""
+    metadata = onnx.load(str(int8_path), load_external_data=False).metadata_props
+    return next((prop.value for prop in metadata if prop.key == SOURCE_HASH_KEY), None)
+
+
+class FrameCalibrationReader(CalibrationDataReader):
+    """Feeds preprocessed frames to the ONNX Runtime calibrator (same letterbox as inference)"""
+
+    def __init__(self, frames: List[np.ndarray], input_name: str, imgsz: int = 640):
+        self.input_name = input_name
+        self.imgsz = imgsz
+        self._frames = iter(frames)
+
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        frame = next(self._frames, None)
+        if frame is None:
+            return None
+        blob, _ = prepare_batch([frame], self.imgsz)
+        return {self.input_name: blob}
+
+
+def quantize_model(model_path: str, frames: List[np.ndarray], imgsz: int = 640) -> Path:
+    """
+    Quantize the model to static INT8 using calibration frames
+
+    Args:
+        model_path: Path to the .pt model (exported to ONNX if needed)
+        frames: Calibration frames
+        imgsz: Model input size
+
+    Returns:
+        Path to the INT8 ONNX model
+    """
+    fp32_path = export_onnx(model_path, imgsz)
+    int8_path = quantized_model_path(model_path)
+    input_name = onnx.load(fp32_path, load_external_data=False).graph.input[0].name
+
+    logger.info(f"Quantizing {Path(fp32_path).name} to INT8 with {len(frames)} calibration frames...")
+    quantize_static(
+        fp32_path,
+        str(int8_path),
+        FrameCalibrationReader(frames, input_name, imgsz),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8
+    )
+
+    # Keep the ultralytics metadata (class names, stride) on the quantized model and
+    # record which .pt it came from, so a retrained model invalidates it
+    fp32_model = onnx.load(fp32_path)
+    int8_model = onnx.load(str(int8_path))
+    del int8_model.metadata_props[:]
+    int8_model.metadata_props.extend(fp32_model.metadata_props)
+    int8_model.metadata_props.add(key=SOURCE_HASH_KEY, value=model_sha256(model_path))
+    onnx.save(int8_model, str(int8_path))
+
+    logger.info(f"✓ Quantized model written to {int8_path}")
+    return int8_path
+
+
+def _run_backend(backend: OnnxYOLOBackend, frame: np.ndarray, class_names: Dict[int, str], conf: float) -> List[Dict]:
+    """Run one frame through a backend and return detections in the service's dict format"""
+    rows = backend.predict([frame], conf=conf)[0]
+    return [
+        {
+            'class': class_names.get(int(cls), str(int(cls))),
+            'confidence': float(score),
+            'bbox': [float(x1), float(y1), float(x2), float(y2)]
+        }
+        for x1, y1, x2, y2, score, cls in rows
+    ]
+
+
+def _load_yolo_labels(label_path: Path, image_shape, class_names: Dict[int, str]) -> List[Dict]:
+    """Load a YOLO-format label file (class cx cy w h, normalized) as detections"""
+    height, width = image_shape[:2]
+    labels = []
+    for line in label_path.read_text().splitlines():
+        parts = line.split()
+        if len(parts) != 5:
+            continue
+        cls, cx, cy, w, h = int(parts[0]), *map(float, parts[1:])
+        labels.append({
+            'class': class_names.get(cls, str(cls)),
+            'confidence': 1.0,
+            'bbox': [(cx - w / 2) * width, (cy - h / 2) * height, (cx + w / 2) * width, (cy + h / 2) * height]
+        })
+    return labels
+
+
+def _precision_recall(stats: Dict[str, Any]) -> Dict[str, float]:
+    """Precision/recall from match_detections counts"""
+    return {
+        'precision': stats['tp'] / max(1, stats['tp'] + stats['fp']),
+        'recall': stats['tp'] / max(1, stats['tp'] + stats['fn'])
+    }
+
+
+def evaluate_quantized_model(
+    model_path: str,
+    frames: List[np.ndarray],
+    labels: Optional[List[Optional[Path]]] = None,
+    tolerance: float = None,
+    conf: float = None
+) -> Dict[str, Any]:
+    """
+    Compare per-class precision/recall of the INT8 model against the FP32 model and write the report
+
+    With ground-truth labels (YOLO txt, one per frame) both models are scored against them.
+    Without labels the FP32 detections serve as the reference, so FP32 scores 1.0 by definition
+    and the deltas measure how far INT8 drifts from it.
+
+    Args:
+        model_path: Path to the .pt model
+        frames: Evaluation frames
+        labels: Optional label file per frame (None entries are skipped)
+        tolerance: Maximum allowed drop per class in precision or recall
+        conf: Confidence threshold for both models
+
+    Returns:
+        Accuracy report (also written next to the INT8 model)
+    """
+    if tolerance is None:
+        tolerance = settings.QUANTIZATION_MAX_ACCURACY_DROP
+    if conf is None:
+        conf = settings.CONFIDENCE_THRESHOLD
+
+    int8_path = quantized_model_path(model_path)
+    fp32 = OnnxYOLOBackend(model_path)
+    int8 = OnnxYOLOBackend(str(int8_path))
+    class_names = {k: v.replace(' ', '-') for k, v in fp32.names.items()}
+
+    totals = {}
+
+    def class_totals(class_name: str) -> Dict[str, Dict[str, int]]:
+        return totals.setdefault(class_name, {'fp32': {'tp': 0, 'fp': 0, 'fn': 0}, 'int8': {'tp': 0, 'fp': 0, 'fn': 0}})
+
+    for name in class_names.values():
+        class_totals(name)
+
+    for index, frame in enumerate(frames):
+        if labels and labels[index] is None:
+            continue
+
+        fp32_detections = _run_backend(fp32, frame, class_names, conf)
+        int8_detections = _run_backend(int8, frame, class_names, conf)
+
+        if labels:
+            reference = _load_yolo_labels(labels[index], frame.shape, class_names)
+            candidates = {'fp32': fp32_detections, 'int8': int8_detections}
+        else:
+            reference = fp32_detections
+            candidates = {'int8': int8_detections}
+            # FP32 is the reference: every FP32 box counts as a true positive for FP32
+            for detection in fp32_detections:
+                class_totals(detection['class'])['fp32']['tp'] += 1
+
+        for model_name, detections in candidates.items():
+            for class_name, stats in match_detections(reference, detections).items():
+                for key in ('tp', 'fp', 'fn'):
+                    class_totals(class_name)[model_name][key] += stats[key]
+
+    classes = {}
+    passed = True
+    for class_name, total in totals.items():
+        fp32_pr = _precision_recall(total['fp32'])
+        int8_pr = _precision_recall(total['int8'])
+        precision_delta = int8_pr['precision'] - fp32_pr['precision']
+        recall_delta = int8_pr['recall'] - fp32_pr['recall']
+        class_passed = precision_delta >= -tolerance and recall_delta >= -tolerance
+        passed = passed and class_passed
+
+        classes[class_name] = {
+            'fp32_precision': round(fp32_pr['precision'], 4),
+            'fp32_recall': round(fp32_pr['recall'], 4),
+            'int8_precision': round(int8_pr['precision'], 4),
+            'int8_recall': round(int8_pr['recall'], 4),
+            'precision_delta': round(precision_delta, 4),
+            'recall_delta': round(recall_delta, 4),
+            'samples': total['fp32']['tp'] + total['fp32']['fn'],
+            'passed': class_passed
+        }
+
+    # An INT8 model quantized from other weights than the current .pt never passes
+    source_hash = quantized_source_hash(int8_path)
+    if source_hash != model_sha256(model_path):
+        logger.warning(f"{int8_path.name} was not quantized from the current {Path(model_path).name} - re-run calibrate")
+        passed = False
+
+    report = {
+        'created_at': get_philippine_time_naive().isoformat(),
+        'int8_model': int8_path.name,
+        'int8_model_mtime': int8_path.stat().st_mtime,
+        'source_model': Path(model_path).name,
+        'source_model_sha256': source_hash,
+        'reference': 'ground_truth' if labels else 'fp32',
+        'frames': len(frames),
+        'tolerance': tolerance,
+        'classes': classes,
+        'passed': passed
+    }
+    accuracy_report_path(model_path).write_text(json.dumps(report, indent=2))
+    logger.info(f"INT8 accuracy report: {'PASSED' if passed else 'FAILED'} (tolerance {tolerance})")
+    return report
+
+
+def is_quantized_model_approved(model_path: str, tolerance: float = None) -> bool:
+    """
+    Check whether the INT8 model may be activated
+
+    The model must exist, have an accuracy report for this exact file, have been
+    quantized from the current .pt model (a retrained model invalidates the INT8 model),
+    and every class must be within the tolerance (re-checked so a tighter setting takes effect).
+
+    Args:
+        model_path: Path to the .pt model
+        tolerance: Maximum allowed drop per class (defaults to QUANTIZATION_MAX_ACCURACY_DROP)
+
+    Returns:
+        True if the INT8 model passed the accuracy gate
+    """
+    if tolerance is None:
+        tolerance = settings.QUANTIZATION_MAX_ACCURACY_DROP
+
+    int8_path = quantized_model_path(model_path)
+    report_path = accuracy_report_path(model_path)
+
+    if not int8_path.exists():
+        logger.warning(f"INT8 model not found: {int8_path} (run: python quantize_model.py calibrate)")
+        return False
+    if not report_path.exists():
+        logger.warning(f"INT8 accuracy report not found: {report_path} (run: python quantize_model.py evaluate)")
+        return False
+
+    report = json.loads(report_path.read_text())
+    if report.get('int8_model_mtime') != int8_path.stat().st_mtime:
+        logger.warning("INT8 accuracy report is stale (model changed since evaluation)")
+        return False
+    if report.get('source_model_sha256') != model_sha256(model_path):
+        logger.warning(f"INT8 model was quantized from different weights than {Path(model_path).name} (run: python quantize_model.py calibrate)")
+        return False
+
+    failing = [
+        name for name, metrics in report.get('classes', {}).items()
+        if metrics['precision_delta'] < -tolerance or metrics['recall_delta'] < -tolerance
+    ]
+    if failing:
+        logger.warning(f"INT8 model exceeds accuracy tolerance {tolerance} for: {', '.join(failing)}")
+        return False
+
+    return True
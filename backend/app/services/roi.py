@@ -0,0 +1,120 @@
+"""
+Per-camera region of interest (ROI).
+
+A camera's ROI is a polygon in normalized [0, 1] frame coordinates, so it stays
+valid when the stream resolution changes. Inference runs on the polygon's
+bounding rectangle only, and detections whose centroid lies outside the polygon
+are dropped before tracking and persistence.
+"""
+import json
+from typing import List, Optional, Tuple
+import cv2
+import numpy as np
+
+
+def parse_roi_polygon(value) -> Optional[List[List[float]]]:
+    """
+    Read a stored ROI polygon
+
+    Args:
+        value: JSON string (as stored on Camera.roi_polygon), list of [x, y] points or None
+
+    Returns:
+        List of [x, y] points, or None if no ROI is set
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        value = json.loads(value)
+    return [[float(x), float(y)] for x, y in value] or None
+
+
+def points_in_polygon(points: np.ndarray, polygon: np.ndarray) -> np.ndarray:
+    """
+    Even-odd ray casting test for many points against one polygon
+
+    Args:
+        points: (N, 2) [x, y] points
+        polygon: (V, 2) polygon vertices
+
+    Returns:
+        (N,) bool array, True for points inside the polygon
+    """
+    x = points[:, 0:1]
+    y = points[:, 1:2]
+    x1, y1 = polygon[:, 0], polygon[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+
+    # (N, V): edge straddles the horizontal line through the point, and the
+    # crossing lies to the right of the point
+    straddles = (y1 > y) != (y2 > y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        crossing_x = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+    crossings = straddles & (x < crossing_x)
+    return np.count_nonzero(crossings, axis=1) % 2 == 1
+
+
+class RegionOfInterest:
+    """ROI polygon of one camera, resolved to pixels per frame size"""
+
+    def __init__(self, polygon: List[List[float]]):
+        """
+        Initialize ROI
+
+        Args:
+            polygon: At least 3 [x, y] points in normalized [0, 1] coordinates
+        """
+        self.polygon = np.clip(np.asarray(polygon, dtype=np.float64).reshape(-1, 2), 0.0, 1.0)
+        self._shape = None
+        self._pixels = None  # (V, 2) polygon in pixels
+        self._rect = None  # (x1, y1, x2, y2) bounding rectangle in pixels
+
+    def _resolve(self, shape: Tuple[int, int]):
+        """Convert the polygon to pixels for a frame size (cached until the size changes)"""
+        height, width = shape[:2]
+        if self._shape == (height, width):
+            return
+        self._shape = (height, width)
+        self._pixels = self.polygon * [width, height]
+
+        x1, y1 = np.floor(self._pixels.min(axis=0)).astype(int).tolist()
+        x2, y2 = np.ceil(self._pixels.max(axis=0)).astype(int).tolist()
+        x1, y1 = max(0, x1), max(0, y1)
+        x2, y2 = min(width, max(x2, x1 + 1)), min(height, max(y2, y1 + 1))
+        self._rect = (x1, y1, x2, y2)
+
+    def crop(self, frame: np.ndarray) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """
+        Crop a frame to the ROI bounding rectangle (a view, no copy)
+
+        Args:
+            frame: Full BGR frame
+
+        Returns:
+            Tuple of (cropped view, (x_offset, y_offset) of the crop in the frame)
+        """
+        self._resolve(frame.shape)
+        x1, y1, x2, y2 = self._rect
+        return frame[y1:y2, x1:x2], (x1, y1)
+
+    def contains_centroids(self, boxes: np.ndarray, shape: Tuple[int, int]) -> np.ndarray:
+        """
+        Which boxes have their centroid inside the polygon
+
+        Args:
+            boxes: (N, 4) [x1, y1, x2, y2] boxes in full-frame pixels
+            shape: Frame (height, width)
+
+        Returns:
+            (N,) bool array
+        """
+        self._resolve(shape)
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        centroids = (boxes[:, :2] + boxes[:, 2:]) / 2
+        return points_in_polygon(centroids, self._pixels)
+
+    def draw(self, frame: np.ndarray, color: Tuple[int, int, int] = (255, 200, 0), thickness: int = 2):
+        """Draw the polygon outline on a frame (in-place; the frame may be a downscaled copy)"""
+        height, width = frame.shape[:2]
+        pixels = np.round(self.polygon * [width, height]).astype(np.int32)
+        cv2.polylines(frame, [pixels], True, color, thickness)
@@ -0,0 +1,142 @@
+"""
+Per-stage latency of the camera stream pipeline, per camera.
+
+Every stage (decode, detect, encode, serialize, broadcast, db) records one
+sample per run into a rolling window per camera, from which get_stats() reports
+p50 / p95 / p99. 'detect' is the whole detection call as the stream sees it
+(waiting for the inference threads included); preprocess, inference, tracking
+and draw are its parts. 'latency' is the age of a frame when it has been sent
+to the viewers (capture to broadcast).
+
+The model stages run on the inference threads, possibly for several cameras in
+one batch, and a tiled or cascaded frame makes several model passes. The service
+wraps them in cameras(): spans recorded inside it without a camera_id are summed
+and charged, as one sample, to every camera of the batch - that is how long each
+of those frames waited on them.
+"""
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Iterable, Optional
+import numpy as np
+from ..core.config import settings
+
+STAGES = (
+    'decode', 'detect', 'preprocess', 'inference', 'tracking', 'draw',
+    'encode', 'serialize', 'broadcast', 'db', 'latency'
+)
+
+# {camera_id: {stage: ms}} summed inside the current cameras() block (per thread / task)
+_open_frames: ContextVar[Optional[Dict[str, Dict[str, float]]]] = ContextVar('stage_timing_frames', default=None)
+
+
+class StageTimer:
+    """Rolling per-camera, per-stage latency windows"""
+
+    def __init__(self, window: int = 300):
+        """
+        Initialize timer
+
+        Args:
+            window: Samples kept per camera and stage for the percentiles
+        """
+        self.window = window
+        self._samples = {}  # {camera_id: {stage: deque of ms}}
+        self._last = {}  # {camera_id: {stage: ms}} most recent sample
+
+    @contextmanager
+    def cameras(self, camera_ids: Iterable[Optional[str]]):
+        """Sum spans recorded in this block without a camera_id and charge them to these cameras"""
+        frames = {camera_id: {} for camera_id in camera_ids if camera_id is not None}
+        token = _open_frames.set(frames)
+        try:
+            yield
+        finally:
+            _open_frames.reset(token)
+            for camera_id, stages in frames.items():
+                for stage, elapsed_ms in stages.items():
+                    self._observe(camera_id, stage, elapsed_ms)
+
+    @contextmanager
+    def span(self, stage: str, camera_id: str = None):
+        """Time a block as one run of a stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - start) * 1000, camera_id)
+
+    def record(self, stage: str, elapsed_ms: float, camera_id: str = None):
+        """
+        Record one run of a stage
+
+        Args:
+            stage: Stage name (see STAGES)
+            elapsed_ms: Time spent, in milliseconds
+            camera_id: Camera the run belongs to (default: the cameras() block it runs in;
+                       ignored outside of one)
+        """
+        if camera_id is not None:
+            self._observe(camera_id, stage, elapsed_ms)
+            return
+        frames = _open_frames.get()
+        for stages in (frames or {}).values():
+            stages[stage] = stages.get(stage, 0.0) + elapsed_ms
+
+    def _observe(self, camera_id: str, stage: str, elapsed_ms: float):
+        windows = self._samples.setdefault(camera_id, {})
+        if stage not in windows:
+            windows[stage] = deque(maxlen=self.window)
+        windows[stage].append(elapsed_ms)
+        self._last.setdefault(camera_id, {})[stage] = elapsed_ms
+
+    def frame_timings(self, camera_id: str) -> Dict[str, float]:
+        """Most recent time of each stage of a camera, in milliseconds"""
+        last = dict(self._last.get(camera_id, {}))
+        return {stage: round(last[stage], 2) for stage in STAGES if stage in last}
+
+    def get_stats(self, camera_id: str = None) -> Dict[str, Any]:
+        """
+        Latency percentiles per camera and stage
+
+        Args:
+            camera_id: Only this camera (default: all cameras)
+
+        Returns:
+            {camera_id: {stage: {'count', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'}}}
+            over the last `window` samples, stages in pipeline order
+        """
+        camera_ids = [camera_id] if camera_id is not None else list(self._samples)
+        stats = {}
+        for camera in camera_ids:
+            windows = dict(self._samples.get(camera, {}))
+            order = [stage for stage in STAGES if stage in windows] + sorted(set(windows) - set(STAGES))
+            camera_stats = {}
+            for stage in order:
+                samples = np.fromiter(list(windows[stage]), dtype=np.float64)
+                if not len(samples):
+                    continue
+                p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+                camera_stats[stage] = {
+                    'count': int(len(samples)),
+                    'mean_ms': round(float(samples.mean()), 2),
+                    'p50_ms': round(float(p50), 2),
+                    'p95_ms': round(float(p95), 2),
+                    'p99_ms': round(float(p99), 2),
+                    'max_ms': round(float(samples.max()), 2)
+                }
+            stats[camera] = camera_stats
+        return stats
+
+
+# Global instance (singleton)
+_stage_timer = None
+
+
+def get_stage_timer() -> StageTimer:
+    """Get or create stage timer instance"""
+    global _stage_timer
+    if _stage_timer is None:
+        _stage_timer = StageTimer(window=settings.STAGE_TIMING_WINDOW)
+    return _stage_timer
@@ -0,0 +1,181 @@
+"""
+Staged camera stream pipeline.
+
+A camera stream runs as independent stages connected by bounded queues:
+
+    capture (thread) -> infer -> encode -> broadcast
+                              \\-> persist
+
+so a slow stage no longer holds up the others. Each queue has an explicit
+drop policy:
+
+- 'latest': keeps only the newest items; when full the oldest is dropped. A
+  slow consumer skips frames instead of falling behind, so viewers get current
+  video and the capture's internal buffer is drained continuously.
+- 'block': never drops; the producer waits for room. Persistence sees every
+  inferred frame, so violation timers and DB writes stay exact (a backed-up
+  database slows detection down rather than losing events).
+
+A stage passes END downstream when it finishes, so the queued work is drained
+before the stream ends. The capture stage is a CaptureThread from the capture
+registry, which may be shared with other cameras reading the same source.
+"""
+import asyncio
+import time
+from typing import Dict, Any, Callable
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+END = object()  # Sentinel: the producer finished, consumers forward it and stop
+
+
+class StageQueue:
+    """Bounded queue between two pipeline stages with a drop policy and counters"""
+
+    LATEST = 'latest'
+    BLOCK = 'block'
+
+    def __init__(self, name: str, maxsize: int = 1, policy: str = LATEST):
+        """
+        Initialize queue
+
+        Args:
+            name: Queue name (for statistics)
+            maxsize: Capacity in items
+            policy: 'latest' (drop the oldest item when full) or 'block' (producer waits)
+        """
+        if policy not in (self.LATEST, self.BLOCK):
+            raise ValueError(f"Unknown drop policy: {policy}")
+        self.name = name
+        self.policy = policy
+        self.maxsize = max(1, maxsize)
+        self._queue = asyncio.Queue(self.maxsize)
+        self.put_count = 0
+        self.get_count = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    def put_nowait(self, item):
+        """Add an item to a 'latest' queue, dropping the oldest ones if it is full"""
+        if self.policy != self.LATEST:
+            raise RuntimeError(f"Queue '{self.name}' never drops - use put()")
+        while self._queue.full():
+            dropped = self._queue.get_nowait()
+            if dropped is END:
+                # Never lose the end marker
+                self._queue.put_nowait(END)
+                return
+            self.dropped += 1
+        self._added(item)
+
+    async def put(self, item):
+        """Add an item (waits for room in a 'block' queue)"""
+        if self.policy == self.LATEST:
+            self.put_nowait(item)
+            return
+        await self._queue.put(item)
+        self.put_count += 1
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+
+    def _added(self, item):
+        self._queue.put_nowait(item)
+        self.put_count += 1
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+
+    async def get(self):
+        """Remove and return the oldest item (waits if empty)"""
+        item = await self._queue.get()
+        self.get_count += 1
+        return item
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get depth and drop counters"""
+        return {
+            'policy': self.policy,
+            'capacity': self.maxsize,
+            'depth': self._queue.qsize(),
+            'max_depth': self.max_depth,
+            'put': self.put_count,
+            'taken': self.get_count,
+            'dropped': self.dropped
+        }
+
+
+class StreamPipeline:
+    """Queues, capture subscription and stage tasks of one camera stream"""
+
+    def __init__(self, camera_id: str):
+        self.camera_id = camera_id
+        self.queues: Dict[str, StageQueue] = {}
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.capture = None  # CaptureThread this camera subscribes to
+        self.started_at = time.time()
+
+    def add_queue(self, name: str, maxsize: int = 1, policy: str = StageQueue.LATEST) -> StageQueue:
+        """Create a named queue between two stages"""
+        queue = StageQueue(name, maxsize, policy)
+        self.queues[name] = queue
+        return queue
+
+    def start_stage(self, name: str, stage: Callable[[], Any]):
+        """Run a stage coroutine function as its own task"""
+        self.tasks[name] = asyncio.create_task(stage(), name=f"{name}-{self.camera_id}")
+
+    async def run(self):
+        """
+        Wait until every stage has finished
+
+        Raises:
+            Exception: The first stage failure (the other stages are cancelled)
+        """
+        tasks = list(self.tasks.values())
+        try:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+        finally:
+            self.stop()
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stop(self):
+        """Leave the capture (queued frames still drain through the stages)"""
+        from .capture_registry import get_capture_registry
+
+        capture, self.capture = self.capture, None
+        if capture is not None:
+            get_capture_registry().unsubscribe(capture, self.camera_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get capture, queue and stage states"""
+        return {
+            'started_at': self.started_at,
+            'capture': self.capture.get_stats() if self.capture is not None else None,
+            'queues': {name: queue.get_stats() for name, queue in self.queues.items()},
+            'stages': {
+                name: 'running' if not task.done() else 'failed' if not task.cancelled() and task.exception() else 'done'
+                for name, task in self.tasks.items()
+            }
+        }
+
+
+# Running pipelines by camera
+_pipelines: Dict[str, StreamPipeline] = {}
+
+
+def register_pipeline(pipeline: StreamPipeline):
+    _pipelines[pipeline.camera_id] = pipeline
+
+
+def unregister_pipeline(pipeline: StreamPipeline):
+    if _pipelines.get(pipeline.camera_id) is pipeline:
+        del _pipelines[pipeline.camera_id]
+
+
+def get_pipeline_stats() -> Dict[str, Any]:
+    """Get the state of every running camera pipeline"""
+    return {camera_id: pipeline.get_stats() for camera_id, pipeline in list(_pipelines.items())}
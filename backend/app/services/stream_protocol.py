@@ -0,0 +1,89 @@
+"""
+Wire formats of the /ws/monitor/{camera_id} stream.
+
+Clients pick a format with the WebSocket subprotocol handshake:
+
+- 'ppe.json' (also used when no subprotocol is offered): every message is a
+  JSON text message; frames carry the JPEG base64-encoded in 'frame'.
+- 'ppe.bin.v1': 'frame' messages are binary, everything else (status, alert,
+  error, pong) stays JSON text. A binary frame message is
+
+      header (8 bytes, big-endian)
+          uint8   version        (1)
+          uint8   flags          (bit 0: a JPEG image follows the metadata)
+          uint16  reserved       (0)
+          uint32  metadata length in bytes
+      metadata   compact UTF-8 JSON, the same object as the JSON format without 'frame'
+      image      raw JPEG bytes (rest of the message, if flagged)
+
+  so the image skips base64 (+33% size) and the Python str round trip.
+
+Both forms of a frame are built once and sent to every client that negotiated them.
+"""
+import base64
+import json
+import struct
+from typing import Iterable, Optional
+
+PROTOCOL_JSON = 'ppe.json'
+PROTOCOL_BINARY = 'ppe.bin.v1'
+SUPPORTED_PROTOCOLS = (PROTOCOL_BINARY, PROTOCOL_JSON)  # Server preference order
+
+BINARY_VERSION = 1
+FLAG_IMAGE = 0x01
+HEADER = struct.Struct('!BBHI')
+
+
+def serialize_message(message: dict) -> str:
+    """Encode a message the way WebSocket.send_json does"""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+def negotiate_protocol(offered: Iterable[str]) -> Optional[str]:
+    """
+    Pick the stream format from the client's offered subprotocols
+
+    Args:
+        offered: Subprotocols from the handshake, in client preference order
+
+    Returns:
+        The chosen subprotocol to confirm, or None (no subprotocol: JSON)
+    """
+    offered = list(offered)
+    for protocol in SUPPORTED_PROTOCOLS:
+        if protocol in offered:
+            return protocol
+    return None
+
+
+def encode_json_frame(message: dict, jpeg: Optional[bytes]) -> str:
+    """Frame message as JSON text with the JPEG base64-encoded in 'frame'"""
+    if jpeg is not None:
+        message = {**message, 'frame': base64.b64encode(jpeg).decode('ascii')}
+    return serialize_message(message)
+
+
+def encode_binary_frame(message: dict, jpeg: Optional[bytes]) -> bytes:
+    """Frame message as a version 1 binary message (header, JSON metadata, raw JPEG)"""
+    metadata = serialize_message(message).encode('utf-8')
+    flags = FLAG_IMAGE if jpeg is not None else 0
+    return b''.join((HEADER.pack(BINARY_VERSION, flags, 0, len(metadata)), metadata, jpeg if jpeg is not None else b''))
+
+
+def decode_binary_frame(payload: bytes) -> tuple[dict, Optional[bytes]]:
+    """
+    Split a binary frame message into its metadata and JPEG bytes
+
+    Raises:
+        ValueError: Unknown version or truncated message
+    """
+    if len(payload) < HEADER.size:
+        raise ValueError("Binary frame shorter than its header")
+    version, flags, _, metadata_length = HEADER.unpack_from(payload)
+    if version != BINARY_VERSION:
+        raise ValueError(f"Unsupported binary frame version: {version}")
+    end = HEADER.size + metadata_length
+    if len(payload) < end:
+        raise ValueError("Binary frame shorter than its metadata length")
+    message = json.loads(payload[HEADER.size:end].decode('utf-8'))
+    return message, bytes(payload[end:]) if flags & FLAG_IMAGE else None
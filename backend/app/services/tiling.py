@@ -0,0 +1,136 @@
+"""
+Tiled inference for high-resolution and wide-angle cameras.
+
+A 4K frame letterboxed to 640 px shrinks distant workers (and their hardhats)
+to a few pixels. In tiled mode the frame is split into a grid of overlapping
+tiles that are each letterboxed to the model input size and run through the
+model as one batch. Detections are then mapped back to the frame and merged
+with cross-tile NMS, so an object cut by a tile border or seen by two
+overlapping tiles is reported once.
+"""
+import re
+from typing import List, Optional, Tuple
+import numpy as np
+from .detections import Detections, pairwise_intersection
+
+TILE_GRID_PATTERN = re.compile(r'^\s*([1-9])\s*[xX]\s*([1-9])\s*$')
+
+
+def parse_tile_grid(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    """
+    Parse a tile grid setting
+
+    Args:
+        value: "COLSxROWS" (e.g. "3x2"), or None / "" for no tiling
+
+    Returns:
+        (cols, rows), or None if tiling is off (including "1x1")
+    """
+    if not value:
+        return None
+    match = TILE_GRID_PATTERN.match(value)
+    if match is None:
+        raise ValueError(f"Invalid tile grid '{value}' (expected COLSxROWS, e.g. 3x2)")
+    cols, rows = int(match.group(1)), int(match.group(2))
+    return None if cols == rows == 1 else (cols, rows)
+
+
+def _spans(length: int, count: int, overlap: float) -> List[Tuple[int, int]]:
+    """Start/end of count overlapping windows covering [0, length)"""
+    if count == 1:
+        return [(0, length)]
+    size = length / (count - (count - 1) * overlap)
+    step = size * (1 - overlap)
+    spans = [(int(round(i * step)), int(round(i * step + size))) for i in range(count)]
+    spans[-1] = (spans[-1][0], length)  # Absorb rounding at the far edge
+    return spans
+
+
+def tile_windows(width: int, height: int, grid: Tuple[int, int], overlap: float) -> List[Tuple[int, int, int, int]]:
+    """
+    Overlapping tile windows covering a frame
+
+    Args:
+        width: Frame width
+        height: Frame height
+        grid: (cols, rows)
+        overlap: Fraction of a tile shared with each neighbour (0.0-0.5)
+
+    Returns:
+        List of (x1, y1, x2, y2) windows, row by row
+    """
+    cols, rows = grid
+    return [
+        (x1, y1, x2, y2)
+        for y1, y2 in _spans(height, rows, overlap)
+        for x1, x2 in _spans(width, cols, overlap)
+    ]
+
+
+def cross_tile_nms(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    class_ids: np.ndarray,
+    sources: np.ndarray,
+    threshold: float
+) -> np.ndarray:
+    """
+    Greedy class-wise NMS between detections from different tiles
+
+    Overlap is measured as intersection over the smaller box, so the partial box
+    of an object cut by a tile border is suppressed by the complete box from the
+    neighbouring tile. Boxes from the same tile are never suppressed against each
+    other (the model's own NMS already handled them), which keeps genuinely
+    overlapping workers apart.
+
+    Args:
+        boxes: (N, 4) [x1, y1, x2, y2] boxes in frame coordinates
+        scores: (N,) confidences
+        class_ids: (N,) class indices
+        sources: (N,) tile index each box came from
+        threshold: Intersection over smaller area above which the weaker box is dropped
+
+    Returns:
+        Sorted indices of kept boxes
+    """
+    count = len(boxes)
+    if count < 2:
+        return np.arange(count)
+
+    boxes = boxes.astype(np.float64)
+    intersection = pairwise_intersection(boxes, boxes)
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    smaller = np.minimum(areas[:, None], areas[None, :])
+    overlap = np.divide(intersection, smaller, out=np.zeros((count, count)), where=smaller > 0)
+
+    suppresses = (
+        (overlap > threshold)
+        & (class_ids[:, None] == class_ids[None, :])
+        & (sources[:, None] != sources[None, :])
+    )
+
+    suppressed = np.zeros(count, dtype=bool)
+    keep = []
+    for i in np.argsort(-scores, kind='stable'):
+        if suppressed[i]:
+            continue
+        keep.append(i)
+        suppressed |= suppresses[i]
+    return np.sort(np.array(keep, dtype=np.int64))
+
+
+def merge_tile_detections(parts: List[Detections], threshold: float) -> Detections:
+    """
+    Combine the detections of all tiles of one frame
+
+    Args:
+        parts: Detections per tile, already in full-frame coordinates
+        threshold: Cross-tile NMS threshold (intersection over smaller area)
+
+    Returns:
+        Merged detections for the frame
+    """
+    combined = Detections.concatenate(parts)
+    sources = np.repeat(np.arange(len(parts)), [len(part) for part in parts])
+    keep = cross_tile_nms(combined.xyxy, combined.confidence, combined.class_ids, sources, threshold)
+    return combined.select(keep)
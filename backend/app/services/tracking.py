@@ -0,0 +1,205 @@
+from types import SimpleNamespace
+from typing import List
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from .detections import pairwise_intersection
+
+
+def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """
+    Pairwise Intersection over Union between two sets of boxes
+
+    Args:
+        boxes_a: (N, 4) array of [x1, y1, x2, y2]
+        boxes_b: (M, 4) array of [x1, y1, x2, y2]
+
+    Returns:
+        (N, M) IoU matrix
+    """
+    intersection = pairwise_intersection(boxes_a, boxes_b)
+
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - intersection
+
+    return np.divide(intersection, union, out=np.zeros_like(intersection, dtype=np.float64), where=union > 0)
+
+
+class IoUTracker:
+    """
+    Per-camera worker tracker using a full IoU matrix and optimal (Hungarian) assignment.
+
+    Tracked workers are stored as parallel arrays (ids, boxes, last_seen) rather than
+    a dict per worker, so each frame costs one vectorized IoU computation plus one
+    assignment solve, and no two detections can claim the same worker ID.
+    """
+
+    def __init__(self, iou_threshold: float = 0.3, max_frames_missing: int = 30):
+        """
+        Initialize tracker
+
+        Args:
+            iou_threshold: Minimum IoU (exclusive) to match a detection to a tracked worker
+            max_frames_missing: Frames a worker may go unseen before its ID is dropped
+        """
+        self.iou_threshold = iou_threshold
+        self.max_frames_missing = max_frames_missing
+
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.boxes = np.zeros((0, 4), dtype=np.float64)
+        self.last_seen = np.zeros(0, dtype=np.int64)
+        self.next_worker_id = 1
+        self.frame_count = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def advance(self, frames: int = 1):
+        """Count frames that had no detections run on them (keeps worker ages in stream frames)"""
+        self.frame_count += frames
+
+    def update(self, boxes: np.ndarray, track_boxes: np.ndarray = None, confidences: np.ndarray = None) -> np.ndarray:
+        """
+        Assign worker IDs to this frame's person boxes
+
+        Args:
+            boxes: (N, 4) array of person boxes [x1, y1, x2, y2]
+            track_boxes: Optional (len(self), 4) boxes to match against instead of each
+                         worker's last seen box (e.g. motion-predicted positions)
+            confidences: Unused (same signature as ByteTrackWorkerTracker.update)
+
+        Returns:
+            (N,) array of worker IDs, in the same order as boxes
+        """
+        self.frame_count += 1
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        worker_ids = np.zeros(len(boxes), dtype=np.int64)
+        matched = np.zeros(len(boxes), dtype=bool)
+
+        if len(boxes) and len(self.ids):
+            iou = iou_matrix(boxes, self.boxes if track_boxes is None else track_boxes)
+            rows, cols = linear_sum_assignment(iou, maximize=True)
+            valid = iou[rows, cols] > self.iou_threshold
+            rows, cols = rows[valid], cols[valid]
+
+            worker_ids[rows] = self.ids[cols]
+            matched[rows] = True
+            self.boxes[cols] = boxes[rows]
+            self.last_seen[cols] = self.frame_count
+
+        # New workers for unmatched detections
+        new_count = int((~matched).sum())
+        if new_count:
+            new_ids = np.arange(self.next_worker_id, self.next_worker_id + new_count, dtype=np.int64)
+            self.next_worker_id += new_count
+            worker_ids[~matched] = new_ids
+
+            self.ids = np.concatenate([self.ids, new_ids])
+            self.boxes = np.concatenate([self.boxes, boxes[~matched]])
+            self.last_seen = np.concatenate([self.last_seen, np.full(new_count, self.frame_count, dtype=np.int64)])
+
+        # Drop workers not seen for too long
+        alive = self.frame_count - self.last_seen <= self.max_frames_missing
+        if not alive.all():
+            self.ids, self.boxes, self.last_seen = self.ids[alive], self.boxes[alive], self.last_seen[alive]
+
+        return worker_ids
+
+
+class ByteTrackWorkerTracker:
+    """
+    Per-camera worker tracker backed by the ultralytics ByteTrack implementation.
+
+    Uses the tuned parameters in bytetrack_custom.yaml. ByteTrack keeps lost tracks
+    alive for track_buffer frames and re-associates low-confidence detections, so
+    short occlusions don't fragment a worker into new IDs.
+
+    ByteTrack's own track IDs come from a process-wide counter that every new
+    tracker resets, so they are not stable per camera. Worker IDs are therefore
+    assigned here, per camera, to each ByteTrack track object. Persons whose track
+    is not confirmed yet (first sighting) get worker ID 0.
+    """
+
+    def __init__(self, config_path: str, frame_rate: int = 30):
+        """
+        Initialize tracker
+
+        Args:
+            config_path: ByteTrack YAML configuration
+            frame_rate: Stream frame rate (scales track_buffer)
+        """
+        import yaml
+        from ultralytics.trackers.byte_tracker import BYTETracker
+
+        with open(config_path) as config_file:
+            config = yaml.safe_load(config_file)
+        # track_buffer is given in frames at 30 FPS; scale it to the stream rate here
+        # (not every ultralytics version accepts a frame_rate argument)
+        config['track_buffer'] = max(1, int(frame_rate / 30.0 * config['track_buffer']))
+        self._tracker = BYTETracker(SimpleNamespace(**config))
+        self._worker_ids = {}  # {STrack: worker_id}
+        self.next_worker_id = 1
+        self.frame_count = 0
+
+    def _alive_tracks(self) -> List:
+        """Tracks ByteTrack still keeps (tracked and lost) that have a worker ID"""
+        return [
+            track for track in self._tracker.tracked_stracks + self._tracker.lost_stracks
+            if track in self._worker_ids
+        ]
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Worker IDs of alive tracks"""
+        return np.array([self._worker_ids[track] for track in self._alive_tracks()], dtype=np.int64)
+
+    @property
+    def boxes(self) -> np.ndarray:
+        """Last estimated [x1, y1, x2, y2] box of each alive track (same order as ids)"""
+        return np.array([track.xyxy for track in self._alive_tracks()], dtype=np.float64).reshape(-1, 4)
+
+    def __len__(self) -> int:
+        return len(self._alive_tracks())
+
+    def advance(self, frames: int = 1):
+        """Count frames without detections (ByteTrack ages tracks by updates only)"""
+        self.frame_count += frames
+
+    def update(self, boxes: np.ndarray, track_boxes: np.ndarray = None, confidences: np.ndarray = None) -> np.ndarray:
+        """
+        Assign worker IDs to this frame's person boxes
+
+        Args:
+            boxes: (N, 4) array of person boxes [x1, y1, x2, y2]
+            track_boxes: Ignored (ByteTrack predicts track positions with its own Kalman filter)
+            confidences: (N,) detection confidences (ByteTrack's two-stage association uses them)
+
+        Returns:
+            (N,) array of worker IDs, 0 for persons without a confirmed track yet
+        """
+        from ultralytics.engine.results import Boxes
+
+        self.frame_count += 1
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        if confidences is None:
+            confidences = np.ones(len(boxes), dtype=np.float32)
+
+        # Boxes rows: x1, y1, x2, y2, confidence, class (orig_shape is only used for normalized coordinates)
+        data = np.column_stack([boxes, confidences, np.zeros(len(boxes))]).astype(np.float32)
+        self._tracker.update(Boxes(data, orig_shape=(1, 1)))
+
+        worker_ids = np.zeros(len(boxes), dtype=np.int64)
+        for track in self._tracker.tracked_stracks:
+            if not track.is_activated or track.frame_id != self._tracker.frame_id:
+                continue
+            if track not in self._worker_ids:
+                self._worker_ids[track] = self.next_worker_id
+                self.next_worker_id += 1
+            worker_ids[int(track.idx)] = self._worker_ids[track]
+
+        # Forget tracks ByteTrack has removed
+        alive = set(self._tracker.tracked_stracks + self._tracker.lost_stracks)
+        for track in [track for track in self._worker_ids if track not in alive]:
+            del self._worker_ids[track]
+
+        return worker_ids
@@ -0,0 +1,103 @@
+"""
+Decode CPU per camera: cv2.VideoCapture vs the PyAV (FFmpeg) capture backend.
+
+Each video in demo_videos/ is decoded once per backend and the process CPU time
+(all threads, so FFmpeg's decoder threads are included) is divided by the
+seconds of video decoded. 'cpu_per_camera' is therefore the share of one core
+a camera streaming that video in real time costs, before inference.
+
+- opencv: the current path - full-resolution cv2.VideoCapture read, then a
+  cv2.resize to the stream width (what preprocessing / broadcast downscaling do)
+- pyav: threaded FFmpeg decoding with the scaler producing the stream width
+- pyav-keyframes: keyframes only (one frame per GOP)
+
+Usage (from the backend directory):
+    python -m benchmarks.capture_decode [--video PATH] [--width 1280] [--seconds 20] [--threads 0]
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, Dict
+import cv2
+from app.services.pyav_capture import PyAVCapture, output_size
+from .common import find_demo_videos, resolve_video, print_table
+
+
+def decode(open_capture: Callable[[], object], max_seconds: float, resize_width: int = 0) -> Dict[str, float]:
+    """
+    Read a capture until max_seconds of video (by frame timestamps) or its end
+
+    Args:
+        open_capture: Returns an opened capture
+        max_seconds: Seconds of video to decode
+        resize_width: cv2.resize frames to this width after reading (0 = no resize)
+
+    Returns:
+        Dict with frames, seconds of video, CPU and wall time
+    """
+    cap = open_capture()
+    if not cap.isOpened():
+        raise RuntimeError("capture did not open")
+
+    frames = 0
+    video_ms = 0.0
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    try:
+        while video_ms < max_seconds * 1000:
+            success, frame = cap.read()
+            if not success:
+                break
+            if resize_width:
+                height, width = frame.shape[:2]
+                size = output_size(width, height, resize_width)
+                if size != (width, height):
+                    frame = cv2.resize(frame, size, interpolation=cv2.INTER_LINEAR)
+            frames += 1
+            video_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+    finally:
+        cpu_seconds, wall_seconds = time.process_time() - cpu_start, time.perf_counter() - wall_start
+        cap.release()
+
+    video_seconds = max(video_ms / 1000, 1e-6)
+    return {
+        'frames': frames,
+        'video_s': video_seconds,
+        'cpu_s': cpu_seconds,
+        'wall_s': wall_seconds
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', help='Video file (default: every file in demo_videos/)')
+    parser.add_argument('--width', type=int, default=1280, help='Stream width frames are scaled to (0 = source size)')
+    parser.add_argument('--seconds', type=float, default=20.0, help='Seconds of video to decode per backend')
+    parser.add_argument('--threads', type=int, default=0, help='PyAV decoder threads (0 = FFmpeg picks)')
+    args = parser.parse_args()
+
+    videos = [resolve_video(args.video)] if args.video else find_demo_videos() or [resolve_video(None)]
+    backends = {
+        'opencv': (lambda path: cv2.VideoCapture(str(path)), args.width),
+        'pyav': (lambda path: PyAVCapture(str(path), width=args.width, threads=args.threads), 0),
+        'pyav-keyframes': (lambda path: PyAVCapture(str(path), width=args.width, threads=args.threads, keyframes_only=True), 0),
+    }
+
+    rows = []
+    for video in videos:
+        for name, (opener, resize_width) in backends.items():
+            result = decode(lambda: opener(video), args.seconds, resize_width)
+            rows.append({
+                'video': Path(video).name,
+                'backend': name,
+                'frames': result['frames'],
+                'cpu_ms_per_frame': result['cpu_s'] * 1000 / max(1, result['frames']),
+                'cpu_per_camera': result['cpu_s'] / result['video_s'],
+                'decode_fps': result['frames'] / max(result['wall_s'], 1e-6)
+            })
+
+    print_table(f"Decode to {args.width or 'source'} px wide ({args.seconds:g} s of video per backend)", rows)
+    print("\ncpu_per_camera = CPU seconds (all threads) per second of video, i.e. cores used by one real-time camera")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Shared helpers for detection pipeline benchmarks.
+
+Run benchmarks from the backend directory, e.g.:
+    python -m benchmarks.onnx_backend --video demo_videos/construction-demo.mp4
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import cv2
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEMO_VIDEOS_DIR = BACKEND_DIR / "demo_videos"
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv')
+
+
+def find_demo_videos() -> List[Path]:
+    """List video files in demo_videos/"""
+    return sorted(p for p in DEMO_VIDEOS_DIR.iterdir() if p.suffix.lower() in VIDEO_EXTENSIONS)
+
+
+def resolve_video(video: Optional[str]) -> Path:
+    """Resolve a --video argument (defaults to the first demo video), exiting if none is available"""
+    if video:
+        path = Path(video)
+        return path if path.is_absolute() else BACKEND_DIR / path
+
+    videos = find_demo_videos()
+    if not videos:
+        print(f"❌ No video given and no demo videos found in {DEMO_VIDEOS_DIR}")
+        sys.exit(1)
+    return videos[0]
+
+
+def load_frames(video_path: Path, max_frames: int = 100, stride: int = 5) -> List[np.ndarray]:
+    """
+    Read frames from a video file
+
+    Args:
+        video_path: Video file to read
+        max_frames: Maximum number of frames to return
+        stride: Keep every Nth frame
+
+    Returns:
+        List of BGR frames
+    """
+    cap = cv2.VideoCapture(str(video_path))
+    frames = []
+    index = 0
+    try:
+        while len(frames) < max_frames:
+            success, frame = cap.read()
+            if not success:
+                break
+            if index % stride == 0:
+                frames.append(frame)
+            index += 1
+    finally:
+        cap.release()
+
+    if not frames:
+        print(f"❌ Could not read frames from {video_path}")
+        sys.exit(1)
+    return frames
+
+
+def synthetic_frames(width: int = 1280, height: int = 720, count: int = 30, seed: int = 0) -> List[np.ndarray]:
+    """
+    Random BGR frames for benchmarks that only measure frame handling (no model)
+
+    Args:
+        width: Frame width
+        height: Frame height
+        count: Number of frames
+        seed: Random seed
+
+    Returns:
+        List of BGR frames
+    """
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def time_calls(fn: Callable[[int], object], iterations: int, warmup: int = 3) -> Dict[str, float]:
+    """
+    Time repeated calls of fn(i) with a monotonic clock
+
+    Args:
+        fn: Function called with the iteration index
+        iterations: Number of timed calls
+        warmup: Untimed calls made first
+
+    Returns:
+        Dict with mean/p50/p95/max latency in milliseconds
+    """
+    for i in range(warmup):
+        fn(i)
+
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    return {
+        'mean_ms': statistics.fmean(samples),
+        'p50_ms': samples[len(samples) // 2],
+        'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        'max_ms': samples[-1]
+    }
+
+
+def print_table(title: str, rows: List[Dict[str, object]]):
+    """Print a list of dicts as an aligned table"""
+    print(f"\n{title}")
+    if not rows:
+        print("  (no data)")
+        return
+
+    columns = list(rows[0].keys())
+    cells = [[f"{row[c]:.2f}" if isinstance(row[c], float) else str(row[c]) for c in columns] for row in rows]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(columns)]
+
+    print("  " + "  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    print("  " + "  ".join("-" * w for w in widths))
+    for r in cells:
+        print("  " + "  ".join(v.ljust(w) for v, w in zip(r, widths)))
@@ -0,0 +1,97 @@
+"""
+Parity check and latency benchmark: ONNX Runtime backend vs the torch backend.
+
+Runs both backends of YOLODetectionService over the same video frames, treats
+the torch detections as the reference, and fails (exit code 1) if the ONNX
+backend's detections diverge beyond the parity tolerances.
+
+Usage (from the backend directory):
+    python -m benchmarks.onnx_backend [--video PATH] [--frames 100] [--batch 1]
+"""
+import argparse
+import statistics
+import sys
+from app.core.detection_utils import match_detections
+from app.services.yolo_service import YOLODetectionService
+from .common import resolve_video, load_frames, time_calls, print_table
+
+# Parity tolerances (ONNX vs torch reference)
+MIN_RECALL = 0.98
+MIN_PRECISION = 0.98
+MIN_MEAN_IOU = 0.95
+MAX_CONFIDENCE_DELTA = 0.02
+
+
+def check_parity(torch_service: YOLODetectionService, onnx_service: YOLODetectionService, frames) -> bool:
+    """Compare detections frame by frame and print per-class parity"""
+    totals = {}
+    for frame in frames:
+        reference, _, _ = torch_service._run_inference(frame)
+        candidate, _, _ = onnx_service._run_inference(frame)
+        for class_name, stats in match_detections(reference, candidate).items():
+            total = totals.setdefault(class_name, {'tp': 0, 'fp': 0, 'fn': 0, 'ious': [], 'confidence_deltas': []})
+            for key in ('tp', 'fp', 'fn'):
+                total[key] += stats[key]
+            total['ious'].extend(stats['ious'])
+            total['confidence_deltas'].extend(stats['confidence_deltas'])
+
+    rows = []
+    passed = True
+    for class_name, total in sorted(totals.items()):
+        recall = total['tp'] / max(1, total['tp'] + total['fn'])
+        precision = total['tp'] / max(1, total['tp'] + total['fp'])
+        mean_iou = statistics.fmean(total['ious']) if total['ious'] else 1.0
+        max_delta = max(total['confidence_deltas'], default=0.0)
+        ok = recall >= MIN_RECALL and precision >= MIN_PRECISION and mean_iou >= MIN_MEAN_IOU and max_delta <= MAX_CONFIDENCE_DELTA
+        passed = passed and ok
+        rows.append({
+            'class': class_name,
+            'torch_boxes': total['tp'] + total['fn'],
+            'onnx_boxes': total['tp'] + total['fp'],
+            'recall': recall,
+            'precision': precision,
+            'mean_iou': mean_iou,
+            'max_conf_delta': max_delta,
+            'parity': 'OK' if ok else 'FAIL'
+        })
+
+    print_table("Parity (torch = reference)", rows)
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', help='Video file (default: first file in demo_videos/)')
+    parser.add_argument('--frames', type=int, default=100, help='Number of frames to use')
+    parser.add_argument('--batch', type=int, default=1, help='Frames per inference call for the latency run')
+    parser.add_argument('--gpu', action='store_true', help='Allow GPU (default: CPU only)')
+    args = parser.parse_args()
+
+    frames = load_frames(resolve_video(args.video), max_frames=args.frames)
+    print(f"Loaded {len(frames)} frames ({frames[0].shape[1]}x{frames[0].shape[0]})")
+
+    services = {
+        'torch': YOLODetectionService(use_gpu=args.gpu, backend='torch'),
+        'onnx': YOLODetectionService(use_gpu=args.gpu, backend='onnx'),
+    }
+
+    passed = check_parity(services['torch'], services['onnx'], frames)
+
+    rows = []
+    batches = [frames[i:i + args.batch] for i in range(0, len(frames), args.batch)]
+    for name, service in services.items():
+        timing = time_calls(lambda i: service._run_inference_batch(batches[i % len(batches)]), iterations=len(batches))
+        rows.append({
+            'backend': name,
+            'batch': args.batch,
+            **timing,
+            'fps': args.batch * 1000 / timing['mean_ms']
+        })
+    print_table("Inference latency per call", rows)
+
+    print(f"\nParity: {'PASSED' if passed else 'FAILED'}")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == '__main__':
+    main()
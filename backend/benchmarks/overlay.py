@@ -0,0 +1,117 @@
+"""
+Annotation draw time per frame: cvzone labels vs the cached-sprite renderer.
+
+"cvzone" reproduces the previous _draw_annotations: cvzone.putTextRect plus
+cv2.rectangle per detection and another putTextRect per worker, on the full
+capture frame. "renderer" draws the same overlays with OverlayRenderer at full
+resolution; "renderer@WIDTH" downscales the frame to the broadcast width first
+(the resize is included in the time). encode_ms adds the JPEG encode of the
+drawn frame at quality 85, as the stream does before broadcasting.
+
+Boxes are random but repeat across frames like real detections do (same classes,
+confidences in a narrow range, a fixed set of worker IDs); the first frames of
+each timing are untimed warm-up calls, so the sprite cache is warm.
+
+Usage (from the backend directory):
+    python -m benchmarks.overlay [--synthetic 1920x1080] [--boxes 5 100] [--stream-width 1280]
+"""
+import argparse
+import cv2
+import cvzone
+import numpy as np
+from app.services.overlay import OverlayRenderer
+from app.services.yolo_service import YOLODetectionService
+from .common import synthetic_frames, time_calls, print_table
+
+CLASS_NAMES = ['Hardhat', 'No-Hardhat', 'No-Safety-Vest', 'Safety-Vest', 'Person']
+
+
+def random_scene(width: int, height: int, count: int, seed: int = 0):
+    """Random boxes, classes and confidences, plus worker boxes for the Person boxes"""
+    rng = np.random.default_rng(seed)
+    x1 = rng.integers(0, width - 120, count)
+    y1 = rng.integers(0, height - 240, count)
+    boxes = np.stack([x1, y1, x1 + rng.integers(40, 120, count), y1 + rng.integers(60, 240, count)], axis=1).astype(np.int32)
+    names = [CLASS_NAMES[i] for i in rng.integers(0, len(CLASS_NAMES), count)]
+    confidences = np.ceil(rng.uniform(0.5, 0.95, count) * 100) / 100
+    workers = [(boxes[i].tolist(), number + 1) for number, i in enumerate(j for j, n in enumerate(names) if n == 'Person')]
+    return boxes, names, confidences, workers
+
+
+def draw_cvzone(frame, boxes, names, confidences, workers):
+    """Previous path: cvzone label + rectangle per box, cvzone label per worker"""
+    colors = YOLODetectionService.COLORS
+    for (x1, y1, x2, y2), name, conf in zip(boxes.tolist(), names, confidences):
+        color = colors.get(name, colors['default'])
+        cvzone.putTextRect(
+            frame, f'{name} {conf}', (max(0, x1), max(35, y1)),
+            scale=1, thickness=1, colorB=color, colorT=(255, 255, 255), colorR=color, offset=5
+        )
+        cv2.rectangle(frame, (x1, y1), (x2, y2), color, 3)
+    for (x1, y1, _, _), worker_id in workers:
+        cvzone.putTextRect(
+            frame, f'Worker #{worker_id}', (max(0, x1), max(15, y1 - 25)),
+            scale=1.2, thickness=2, colorB=(255, 255, 0), colorT=(0, 0, 0), colorR=(255, 255, 0), offset=8
+        )
+    return frame
+
+
+def draw_renderer(renderer, frame, boxes, names, confidences, workers, stream_width=None):
+    """New path: optional downscale, then OverlayRenderer"""
+    scale = 1.0
+    height, width = frame.shape[:2]
+    if stream_width and width > stream_width:
+        scale = stream_width / width
+        frame = cv2.resize(frame, (stream_width, int(round(height * scale))), interpolation=cv2.INTER_LINEAR)
+    renderer.render(
+        frame, boxes, names, confidences, YOLODetectionService.COLORS,
+        [box for box, _ in workers], [worker_id for _, worker_id in workers], scale=scale
+    )
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--synthetic', default='1920x1080', help='Frame size, e.g. 1920x1080')
+    parser.add_argument('--boxes', type=int, nargs='+', default=[5, 100], help='Detections per frame')
+    parser.add_argument('--stream-width', type=int, default=1280, help='Broadcast width for the downscaled mode')
+    parser.add_argument('--frames', type=int, default=200, help='Timed frames per mode')
+    args = parser.parse_args()
+
+    width, height = map(int, args.synthetic.lower().split('x'))
+    frames = synthetic_frames(width, height, count=8)
+
+    rows = []
+    for count in args.boxes:
+        scenes = [random_scene(width, height, count, seed) for seed in range(4)]
+        renderer = OverlayRenderer()
+        modes = [
+            ('cvzone', lambda frame, scene: draw_cvzone(frame, *scene)),
+            ('renderer', lambda frame, scene: draw_renderer(renderer, frame, *scene)),
+            (f'renderer@{args.stream_width}', lambda frame, scene: draw_renderer(renderer, frame, *scene, args.stream_width)),
+        ]
+        for name, draw in modes:
+            # Draw on copies so every call starts from a clean frame; the copy is timed separately
+            timing = time_calls(
+                lambda i: draw(frames[i % len(frames)].copy(), scenes[i % len(scenes)]),
+                iterations=args.frames
+            )
+            encode_timing = time_calls(
+                lambda i: cv2.imencode('.jpg', draw(frames[i % len(frames)].copy(), scenes[i % len(scenes)]), [cv2.IMWRITE_JPEG_QUALITY, 85]),
+                iterations=args.frames
+            )
+            copy_timing = time_calls(lambda i: frames[i % len(frames)].copy(), iterations=args.frames)
+            rows.append({
+                'boxes': count,
+                'mode': name,
+                'mean_ms': timing['mean_ms'] - copy_timing['mean_ms'],
+                'p95_ms': timing['p95_ms'] - copy_timing['mean_ms'],
+                'draw_encode_ms': encode_timing['mean_ms'] - copy_timing['mean_ms'],
+                'sprites': '-' if name == 'cvzone' else renderer.get_stats()['sprites']
+            })
+
+    print_table(f"Annotation draw time per frame ({width}x{height})", rows)
+
+
+if __name__ == '__main__':
+    main()
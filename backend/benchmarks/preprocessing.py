@@ -0,0 +1,132 @@
+"""
+Per-frame allocations and latency of the preprocessing stage.
+
+"before" reproduces the previous path: frame.copy(), a width-based cv2.resize,
+then the model-side letterbox into a new padded image (and, for ONNX, a freshly
+built input blob). "after" letterboxes into a per-camera LetterboxBuffer and
+writes the ONNX blob into a reused array.
+
+Allocations are measured with tracemalloc (NumPy and OpenCV output arrays are
+tracked) as the peak bytes allocated while processing one frame.
+
+Usage (from the backend directory):
+    python -m benchmarks.preprocessing [--video PATH] [--frames 60] [--size 640]
+    python -m benchmarks.preprocessing --synthetic 1280x720
+"""
+import argparse
+import math
+import tracemalloc
+import cv2
+import numpy as np
+from app.services.preprocessing import LetterboxBuffer, MODEL_STRIDE, LETTERBOX_COLOR, images_to_blob
+from .common import resolve_video, load_frames, synthetic_frames, time_calls, print_table
+
+
+def legacy_torch(frame: np.ndarray, size: int) -> np.ndarray:
+    """Previous torch path: defensive copy, width resize, then the model's own letterbox"""
+    frame = frame.copy()
+    height, width = frame.shape[:2]
+    if width > size:
+        scale = size / width
+        frame = cv2.resize(frame, (size, int(height * scale)), interpolation=cv2.INTER_LINEAR)
+
+    # Model-side minimal-rectangle letterbox (new padded image)
+    height, width = frame.shape[:2]
+    ratio = min(size / height, size / width)
+    new_width, new_height = int(round(width * ratio)), int(round(height * ratio))
+    if (new_width, new_height) != (width, height):
+        frame = cv2.resize(frame, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+    pad_x = (math.ceil(new_width / MODEL_STRIDE) * MODEL_STRIDE - new_width) / 2
+    pad_y = (math.ceil(new_height / MODEL_STRIDE) * MODEL_STRIDE - new_height) / 2
+    top, bottom = int(round(pad_y - 0.1)), int(round(pad_y + 0.1))
+    left, right = int(round(pad_x - 0.1)), int(round(pad_x + 0.1))
+    return cv2.copyMakeBorder(frame, top, bottom, left, right, cv2.BORDER_CONSTANT, value=LETTERBOX_COLOR)
+
+
+def legacy_onnx(frame: np.ndarray, size: int) -> np.ndarray:
+    """Previous ONNX path: defensive copy, width resize, square letterbox, stacked/flipped/normalized blob"""
+    frame = frame.copy()
+    height, width = frame.shape[:2]
+    if width > size:
+        scale = size / width
+        frame = cv2.resize(frame, (size, int(height * scale)), interpolation=cv2.INTER_LINEAR)
+
+    height, width = frame.shape[:2]
+    ratio = min(size / height, size / width)
+    new_width, new_height = int(round(width * ratio)), int(round(height * ratio))
+    if (new_width, new_height) != (width, height):
+        frame = cv2.resize(frame, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+    pad_x, pad_y = (size - new_width) / 2, (size - new_height) / 2
+    top, bottom = int(round(pad_y - 0.1)), int(round(pad_y + 0.1))
+    left, right = int(round(pad_x - 0.1)), int(round(pad_x + 0.1))
+    padded = cv2.copyMakeBorder(frame, top, bottom, left, right, cv2.BORDER_CONSTANT, value=LETTERBOX_COLOR)
+
+    blob = np.stack([padded])[..., ::-1].transpose(0, 3, 1, 2)
+    return np.ascontiguousarray(blob, dtype=np.float32) / 255.0
+
+
+def peak_allocation_kb(fn, frames) -> float:
+    """Mean peak bytes allocated per call, in KB"""
+    fn(frames[0])  # Let reusable buffers allocate before measuring
+    tracemalloc.start()
+    peaks = []
+    try:
+        for frame in frames:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            result = fn(frame)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - baseline)
+            del result
+    finally:
+        tracemalloc.stop()
+    return sum(peaks) / len(peaks) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', help='Video file (default: first file in demo_videos/)')
+    parser.add_argument('--synthetic', help='Use random frames of this size instead of a video, e.g. 1280x720')
+    parser.add_argument('--frames', type=int, default=60, help='Number of frames')
+    parser.add_argument('--size', type=int, default=640, help='Model input size')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        width, height = map(int, args.synthetic.lower().split('x'))
+        frames = synthetic_frames(width, height, args.frames)
+    else:
+        frames = load_frames(resolve_video(args.video), args.frames, stride=1)
+
+    size = args.size
+    torch_buffer = LetterboxBuffer(stride=MODEL_STRIDE)
+    onnx_buffer = LetterboxBuffer()
+    blob = np.empty((1, 3, size, size), dtype=np.float32)
+
+    def onnx_after(frame):
+        canvas, _, _ = onnx_buffer.letterbox(frame, size)
+        return images_to_blob([canvas], out=blob)
+
+    paths = [
+        ('torch', 'before', lambda frame: legacy_torch(frame, size)),
+        ('torch', 'after', lambda frame: torch_buffer.letterbox(frame, size)[0]),
+        ('onnx', 'before', lambda frame: legacy_onnx(frame, size)),
+        ('onnx', 'after', onnx_after)
+    ]
+
+    height, width = frames[0].shape[:2]
+    rows = []
+    for backend, variant, fn in paths:
+        timing = time_calls(lambda i: fn(frames[i % len(frames)]), iterations=len(frames))
+        rows.append({
+            'backend': backend,
+            'path': variant,
+            'alloc_kb_per_frame': peak_allocation_kb(fn, frames),
+            'mean_ms': timing['mean_ms'],
+            'p95_ms': timing['p95_ms']
+        })
+
+    print_table(f"Preprocessing {width}x{height} -> {size} ({len(frames)} frames)", rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Bandwidth and server CPU of the stream formats: base64-in-JSON vs binary frames.
+
+Builds real frame messages (JPEG at the stream quality plus a results dict)
+both ways and reports, per frame:
+
+- bytes: what each client receives
+- build_ms: encoding the message once (base64 + JSON, or header + JSON + JPEG)
+- send_ms: the per-client work before the socket write (a text message is
+  UTF-8 encoded again for every client, a binary one is sent as is)
+- per_frame_ms: build + send for --clients viewers
+
+Usage (from the backend directory):
+    python -m benchmarks.stream_protocol [--video PATH] [--frames 60] [--clients 4] [--quality 85]
+    python -m benchmarks.stream_protocol --synthetic 1280x720
+"""
+import argparse
+import cv2
+from app.services.stream_protocol import encode_json_frame, encode_binary_frame
+from .common import resolve_video, load_frames, synthetic_frames, time_calls, print_table
+
+
+def frame_message(camera_id: str) -> dict:
+    """A typical 'frame' message without its image"""
+    return {
+        'type': 'frame',
+        'camera_id': camera_id,
+        'results': {
+            'detected_classes': ['Person', 'Hardhat', 'No-Safety-Vest'],
+            'is_compliant': False,
+            'safety_status': 'VIOLATION DETECTED',
+            'violation_type': 'Missing Safety Vest',
+            'confidence_scores': {'Person': 0.91, 'Hardhat': 0.84, 'No-Safety-Vest': 0.77},
+            'person_detected': True,
+            'person_count': 2,
+            'is_partial': False,
+            'partial_reason': ''
+        },
+        'timestamp': '2024-01-01T08:00:00'
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', help='Video file (default: first file in demo_videos/)')
+    parser.add_argument('--synthetic', help='Use random frames of this size instead of a video, e.g. 1280x720')
+    parser.add_argument('--frames', type=int, default=60, help='Number of frames to use')
+    parser.add_argument('--clients', type=int, default=4, help='Viewers per camera')
+    parser.add_argument('--quality', type=int, default=85, help='JPEG quality')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        width, height = (int(v) for v in args.synthetic.lower().split('x'))
+        frames = synthetic_frames(width, height, count=args.frames)
+    else:
+        frames = load_frames(resolve_video(args.video), max_frames=args.frames)
+    jpegs = [cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, args.quality])[1] for frame in frames]
+    message = frame_message('camera-1')
+    print(f"{len(jpegs)} frames ({frames[0].shape[1]}x{frames[0].shape[0]}), "
+          f"mean JPEG {sum(j.nbytes for j in jpegs) / len(jpegs) / 1024:.1f} KiB, {args.clients} clients")
+
+    formats = {
+        'json+base64': (encode_json_frame, lambda payload: payload.encode('utf-8')),
+        'binary v1': (encode_binary_frame, lambda payload: payload),
+    }
+
+    rows = []
+    for name, (encode, per_client) in formats.items():
+        payloads = [encode(message, jpeg.data) for jpeg in jpegs]
+        size = sum(len(per_client(p)) for p in payloads) / len(payloads)
+        build = time_calls(lambda i: encode(message, jpegs[i % len(jpegs)].data), len(jpegs))
+        send = time_calls(lambda i: per_client(payloads[i % len(payloads)]), len(payloads))
+        rows.append({
+            'format': name,
+            'kib_per_client': size / 1024,
+            'build_ms': build['mean_ms'],
+            'send_ms_per_client': send['mean_ms'],
+            'per_frame_ms': build['mean_ms'] + send['mean_ms'] * args.clients
+        })
+
+    print_table("Per frame message", rows)
+    baseline, binary = rows
+    print(f"\nBinary frames: {100 * (1 - binary['kib_per_client'] / baseline['kib_per_client']):.1f}% fewer bytes per client, "
+          f"{100 * (1 - binary['per_frame_ms'] / baseline['per_frame_ms']):.1f}% less server CPU per frame")
+
+
+if __name__ == '__main__':
+    main()
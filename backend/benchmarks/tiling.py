@@ -0,0 +1,80 @@
+"""
+Tiled inference benchmark: tiled-640 vs full-frame 640 / 1280.
+
+Runs each mode of YOLODetectionService over the same video frames and reports
+latency and recall. Without ground-truth labels, the detections of a single
+full-frame pass at --reference-size (default 1920) serve as the reference;
+"small" recall only counts reference boxes shorter than --small of the frame
+height (distant workers and their PPE).
+
+Usage (from the backend directory):
+    python -m benchmarks.tiling [--video PATH] [--frames 50] [--grid 3x2] [--reference-size 1920]
+"""
+import argparse
+from app.core.detection_utils import match_detections
+from app.services.yolo_service import YOLODetectionService
+from .common import resolve_video, load_frames, time_calls, print_table
+
+CAMERA_ID = 'tiling-benchmark'
+
+
+def recall(reference_frames, candidate_frames) -> float:
+    """Share of reference boxes matched by the candidate, over all frames and classes"""
+    tp = fn = 0
+    for reference, candidate in zip(reference_frames, candidate_frames):
+        for stats in match_detections(reference, candidate).values():
+            tp += stats['tp']
+            fn += stats['fn']
+    return tp / max(1, tp + fn)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', help='Video file (default: first file in demo_videos/)')
+    parser.add_argument('--frames', type=int, default=50, help='Number of frames to use')
+    parser.add_argument('--grid', default='3x2', help='Tile grid for the tiled mode (COLSxROWS)')
+    parser.add_argument('--reference-size', type=int, default=1920, help='Input size of the reference pass')
+    parser.add_argument('--small', type=float, default=0.05, help='Box height (fraction of frame) counted as small')
+    parser.add_argument('--gpu', action='store_true', help='Allow GPU (default: CPU only)')
+    args = parser.parse_args()
+
+    frames = load_frames(resolve_video(args.video), max_frames=args.frames)
+    height = frames[0].shape[0]
+    print(f"Loaded {len(frames)} frames ({frames[0].shape[1]}x{height})")
+
+    service = YOLODetectionService(use_gpu=args.gpu)
+
+    def run(input_size: int, tile_grid: str = None) -> list:
+        service.input_size = input_size  # Direct assignment: the reference size is outside set_input_size's list
+        service.configure_camera(CAMERA_ID, tile_grid=tile_grid)
+        return [service._run_inference(frame, camera_id=CAMERA_ID)[0].as_dicts() for frame in frames]
+
+    reference = run(args.reference_size)
+    small_reference = [[d for d in frame if d['bbox'][3] - d['bbox'][1] < args.small * height] for frame in reference]
+    print(f"Reference ({args.reference_size} px): {sum(map(len, reference))} boxes, "
+          f"{sum(map(len, small_reference))} small")
+
+    modes = [
+        ('full-640', 640, None),
+        ('full-1280', 1280, None),
+        (f'tiled-640 ({args.grid})', 640, args.grid),
+    ]
+
+    rows = []
+    for name, input_size, tile_grid in modes:
+        detections = run(input_size, tile_grid)
+        timing = time_calls(lambda i: service._run_inference(frames[i % len(frames)], camera_id=CAMERA_ID), iterations=len(frames))
+        rows.append({
+            'mode': name,
+            'boxes': sum(map(len, detections)),
+            'recall': recall(reference, detections),
+            'small_recall': recall(small_reference, detections),
+            'mean_ms': timing['mean_ms'],
+            'p95_ms': timing['p95_ms']
+        })
+
+    print_table(f"Tiled vs full-frame inference (reference: full frame at {args.reference_size} px)", rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Per-frame cost of worker tracking as headcount grows.
+
+Compares the array-backed IoUTracker (IoU matrix + optimal assignment) with the
+previous pure-Python greedy matcher on synthetic scenes of walking people, and
+counts frames where the greedy matcher gave two people the same worker ID.
+
+Usage (from the backend directory):
+    python -m benchmarks.tracker [--frames 300] [--persons 5 50 200]
+"""
+import argparse
+import numpy as np
+from app.services.tracking import IoUTracker
+from .common import time_calls, print_table
+
+
+def synthetic_scene(persons: int, frames: int, seed: int = 0) -> list:
+    """Random-walk person boxes on a 1920x1080 frame"""
+    rng = np.random.default_rng(seed)
+    size = rng.uniform([40, 100], [120, 300], size=(persons, 2))
+    position = rng.uniform([0, 0], [1920 - 120, 1080 - 300], size=(persons, 2))
+    velocity = rng.normal(0, 3, size=(persons, 2))
+
+    scene = []
+    for _ in range(frames):
+        position = position + velocity + rng.normal(0, 1, size=(persons, 2))
+        boxes = np.hstack([position, position + size])
+        scene.append(boxes[rng.permutation(persons)])  # Detector output order is arbitrary
+    return scene
+
+
+class GreedyTracker:
+    """Previous tracker: Python loops, pairwise IoU, greedy best match per person"""
+
+    def __init__(self, iou_threshold: float = 0.3, max_frames_missing: int = 30):
+        self.iou_threshold = iou_threshold
+        self.max_frames_missing = max_frames_missing
+        self.tracked_workers = {}
+        self.next_worker_id = 1
+        self.frame_count = 0
+        self.duplicate_frames = 0
+
+    @staticmethod
+    def _iou(b1, b2):
+        x_left, y_top = max(b1[0], b2[0]), max(b1[1], b2[1])
+        x_right, y_bottom = min(b1[2], b2[2]), min(b1[3], b2[3])
+        if x_right < x_left or y_bottom < y_top:
+            return 0.0
+        inter = (x_right - x_left) * (y_bottom - y_top)
+        union = (b1[2] - b1[0]) * (b1[3] - b1[1]) + (b2[2] - b2[0]) * (b2[3] - b2[1]) - inter
+        return inter / union if union > 0 else 0.0
+
+    def update(self, boxes):
+        self.frame_count += 1
+        assigned = []
+        for bbox in boxes.tolist():
+            best_id, best_iou = None, self.iou_threshold
+            for worker_id, data in self.tracked_workers.items():
+                iou = self._iou(bbox, data['bbox'])
+                if iou > best_iou:
+                    best_iou, best_id = iou, worker_id
+            if best_id is None:
+                best_id = self.next_worker_id
+                self.next_worker_id += 1
+            self.tracked_workers[best_id] = {'bbox': bbox, 'last_seen_frame': self.frame_count}
+            assigned.append(best_id)
+
+        for worker_id in [w for w, d in self.tracked_workers.items() if self.frame_count - d['last_seen_frame'] > self.max_frames_missing]:
+            del self.tracked_workers[worker_id]
+
+        if len(set(assigned)) != len(assigned):
+            self.duplicate_frames += 1
+        return assigned
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=300, help='Frames per scene')
+    parser.add_argument('--persons', type=int, nargs='+', default=[5, 50, 200], help='Headcounts to benchmark')
+    args = parser.parse_args()
+
+    rows = []
+    for persons in args.persons:
+        scene = synthetic_scene(persons, args.frames)
+        for name, tracker in (('greedy (old)', GreedyTracker()), ('matrix + hungarian', IoUTracker())):
+            timing = time_calls(lambda i: tracker.update(scene[i % len(scene)]), iterations=len(scene), warmup=0)
+            rows.append({
+                'persons': persons,
+                'tracker': name,
+                'mean_ms': timing['mean_ms'],
+                'p95_ms': timing['p95_ms'],
+                'ids_issued': tracker.next_worker_id - 1,
+                'duplicate_id_frames': getattr(tracker, 'duplicate_frames', 0)
+            })
+
+    print_table(f"Tracking cost per frame ({args.frames} frames per scene)", rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""
+Replay benchmark: worker ID stability and database writes per tracker mode.
+
+Runs the detector once over a video, then replays the same detections through
+each worker tracker ('iou' and 'bytetrack') and the per-worker analysis used by
+the stream. For every mode it reports how many worker IDs were created, how many
+were ID switches (a new ID appearing where a recently lost ID was), and how many
+DetectionEvent / Alert rows the websocket saving rules would write per hour of
+footage (5 s violation persistence, 5 s cooldown, compliance snapshot every 10 s,
+stale workers dropped after 15 s).
+
+Usage (from the backend directory):
+    python -m benchmarks.tracking_replay [--video PATH] [--frames 900] [--stride 1]
+"""
+import argparse
+import cv2
+import numpy as np
+from app.services.tracking import iou_matrix
+from app.services.yolo_service import YOLODetectionService
+from .common import resolve_video, load_frames, print_table
+
+TRACKER_MODES = ('iou', 'bytetrack')
+
+# Saving rules of the websocket stream (app/api/websocket.py)
+VIOLATION_PERSISTENCE_SECONDS = 5
+VIOLATION_COOLDOWN_SECONDS = 5
+COMPLIANCE_SNAPSHOT_INTERVAL_SECONDS = 10
+STALE_WORKER_SECONDS = 15
+
+# A new ID counts as a switch if it overlaps a box of an ID lost within this window
+SWITCH_IOU = 0.3
+SWITCH_WINDOW_SECONDS = 2.0
+
+
+class WriteCounter:
+    """Mirrors the websocket violation / compliance saving rules on video time"""
+
+    def __init__(self):
+        self.violation_start = {}
+        self.last_violation_save = {}
+        self.last_seen = {}
+        self.last_snapshot = 0.0
+        self.detection_events = 0
+        self.alerts = 0
+
+    def update(self, workers: list, now: float):
+        current = {w['worker_id'] for w in workers if w['worker_id'] is not None}
+        for worker_id in current:
+            self.last_seen[worker_id] = now
+        for worker_id in [w for w, seen in self.last_seen.items() if now - seen > STALE_WORKER_SECONDS]:
+            del self.last_seen[worker_id]
+            self.violation_start.pop(worker_id, None)
+            self.last_violation_save.pop(worker_id, None)
+
+        for worker in workers:
+            worker_id = worker['worker_id']
+            if worker['is_compliant'] is None or worker_id is None:
+                continue
+            if worker['is_compliant'] is False:
+                start = self.violation_start.setdefault(worker_id, now)
+                if now - start < VIOLATION_PERSISTENCE_SECONDS:
+                    continue
+                last_save = self.last_violation_save.get(worker_id)
+                if last_save is not None and now - last_save < VIOLATION_COOLDOWN_SECONDS:
+                    continue
+                self.detection_events += 1
+                self.alerts += 1
+                self.last_violation_save[worker_id] = now
+            else:
+                self.violation_start.pop(worker_id, None)
+
+        if now - self.last_snapshot >= COMPLIANCE_SNAPSHOT_INTERVAL_SECONDS:
+            self.detection_events += sum(
+                1 for w in workers if w['is_compliant'] is True and w['worker_id'] is not None
+            )
+            self.last_snapshot = now
+
+
+def replay(service: YOLODetectionService, mode: str, detections: list, fps: float) -> dict:
+    """Replay precomputed detections through one tracker mode"""
+    service.tracker_mode = mode
+    camera_id = f"replay-{mode}"
+    service.cleanup_camera_tracker(camera_id)
+
+    counter = WriteCounter()
+    seen_ids = set()
+    lost = {}  # {worker_id: (box, lost_at_seconds)}
+    previous = {}  # {worker_id: box}
+    switches = 0
+
+    for index, frame_detections in enumerate(detections):
+        now = index / fps
+        workers = service._analyze_detections_per_worker(frame_detections, camera_id)['workers']
+        current = {w['worker_id']: np.array(w['bbox'], dtype=np.float64) for w in workers if w['worker_id'] is not None}
+
+        for worker_id, box in previous.items():
+            if worker_id not in current:
+                lost[worker_id] = (box, now)
+        lost = {w: v for w, v in lost.items() if w not in current and now - v[1] <= SWITCH_WINDOW_SECONDS}
+
+        new_ids = [w for w in current if w not in seen_ids]
+        if new_ids and lost:
+            lost_ids = list(lost)
+            overlap = iou_matrix(
+                np.array([current[w] for w in new_ids]),
+                np.array([lost[w][0] for w in lost_ids])
+            )
+            for row in range(len(new_ids)):
+                column = int(overlap[row].argmax())
+                if overlap[row, column] > SWITCH_IOU:
+                    switches += 1
+                    del lost[lost_ids[column]]
+                    overlap[:, column] = 0
+
+        seen_ids.update(current)
+        previous = current
+        counter.update(workers, now)
+
+    hours = len(detections) / fps / 3600
+    service.cleanup_camera_tracker(camera_id)
+    return {
+        'tracker': mode,
+        'worker_ids': len(seen_ids),
+        'id_switches': switches,
+        'events_per_hour': counter.detection_events / hours,
+        'alerts_per_hour': counter.alerts / hours,
+        'db_writes_per_hour': (counter.detection_events + counter.alerts) / hours
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', help='Video file (default: first file in demo_videos/)')
+    parser.add_argument('--frames', type=int, default=900, help='Number of frames to replay')
+    parser.add_argument('--stride', type=int, default=1, help='Keep every Nth video frame')
+    args = parser.parse_args()
+
+    video = resolve_video(args.video)
+    capture = cv2.VideoCapture(str(video))
+    fps = (capture.get(cv2.CAP_PROP_FPS) or 30.0) / args.stride
+    capture.release()
+
+    frames = load_frames(video, args.frames, stride=args.stride)
+    service = YOLODetectionService()
+    detections = [service._run_inference(frame)[0] for frame in frames]
+
+    rows = [replay(service, mode, detections, fps) for mode in TRACKER_MODES]
+    print_table(f"Tracking replay: {video.name} ({len(frames)} frames, {len(frames) / fps:.1f} s at {fps:.1f} FPS)", rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Calibrate and evaluate the INT8 quantized PPE model
+
+Usage (from the backend directory):
+    python quantize_model.py calibrate [--source demo_videos] [--source uploads/violations] [--eval-source DIR]
+    python quantize_model.py evaluate [--images DIR --labels DIR] [--eval-source DIR]
+
+calibrate: exports MODEL_PATH to ONNX, quantizes it to static INT8 using frames from the
+           given sources, then runs the evaluation.
+evaluate:  reports per-class precision/recall of INT8 vs FP32 and writes the accuracy report
+           that gates MODEL_PRECISION=int8.
+
+The gate is never measured on calibration frames: evaluation uses --images/--labels, or
+--eval-source, or else every --holdout-every'th frame of --source, which calibrate leaves out.
+"""
+import argparse
+import sys
+from pathlib import Path
+from app.core.config import settings
+from app.services.quantization import (
+    collect_calibration_frames,
+    split_holdout,
+    quantize_model,
+    evaluate_quantized_model,
+    quantized_model_path,
+    IMAGE_EXTENSIONS
+)
+
+BACKEND_DIR = Path(__file__).resolve().parent
+DEFAULT_SOURCES = [str(BACKEND_DIR / "demo_videos")]
+
+
+def load_labeled_images(images_dir: str, labels_dir: str):
+    """Load images and their YOLO label files (matched by file name stem)"""
+    import cv2
+
+    frames, labels = [], []
+    for image_path in sorted(p for p in Path(images_dir).iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS):
+        image = cv2.imread(str(image_path))
+        if image is None:
+            continue
+        label_path = Path(labels_dir) / f"{image_path.stem}.txt"
+        frames.append(image)
+        labels.append(label_path if label_path.exists() else None)
+    return frames, labels
+
+
+def print_report(report: dict):
+    """Print the per-class accuracy report"""
+    print(f"\nReference: {report['reference']}  |  Frames: {report['frames']}  |  Tolerance: {report['tolerance']}")
+    print(f"{'Class':<16}{'FP32 P':>8}{'FP32 R':>8}{'INT8 P':>8}{'INT8 R':>8}{'ΔP':>8}{'ΔR':>8}  Status")
+    print("-" * 76)
+    for name, m in sorted(report['classes'].items()):
+        status = "OK" if m['passed'] else "FAIL"
+        print(
+            f"{name:<16}{m['fp32_precision']:>8.3f}{m['fp32_recall']:>8.3f}{m['int8_precision']:>8.3f}"
+            f"{m['int8_recall']:>8.3f}{m['precision_delta']:>+8.3f}{m['recall_delta']:>+8.3f}  {status}"
+        )
+    print("-" * 76)
+    if report['passed']:
+        print("✓ INT8 model is within tolerance - set MODEL_PRECISION=int8 to activate it")
+    else:
+        print("❌ INT8 model exceeds tolerance - it will NOT be activated")
+
+
+def collect_frames(args):
+    """
+    Collect calibration and held-out evaluation frames
+
+    Returns:
+        Tuple of (calibration_frames, evaluation_frames); with --eval-source all --source
+        frames calibrate, otherwise every --holdout-every'th one is held out for evaluation
+    """
+    frames = collect_calibration_frames(args.source or DEFAULT_SOURCES, args.max_frames)
+    if args.eval_source:
+        return frames, collect_calibration_frames(args.eval_source, args.max_frames)
+    return split_holdout(frames, args.holdout_every)
+
+
+def evaluate(args, model_path: str, evaluation_frames=None) -> bool:
+    """Run the evaluation on held-out frames and print the report"""
+    if args.images and args.labels:
+        frames, labels = load_labeled_images(args.images, args.labels)
+    else:
+        frames = evaluation_frames if evaluation_frames is not None else collect_frames(args)[1]
+        labels = None
+
+    if not frames:
+        print("❌ No evaluation frames found")
+        return False
+
+    report = evaluate_quantized_model(model_path, frames, labels=labels, tolerance=args.tolerance)
+    print_report(report)
+    return report['passed']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['calibrate', 'evaluate'])
+    parser.add_argument('--source', action='append', help='Video file, image file or directory (repeatable, default: demo_videos/)')
+    parser.add_argument('--max-frames', type=int, default=200, help='Maximum calibration/evaluation frames')
+    parser.add_argument('--eval-source', action='append', help='Evaluation video/image source kept apart from --source (repeatable)')
+    parser.add_argument('--holdout-every', type=int, default=5, help='Without --eval-source: hold out every Nth --source frame for evaluation')
+    parser.add_argument('--images', help='Directory of labeled evaluation images (optional)')
+    parser.add_argument('--labels', help='Directory of YOLO-format label files for --images (optional)')
+    parser.add_argument('--tolerance', type=float, default=None, help='Override QUANTIZATION_MAX_ACCURACY_DROP')
+    args = parser.parse_args()
+
+    model_path = settings.get_absolute_model_path()
+    print(f"Model: {model_path}")
+
+    evaluation_frames = None
+    if args.command == 'calibrate':
+        calibration_frames, evaluation_frames = collect_frames(args)
+        if not calibration_frames:
+            print("❌ No calibration frames found - pass --source with videos or snapshot images")
+            sys.exit(1)
+        quantize_model(model_path, calibration_frames)
+    elif not quantized_model_path(model_path).exists():
+        print(f"❌ {quantized_model_path(model_path)} not found - run 'calibrate' first")
+        sys.exit(1)
+
+    passed = evaluate(args, model_path, evaluation_frames)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
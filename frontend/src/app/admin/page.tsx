@@ -257,6 +257,8 @@ export default function AdminDashboard() {
                   }`}>
                     {health.yolo_model.status === 'loaded' ? 'Loaded' :
                      health.yolo_model.status === 'not_loaded' ? 'Not Loaded' :
+                     health.yolo_model.status === 'loading' ? 'Loading...' :
+                     health.yolo_model.status === 'warming_up' ? 'Warming Up...' :
                      health.yolo_model.status === 'error' ? 'Error' : 'Checking...'}
                   </span>
                 </div>
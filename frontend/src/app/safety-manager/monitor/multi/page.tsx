@@ -26,14 +26,17 @@ import { Badge } from '@/components/ui/badge';
 import { Slider } from '@/components/ui/slider';
 import { camerasAPI, detectionsAPI, performanceAPI } from '@/lib/api';
 import { Camera } from '@/types';
-import { Play, Square, AlertCircle, CheckCircle2, Video, Camera as CameraIcon, FileText, Download, ChevronRight, ChevronLeft, Image as ImageIcon, Clock, Volume2, VolumeX, Trash2, Settings, Activity, Users, Maximize, Minimize, Grid2x2, List } from 'lucide-react';
+import { Play, Square, AlertCircle, CheckCircle2, Video, Camera as CameraIcon, FileText, Download, ChevronRight, ChevronLeft, Image as ImageIcon, Clock, Volume2, VolumeX, Trash2, Settings, Activity, Users, Maximize, Minimize, Grid2x2, List, Eye, EyeOff } from 'lucide-react';
 import { useToast } from '@/hooks/use-toast';
 import { soundAlertManager } from '@/lib/soundAlerts';
+import { drawStreamOverlay, composeOverlayScreenshot, StreamOverlay } from '@/lib/streamOverlay';
+import { parseStreamMessage, STREAM_PROTOCOLS } from '@/lib/streamProtocol';
 
 interface CameraFeed {
   camera: Camera;
   wsRef: WebSocket | null;
   videoRef: React.RefObject<HTMLImageElement>;
+  overlayRef: React.RefObject<HTMLCanvasElement>;
   containerRef: React.RefObject<HTMLDivElement>;
   isMonitoring: boolean;
   liveData: {
@@ -50,9 +53,19 @@ interface CameraFeed {
     personCount: number;
     startTime: number | null;
     lastFrameTime: number | null;
+    timings: Record<string, number> | null; // Latest ms per stage, 'latency' = capture to broadcast (backend STREAM_STAGE_TIMINGS)
   };
 }
 
+/**
+ * Latency breakdown per stage, one per line (badge tooltip)
+ */
+function formatStageTimings(timings: Record<string, number>): string {
+  return Object.entries(timings)
+    .map(([stage, ms]) => `${stage}: ${ms.toFixed(1)} ms`)
+    .join('\n');
+}
+
 export default function MultiCameraMonitorPage() {
   const { toast } = useToast();
   const [cameras, setCameras] = useState<Camera[]>([]);
@@ -83,6 +96,14 @@ export default function MultiCameraMonitorPage() {
   // View mode state (list or grid)
   const [viewMode, setViewMode] = useState<'list' | 'grid'>('list');
 
+  // Client-side overlays (backend 'metadata' stream mode): latest box list per camera
+  const [showOverlays, setShowOverlays] = useState(true);
+  const showOverlaysRef = useRef(true);
+  const overlaysRef = useRef<Map<string, StreamOverlay>>(new Map());
+
+  // Object URL of the image shown per camera (binary stream frames), revoked when replaced
+  const frameUrlsRef = useRef<Map<string, string>>(new Map());
+
   // Global statistics
   const [globalStats, setGlobalStats] = useState({
     totalViolations: 0,
@@ -102,6 +123,7 @@ export default function MultiCameraMonitorPage() {
           feed.wsRef.close();
         }
       });
+      frameUrlsRef.current.forEach(url => URL.revokeObjectURL(url));
     };
   }, []);
 
@@ -165,6 +187,7 @@ export default function MultiCameraMonitorPage() {
           camera,
           wsRef: null,
           videoRef: createRef<HTMLImageElement>(),
+          overlayRef: createRef<HTMLCanvasElement>(),
           containerRef: createRef<HTMLDivElement>(),
           isMonitoring: false,
           liveData: {
@@ -181,6 +204,7 @@ export default function MultiCameraMonitorPage() {
             personCount: 0,
             startTime: null,
             lastFrameTime: null,
+            timings: null,
           },
         });
       });
@@ -201,7 +225,9 @@ export default function MultiCameraMonitorPage() {
     const wsUrl = `${WS_URL}/ws/monitor/${cameraId}`;
 
     try {
-      const ws = new WebSocket(wsUrl);
+      // Binary frames (raw JPEG) when the backend supports them, JSON with base64 images otherwise
+      const ws = new WebSocket(wsUrl, STREAM_PROTOCOLS);
+      ws.binaryType = 'arraybuffer';
 
       ws.onopen = () => {
         console.log(`WebSocket connected for camera ${feed.camera.name}`);
@@ -219,10 +245,24 @@ export default function MultiCameraMonitorPage() {
 
       ws.onmessage = (event) => {
         try {
-          const data = JSON.parse(event.data);
-
-          if (data.type === 'frame' && data.frame && feed.videoRef.current) {
-            feed.videoRef.current.src = `data:image/jpeg;base64,${data.frame}`;
+          const { data, image } = parseStreamMessage(event.data);
+
+          if (data.type === 'frame') {
+            // Overlays are drawn here only when the backend sends raw frames with a box list
+            if (data.overlay) {
+              overlaysRef.current.set(cameraId, data.overlay);
+            } else {
+              overlaysRef.current.delete(cameraId);
+            }
+            if (image && feed.videoRef.current) {
+              // Redrawn from the image's onLoad so boxes and pixels change together
+              showFrameImage(cameraId, feed.videoRef.current, image);
+            } else if (data.frame && feed.videoRef.current) {
+              feed.videoRef.current.src = `data:image/jpeg;base64,${data.frame}`;
+            } else {
+              // Metadata-only message: move the boxes over the last image
+              renderOverlay(feed);
+            }
           }
 
           if (data.type === 'frame' && data.results) {
@@ -287,6 +327,7 @@ export default function MultiCameraMonitorPage() {
                   violationCount: newViolationCount,
                   personCount: personCount,
                   lastFrameTime: now,
+                  timings: data.timings || null,
                 },
               });
 
@@ -330,10 +371,41 @@ export default function MultiCameraMonitorPage() {
     }
   };
 
+  const showFrameImage = (cameraId: string, img: HTMLImageElement, image: Blob) => {
+    const url = URL.createObjectURL(image);
+    const previousUrl = frameUrlsRef.current.get(cameraId);
+    frameUrlsRef.current.set(cameraId, url);
+    img.src = url;
+    if (previousUrl) URL.revokeObjectURL(previousUrl);
+  };
+
+  const releaseFrameImage = (cameraId: string) => {
+    const url = frameUrlsRef.current.get(cameraId);
+    if (url) {
+      URL.revokeObjectURL(url);
+      frameUrlsRef.current.delete(cameraId);
+    }
+  };
+
+  const renderOverlay = (feed: CameraFeed) => {
+    if (!feed.overlayRef.current || !feed.videoRef.current) return;
+    const overlay = showOverlaysRef.current ? overlaysRef.current.get(feed.camera.id) || null : null;
+    drawStreamOverlay(feed.overlayRef.current, feed.videoRef.current, overlay);
+  };
+
+  useEffect(() => {
+    showOverlaysRef.current = showOverlays;
+    cameraFeeds.forEach(feed => renderOverlay(feed));
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [showOverlays]);
+
   const stopMonitoring = (cameraId: string) => {
     const feed = cameraFeeds.get(cameraId);
     if (!feed) return;
 
+    overlaysRef.current.delete(cameraId);
+    releaseFrameImage(cameraId);
+
     if (feed.wsRef) {
       feed.wsRef.close();
     }
@@ -441,8 +513,12 @@ export default function MultiCameraMonitorPage() {
       return;
     }
 
-    // Get the current frame from the video element
-    const screenshot = feed.videoRef.current.src;
+    // Get the current frame from the video element (with the client-drawn overlays, if any).
+    // Binary stream frames are object URLs that get revoked, so they are copied into a data URL.
+    const overlay = showOverlays ? overlaysRef.current.get(cameraId) : undefined;
+    const screenshot = overlay || feed.videoRef.current.src.startsWith('blob:')
+      ? composeOverlayScreenshot(feed.videoRef.current, overlay || null)
+      : feed.videoRef.current.src;
 
     // Save to local screenshots list
     const screenshotRecord = {
@@ -650,6 +726,14 @@ export default function MultiCameraMonitorPage() {
           >
             {soundAlertsEnabled ? <Volume2 className="h-4 w-4" /> : <VolumeX className="h-4 w-4" />}
           </Button>
+          <Button
+            variant={showOverlays ? "outline" : "default"}
+            size="icon"
+            onClick={() => setShowOverlays(!showOverlays)}
+            title={showOverlays ? 'Hide detection boxes (metadata stream mode)' : 'Show detection boxes'}
+          >
+            {showOverlays ? <Eye className="h-4 w-4" /> : <EyeOff className="h-4 w-4" />}
+          </Button>
           <Button
             variant={viewMode === 'grid' ? "default" : "outline"}
             size="icon"
@@ -766,6 +850,11 @@ export default function MultiCameraMonitorPage() {
                             ref={feed.videoRef}
                             alt={`${feed.camera.name} feed`}
                             className="w-full h-full object-contain"
+                            onLoad={() => renderOverlay(feed)}
+                          />
+                          <canvas
+                            ref={feed.overlayRef}
+                            className="absolute inset-0 w-full h-full pointer-events-none"
                           />
                           {/* Live Indicator & Stats */}
                           <div className="absolute top-2 left-2 flex flex-col gap-2">
@@ -785,6 +874,15 @@ export default function MultiCameraMonitorPage() {
                                 {feed.stats.violationCount} {feed.stats.violationCount === 1 ? 'violation' : 'violations'}
                               </div>
                             )}
+                            {feed.stats.timings?.latency !== undefined && (
+                              <div
+                                className="flex items-center gap-1 bg-gray-900/80 text-white px-2 py-1 rounded text-xs font-medium backdrop-blur"
+                                title={formatStageTimings(feed.stats.timings)}
+                              >
+                                <Clock className="h-3 w-3" />
+                                {Math.round(feed.stats.timings.latency)} ms
+                              </div>
+                            )}
                           </div>
                           {/* Action Buttons */}
                           <div className="absolute top-2 right-2 flex gap-1">
@@ -937,6 +1035,11 @@ export default function MultiCameraMonitorPage() {
                             ref={feed.videoRef}
                             alt={`${feed.camera.name} feed`}
                             className="w-full h-full object-contain"
+                            onLoad={() => renderOverlay(feed)}
+                          />
+                          <canvas
+                            ref={feed.overlayRef}
+                            className="absolute inset-0 w-full h-full pointer-events-none"
                           />
                           {/* Live Indicator & Stats */}
                           <div className="absolute top-2 left-2 flex flex-col gap-2">
@@ -956,6 +1059,15 @@ export default function MultiCameraMonitorPage() {
                                 {feed.stats.violationCount} {feed.stats.violationCount === 1 ? 'violation' : 'violations'}
                               </div>
                             )}
+                            {feed.stats.timings?.latency !== undefined && (
+                              <div
+                                className="flex items-center gap-1 bg-gray-900/80 text-white px-2 py-1 rounded text-xs font-medium backdrop-blur"
+                                title={formatStageTimings(feed.stats.timings)}
+                              >
+                                <Clock className="h-3 w-3" />
+                                {Math.round(feed.stats.timings.latency)} ms
+                              </div>
+                            )}
                           </div>
                           {/* Action Buttons */}
                           <div className={`absolute top-2 right-2 flex gap-${viewMode === 'grid' ? '1' : '2'}`}>
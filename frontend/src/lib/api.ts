@@ -305,6 +305,7 @@ export const performanceAPI = {
     use_gpu?: boolean;
     input_size?: number;
     jpeg_quality?: number;
+    stream_mode?: 'annotated' | 'metadata';
   }) => {
     const response = await api.put('/performance', settings);
     return response.data;
@@ -0,0 +1,149 @@
+/**
+ * Stream Overlay Drawing
+ * Draws detection boxes and worker labels on a canvas over the live image
+ * (used when the backend streams in 'metadata' mode and sends raw frames)
+ */
+
+export interface StreamOverlay {
+  size: [number, number]; // Frame size the coordinates refer to
+  classes: string[];
+  boxes: [number, number, number, number, number, number][]; // x1, y1, x2, y2, class index, confidence
+  workers: [number, number, number, number, number][]; // worker id, x1, y1, x2, y2
+  roi: [number, number][] | null; // Normalized polygon
+}
+
+// Same colors as the server-side overlays
+const COLOR_VIOLATION = '#ff0000';
+const COLOR_COMPLIANT = '#00ff00';
+const COLOR_PERSON = '#0000ff';
+const COLOR_WORKER_LABEL = '#00ffff';
+const COLOR_ROI = '#00c8ff';
+
+const CLASS_COLORS: Record<string, string> = {
+  'No-Hardhat': COLOR_VIOLATION,
+  'No-Safety-Vest': COLOR_VIOLATION,
+  Hardhat: COLOR_COMPLIANT,
+  'Safety-Vest': COLOR_COMPLIANT,
+  Person: COLOR_PERSON,
+};
+
+const FONT = '12px sans-serif';
+const WORKER_FONT = 'bold 14px sans-serif';
+
+/**
+ * Draw a text label with a filled background, text baseline at (x, y)
+ */
+function drawLabel(
+  ctx: CanvasRenderingContext2D,
+  text: string,
+  x: number,
+  y: number,
+  background: string,
+  color: string,
+  font: string,
+  padding: number
+): void {
+  ctx.font = font;
+  const width = ctx.measureText(text).width;
+  const height = parseInt(font.match(/(\d+)px/)?.[1] || '12', 10);
+  ctx.fillStyle = background;
+  ctx.fillRect(x - padding, y - height - padding, width + 2 * padding, height + 2 * padding);
+  ctx.fillStyle = color;
+  ctx.fillText(text, x, y);
+}
+
+/**
+ * Draw overlays onto a 2D context whose drawing area maps the frame to
+ * (offsetX, offsetY, frame width * scale, frame height * scale)
+ */
+function drawOverlayAt(
+  ctx: CanvasRenderingContext2D,
+  overlay: StreamOverlay,
+  scale: number,
+  offsetX: number,
+  offsetY: number
+): void {
+  const [frameWidth, frameHeight] = overlay.size;
+  ctx.textBaseline = 'alphabetic';
+
+  if (overlay.roi && overlay.roi.length > 2) {
+    ctx.strokeStyle = COLOR_ROI;
+    ctx.lineWidth = 2;
+    ctx.beginPath();
+    overlay.roi.forEach(([x, y], index) => {
+      const px = offsetX + x * frameWidth * scale;
+      const py = offsetY + y * frameHeight * scale;
+      if (index === 0) ctx.moveTo(px, py);
+      else ctx.lineTo(px, py);
+    });
+    ctx.closePath();
+    ctx.stroke();
+  }
+
+  ctx.lineWidth = Math.max(1, 3 * scale);
+  for (const [x1, y1, x2, y2, classIndex, confidence] of overlay.boxes) {
+    const name = overlay.classes[classIndex];
+    const color = CLASS_COLORS[name] || COLOR_VIOLATION;
+    const left = offsetX + x1 * scale;
+    const top = offsetY + y1 * scale;
+    ctx.strokeStyle = color;
+    ctx.strokeRect(left, top, (x2 - x1) * scale, (y2 - y1) * scale);
+    drawLabel(ctx, `${name} ${confidence.toFixed(2)}`, left, Math.max(16, top), color, '#ffffff', FONT, 3);
+  }
+
+  for (const [workerId, x1, y1] of overlay.workers) {
+    const left = offsetX + x1 * scale;
+    const top = offsetY + y1 * scale;
+    drawLabel(ctx, `Worker #${workerId}`, left, Math.max(20, top - 25 * scale), COLOR_WORKER_LABEL, '#000000', WORKER_FONT, 4);
+  }
+}
+
+/**
+ * Draw the overlays on a canvas stacked over an object-contain image
+ * (clears the canvas when overlay is null)
+ */
+export function drawStreamOverlay(
+  canvas: HTMLCanvasElement,
+  image: HTMLImageElement,
+  overlay: StreamOverlay | null
+): void {
+  const ctx = canvas.getContext('2d');
+  if (!ctx) return;
+
+  // Match the canvas to its displayed size (sharp on high-DPI screens)
+  const ratio = window.devicePixelRatio || 1;
+  const width = canvas.clientWidth;
+  const height = canvas.clientHeight;
+  if (canvas.width !== Math.round(width * ratio) || canvas.height !== Math.round(height * ratio)) {
+    canvas.width = Math.round(width * ratio);
+    canvas.height = Math.round(height * ratio);
+  }
+  ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+  ctx.clearRect(0, 0, width, height);
+  if (!overlay || !image.naturalWidth) return;
+
+  // Where object-contain placed the image inside the element
+  const [frameWidth, frameHeight] = overlay.size;
+  const scale = Math.min(width / frameWidth, height / frameHeight);
+  const offsetX = (width - frameWidth * scale) / 2;
+  const offsetY = (height - frameHeight * scale) / 2;
+  drawOverlayAt(ctx, overlay, scale, offsetX, offsetY);
+}
+
+/**
+ * Render the current image with its overlays burned in (for screenshots);
+ * with a null overlay this just copies the image into a data URL
+ */
+export function composeOverlayScreenshot(image: HTMLImageElement, overlay: StreamOverlay | null): string {
+  const canvas = document.createElement('canvas');
+  canvas.width = image.naturalWidth;
+  canvas.height = image.naturalHeight;
+  const ctx = canvas.getContext('2d');
+  if (!ctx) return image.src;
+
+  ctx.drawImage(image, 0, 0);
+  if (overlay) {
+    drawOverlayAt(ctx, overlay, image.naturalWidth / overlay.size[0], 0, 0);
+  }
+  return canvas.toDataURL('image/jpeg', 0.92);
+}
@@ -0,0 +1,50 @@
+/**
+ * Stream Protocol
+ * Wire formats of /ws/monitor/{camera_id}, negotiated with WebSocket subprotocols
+ * (mirrors backend app/services/stream_protocol.py)
+ *
+ * 'ppe.bin.v1': frame messages are binary - an 8-byte header (version, flags,
+ * reserved, metadata length), compact JSON metadata, then the raw JPEG.
+ * Status, alert and error messages stay JSON text.
+ * 'ppe.json': every message is JSON, frames carry a base64 JPEG in 'frame'.
+ */
+
+export const PROTOCOL_BINARY = 'ppe.bin.v1';
+export const PROTOCOL_JSON = 'ppe.json';
+
+// Offered in order of preference (the JSON fallback keeps older backends working)
+export const STREAM_PROTOCOLS = [PROTOCOL_BINARY, PROTOCOL_JSON];
+
+const BINARY_VERSION = 1;
+const FLAG_IMAGE = 0x01;
+const HEADER_SIZE = 8;
+
+const textDecoder = new TextDecoder();
+
+export interface StreamMessage {
+  data: any; // Message object (frames: without 'frame')
+  image: Blob | null; // JPEG of a binary frame message
+}
+
+/**
+ * Decode a WebSocket message of either format
+ */
+export function parseStreamMessage(raw: string | ArrayBuffer): StreamMessage {
+  if (typeof raw === 'string') {
+    return { data: JSON.parse(raw), image: null };
+  }
+
+  const view = new DataView(raw);
+  if (raw.byteLength < HEADER_SIZE) {
+    throw new Error('Binary frame shorter than its header');
+  }
+  const version = view.getUint8(0);
+  if (version !== BINARY_VERSION) {
+    throw new Error(`Unsupported binary frame version: ${version}`);
+  }
+  const flags = view.getUint8(1);
+  const metadataEnd = HEADER_SIZE + view.getUint32(4);
+  const data = JSON.parse(textDecoder.decode(new Uint8Array(raw, HEADER_SIZE, metadataEnd - HEADER_SIZE)));
+  const image = flags & FLAG_IMAGE ? new Blob([raw.slice(metadataEnd)], { type: 'image/jpeg' }) : null;
+  return { data, image };
+}